@@ -3,7 +3,7 @@ from pathlib import Path
 from app.config_manager import ConfigManager
 from app.core.utils.validation import prompt_validated_input, is_valid_url
 from app.core.brand import Brand
-from app.cli.cli_utils import paged_list, print_table
+from app.cli.cli_utils import paged_list, print_table, list_pick, confirm, print_references
 from app.data import db
 from app.lang import lang
 
@@ -30,8 +30,6 @@ def input_brand():
     if brand_name:
         db.add_brand(brand_name, description, url)
         print(lang.t("brand_functions.msg.brand_added").format(brand_name=brand_name))
-        # Clear cache so new brand is loaded next time
-        Brand.clear_cache()
     else:
         print(lang.t("brand_functions.error.no_name"))
 
@@ -46,15 +44,14 @@ BRAND_LIST_COLUMNS = {
 def list_brands(all_brands: list | None = None, cols: list | None = None):
     """
     Display brands using paged_list.
-    - all_brands: optional pre-fetched list of Brand objects; fetches all if None
+    - all_brands: optional pre-fetched list of Brand objects; pages through all brands if None
     - cols:       optional list of field keys to show (overrides default)
     """
-    if all_brands is None:
-        all_brands = db.get_all_brands()  # Returns list of Brand objects
-    
     # If specific cols were passed (e.g. from gear search), use print_table
     # for a quick non-paged inline display
     if cols is not None:
+        if all_brands is None:
+            all_brands = db.get_all_brands()  # Returns list of Brand objects
         col_keys = cols
         labels = [lang.t(BRAND_LIST_COLUMNS.get(k, k)) for k in col_keys]
         print_table(all_brands, col_keys, labels)
@@ -70,7 +67,7 @@ def list_brands(all_brands: list | None = None, cols: list | None = None):
         input(lang.t("brand_functions.msg.enter_to_return"))
 
     paged_list(
-        items        = all_brands,
+        items        = all_brands if all_brands is not None else db.brand_pager(),
         columns      = BRAND_LIST_COLUMNS,
         default_cols = ["name", "url"],
         on_select    = on_select,
@@ -125,28 +122,27 @@ def edit_brand():
 
     db.update_brand(brand_id, new_name, new_description, new_url)
     print(lang.t("brand_functions.msg.success"))
-    
-    # Clear cache so updated brand is reloaded
-    Brand.clear_cache()
     return
 
 def delete_brand():
     print(lang.t("delete_functions.title.delete_brand"))
-    row = _list_pick(
-        db.get_all_brands(),
+    row = list_pick(
+        [(b.id_brand, b.name, b.description) for b in db.get_all_brands()],
         ["id_brand", "name", "description"],
         ["ID", "Name", "Description"],
     )
     if not row:
         return
 
-    if not confirm("delete_functions.msg.confirm"):
-        print(lang.t("delete_functions.msg.cancelled"))
+    used = db.where_used("brand", row["id_brand"])
+    if any(used.values()):
+        print_references(used)
+        print(lang.t("delete_functions.msg.has_references", name=row["name"]))
         return
 
-    success = db.delete_brand(row["id_brand"])
-    if success:
-        print(lang.t("delete_functions.msg.deleted", name=row["name"]))
-    else:
-        print(lang.t("delete_functions.msg.has_references", name=row["name"]))
+    if not confirm("delete_functions.msg.confirm", name=row["name"]):
+        print(lang.t("delete_functions.msg.cancelled"))
+        return
 
+    db.delete_brand(row["id_brand"])
+    print(lang.t("delete_functions.msg.deleted", name=row["name"]))
@@ -4,7 +4,7 @@ from pathlib import Path
 from app.config_manager import ConfigManager
 from app.lang import lang
 from app.data import db
-from app.cli.cli_utils import paged_list
+from app.cli.cli_utils import paged_list, list_pick, confirm, print_references
 
 config = ConfigManager()
 
@@ -103,10 +103,10 @@ def edit_category():
         print(lang.t("category_functions.error.not_found"))
         return
 
-    print(lang.t("category_functions.msg.current_values").format(name=category[1], desc=category[2]))
+    print(lang.t("category_functions.msg.current_values").format(name=category.name, desc=category.description))
 
-    new_name        = input(f"{lang.t('category_functions.cli.new_name')} ({category[1]}): ") or category[1]
-    new_description = input(f"{lang.t('category_functions.cli.new_desc')} ({category[2]}): ") or category[2]
+    new_name        = input(f"{lang.t('category_functions.cli.new_name')} ({category.name}): ") or category.name
+    new_description = input(f"{lang.t('category_functions.cli.new_desc')} ({category.description}): ") or category.description
 
     db.update_category(category_id, new_name, new_description)
     print(lang.t("category_functions.msg.success"))
@@ -114,7 +114,7 @@ def edit_category():
 
 def delete_category():
     print(lang.t("delete_functions.title.delete_category"))
-    row = _list_pick(
+    row = list_pick(
         db.get_all_categories(),
         ["id_category", "category", "description"],
         ["ID", "Name", "Description"],
@@ -122,12 +122,15 @@ def delete_category():
     if not row:
         return
 
-    if not confirm("delete_functions.msg.confirm", name=row["name"]):
+    used = db.where_used("category", row["id_category"])
+    if any(used.values()):
+        print_references(used)
+        print(lang.t("delete_functions.msg.has_references", name=row["category"]))
+        return
+
+    if not confirm("delete_functions.msg.confirm", name=row["category"]):
         print(lang.t("delete_functions.msg.cancelled"))
         return
 
-    success = db.delete_category(row["id_category"])
-    if success:
-        print(lang.t("delete_functions.msg.deleted", name=row["category"]))
-    else:
-        print(lang.t("delete_functions.msg.has_references", name=row["category"]))
+    db.delete_category(row["id_category"])
+    print(lang.t("delete_functions.msg.deleted", name=row["category"]))
@@ -1,6 +1,7 @@
 from app.lang import lang
 from typing import TypeVar, Generic, Any
 from app.core.utils.db_utils import fuzzy_search
+from app.data.db.paging import ListPager
 
 
 # ==============================
@@ -167,7 +168,7 @@ def pick_columns(columns: dict[str, str], current: list[str]) -> list[str]:
 T = TypeVar('T')  # Generic type variable
 
 def paged_list(
-    items: list[Any],  # list of objects (Gear, Brand, Trip, Kit, Category, etc.)
+    items,  # list of objects (Gear, Brand, Trip, Kit, Category, etc.) or a pager
     columns: dict[str, str],  # {attribute_name: translation_key}
     default_cols: list[str],
     on_select,  # callable(item: T) called when user picks a row
@@ -178,7 +179,9 @@ def paged_list(
     """
     Generic paginated list with selectable columns.
 
-    items:        list of objects (Gear, Brand, Trip, Kit, Category, Consumable, etc.)
+    items:        list of objects (Gear, Brand, Trip, Kit, Category, Consumable, etc.),
+                  or a pager from app.data.db (e.g. db.gear_pager()) that loads
+                  one page at a time
     columns:      {attribute_name: translation_key} — maps object attributes to labels
     default_cols: which columns to show initially
     on_select:    callable(item) called when user picks a row
@@ -194,18 +197,22 @@ def paged_list(
             on_select=lambda g: display_full_gear(g),
         )
     """
-    if not items:
+    source = ListPager(items) if isinstance(items, list) else items
+    page = 0
+    page_items = source.page(page, page_size)
+    loaded_page = page
+    if not page_items:
         print(lang.t(empty_key))
         return
 
     active_cols = list(default_cols)
-    total = len(items)
-    page = 0
 
     while True:
-        start = page * page_size
-        end   = min(start + page_size, total)
-        page_items = items[start:end]
+        if loaded_page != page:
+            page_items = source.page(page, page_size)
+            loaded_page = page
+        total = source.count()
+        end   = page * page_size + len(page_items)
         total_pages = (total - 1) // page_size + 1
 
         print(lang.t(title_key))
@@ -261,6 +268,10 @@ def _get_display_value(item: Any, attr: str) -> str:
         _get_display_value(gear, "brand.name") → gear.brand.name
         _get_display_value(trip, "trip_month") → trip.trip_month (or formatted)
     """
+    # Display rows built as dicts (e.g. the trip list)
+    if isinstance(item, dict):
+        return item.get(attr)
+
     try:
         # Handle nested attributes like "brand.name"
         if "." in attr:
@@ -326,3 +337,10 @@ def confirm(prompt_key: str, **kwargs) -> bool:
             return False
         print(lang.t("cli_utils.error.invalid_selection"))
 
+
+def print_references(used: dict[str, list[int]]):
+    """Print one warning per kind of item in a db.where_used() result."""
+    for kind, ids in used.items():
+        if ids:
+            print(lang.t(f"delete_functions.msg.warn_{kind}", count=len(ids)))
+
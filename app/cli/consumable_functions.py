@@ -7,6 +7,7 @@ from app.lang import lang
 from app.core.utils.validation import prompt_validated_input, is_positive_number
 #from app.data.program_db import add_consumable, get_all_consumables, get_consumable_by_id, update_consumable
 from app.data import db
+from app.cli.cli_utils import list_pick, confirm, print_references
 
 #------------------------------
 # Load config and language
@@ -85,7 +86,7 @@ def edit_consumable():
 
 def delete_consumable():
     print(lang.t("delete_functions.title.delete_consumable"))
-    row = _list_pick(
+    row = list_pick(
         db.get_all_consumables(),
         ["id_consumable", "name", "description"],
         ["ID", "Name", "Description"],
@@ -93,13 +94,15 @@ def delete_consumable():
     if not row:
         return
 
+    used = db.where_used("consumable", row["id_consumable"])
+    if any(used.values()):
+        print_references(used)
+        print(lang.t("delete_functions.msg.has_references", name=row["name"]))
+        return
+
     if not confirm("delete_functions.msg.confirm", name=row["name"]):
         print(lang.t("delete_functions.msg.cancelled"))
         return
 
-    success = db.delete_consumable(row["id_consumable"])
-    if success:
-        print(lang.t("delete_functions.msg.deleted", name=row["name"]))
-    else:
-        print(lang.t("delete_functions.msg.has_references", name=row["name"]))
-
+    db.delete_consumable(row["id_consumable"])
+    print(lang.t("delete_functions.msg.deleted", name=row["name"]))
@@ -2,7 +2,7 @@ import json
 from app.lang import lang
 from app.data import db
 from app.core.utils.db_utils import fuzzy_search
-from app.cli.cli_utils import confirm, print_table
+from app.cli.cli_utils import confirm, print_table, print_references
 
 
 # -----------------------------------------------
@@ -65,30 +65,6 @@ def _list_pick(items: list[tuple], columns: list[str], labels: list[str]) -> dic
     return rows[int(raw) - 1]
 
 
-def _count_kit_references(gear_id: int) -> int:
-    """Count how many kits reference this gear."""
-    kits = db.get_all_kits()
-    return sum(1 for k in kits if gear_id in [g.id_gear for g in k.gear_list])
-
-
-def _count_trip_references_gear(gear_id: int) -> int:
-    """Count how many trips reference this gear."""
-    trips = db.get_all_trips()
-    return sum(
-        1 for t in trips
-        if any(hasattr(item, "id_gear") and item.id_gear == gear_id for item in t.items)
-    )
-
-
-def _count_trip_references_kit(kit_id: int) -> int:
-    """Count how many trips reference this kit."""
-    trips = db.get_all_trips()
-    return sum(
-        1 for t in trips
-        if any(hasattr(item, "id_kit") and item.id_kit == kit_id for item in t.items)
-    )
-
-
 # -----------------------------------------------
 # Delete functions
 # -----------------------------------------------
@@ -99,13 +75,7 @@ def delete_gear():
     if not row:
         return
 
-    kit_count  = _count_kit_references(row["id_gear"])
-    trip_count = _count_trip_references_gear(row["id_gear"])
-
-    if kit_count:
-        print(lang.t("delete_functions.msg.warn_kits", count=kit_count))
-    if trip_count:
-        print(lang.t("delete_functions.msg.warn_trips", count=trip_count))
+    print_references(db.where_used("gear", row["id_gear"]))
     if not confirm("delete_functions.msg.confirm", name=row["name"]):
         print(lang.t("delete_functions.msg.cancelled"))
         return
@@ -120,10 +90,7 @@ def delete_kit():
     if not row:
         return
 
-    trip_count = _count_trip_references_kit(row["id_kit"])
-    if trip_count:
-        print(lang.t("delete_functions.msg.warn_trips", count=trip_count))
-
+    print_references(db.where_used("kit", row["id_kit"]))
     if not confirm("delete_functions.msg.confirm", name=row["name"]):
         print(lang.t("delete_functions.msg.cancelled"))
         return
@@ -149,22 +116,25 @@ def delete_trip():
 def delete_brand():
     print(lang.t("delete_functions.title.delete_brand"))
     row = _list_pick(
-        db.get_all_brands(),
+        [(b.id_brand, b.name, b.description) for b in db.get_all_brands()],
         ["id_brand", "name", "description"],
         ["ID", "Name", "Description"],
     )
     if not row:
         return
 
-    if not confirm("delete_functions.msg.confirm"):
+    used = db.where_used("brand", row["id_brand"])
+    if any(used.values()):
+        print_references(used)
+        print(lang.t("delete_functions.msg.has_references", name=row["name"]))
+        return
+
+    if not confirm("delete_functions.msg.confirm", name=row["name"]):
         print(lang.t("delete_functions.msg.cancelled"))
         return
 
-    success = db.delete_brand(row["id_brand"])
-    if success:
-        print(lang.t("delete_functions.msg.deleted", name=row["name"]))
-    else:
-        print(lang.t("delete_functions.msg.has_references", name=row["name"]))
+    db.delete_brand(row["id_brand"])
+    print(lang.t("delete_functions.msg.deleted", name=row["name"]))
 
 
 def delete_category():
@@ -177,15 +147,18 @@ def delete_category():
     if not row:
         return
 
-    if not confirm("delete_functions.msg.confirm", name=row["name"]):
+    used = db.where_used("category", row["id_category"])
+    if any(used.values()):
+        print_references(used)
+        print(lang.t("delete_functions.msg.has_references", name=row["category"]))
+        return
+
+    if not confirm("delete_functions.msg.confirm", name=row["category"]):
         print(lang.t("delete_functions.msg.cancelled"))
         return
 
-    success = db.delete_category(row["id_category"])
-    if success:
-        print(lang.t("delete_functions.msg.deleted", name=row["category"]))
-    else:
-        print(lang.t("delete_functions.msg.has_references", name=row["category"]))
+    db.delete_category(row["id_category"])
+    print(lang.t("delete_functions.msg.deleted", name=row["category"]))
 
 
 def delete_consumable():
@@ -198,12 +171,15 @@ def delete_consumable():
     if not row:
         return
 
+    used = db.where_used("consumable", row["id_consumable"])
+    if any(used.values()):
+        print_references(used)
+        print(lang.t("delete_functions.msg.has_references", name=row["name"]))
+        return
+
     if not confirm("delete_functions.msg.confirm", name=row["name"]):
         print(lang.t("delete_functions.msg.cancelled"))
         return
 
-    success = db.delete_consumable(row["id_consumable"])
-    if success:
-        print(lang.t("delete_functions.msg.deleted", name=row["name"]))
-    else:
-        print(lang.t("delete_functions.msg.has_references", name=row["name"]))
+    db.delete_consumable(row["id_consumable"])
+    print(lang.t("delete_functions.msg.deleted", name=row["name"]))
@@ -0,0 +1,94 @@
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from app.lang import lang
+from app.data.db import export_db
+from app.core.utils.validation import is_positive_number, is_yes_no
+from app.cli.cli_utils import confirm
+
+# menu key -> dataset of export_db
+EXPORT_DATASETS = {
+    "1": "gear",
+    "2": "kits",
+    "3": "trips",
+    "4": "comments",
+}
+
+
+def export_data():
+    """Ask what to export (gear optionally filtered) and where, then stream it to the file."""
+    print(lang.t("export_functions.title.export"))
+    for key, dataset in EXPORT_DATASETS.items():
+        print(f"  {key}. {lang.t(f'export_functions.datasets.{dataset}')}")
+    dataset = EXPORT_DATASETS.get(input(lang.t("menu.cli.prompt") + " ").strip())
+    if dataset is None:
+        print(lang.t("menu.error.invalid_choice"))
+        return
+
+    filters = _ask_gear_filters() if dataset == "gear" else {}
+
+    print(lang.t("export_functions.msg.formats", formats=", ".join(export_db.available_formats())))
+    path = Path(input(lang.t("export_functions.cli.file_path")).strip().strip('"'))
+    if export_db.FORMATS.get(path.suffix.lower()) not in export_db.available_formats():
+        print(lang.t("export_functions.error.format", suffix=path.suffix or path.name))
+        return
+    if path.exists() and not confirm("export_functions.cli.overwrite", path=path):
+        return
+    run_export(dataset, path, **filters)
+
+
+def _ask_gear_filters() -> dict:
+    """get_gear_by_filter keywords; every filter can be skipped with Enter."""
+    from app.cli.gear_functions import _pick_brand_for_edit, _pick_category_for_edit
+
+    filters = {}
+    checked = is_yes_no(input(lang.t("export_functions.cli.checked")).strip())
+    if checked is not None:
+        filters["checked"] = int(checked)
+    brand = _pick_brand_for_edit()
+    if brand:
+        filters["brand_id"] = brand["id_brand"]
+    if confirm("export_functions.cli.filter_category"):
+        category = _pick_category_for_edit()
+        if category:
+            filters["category_id"] = category["id_category"]
+    for key in ("mass_above", "amount_above"):
+        value = is_positive_number(input(lang.t(f"export_functions.cli.{key}")).strip())
+        if value is not None:
+            filters[key] = value
+    return filters
+
+
+def run_export(dataset: str, path: Path, **filters) -> int | None:
+    """Export one dataset, printing progress and a summary; None if it failed."""
+    started = time.perf_counter()
+
+    def progress(rows: int):
+        print("\r" + lang.t("export_functions.msg.progress", rows=rows), end="", flush=True)
+
+    try:
+        count = export_db.export(dataset, path, progress=progress, **filters)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        # Nothing was written: the export goes to <file>.part first
+        print()
+        print(lang.t("export_functions.error.failed", path=path, error=e))
+        return None
+
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed else 0
+    print()
+    print(lang.t("export_functions.msg.done", rows=count, path=path,
+                 seconds=f"{elapsed:.2f}", rate=f"{rate:,.0f}"))
+    return count
+
+
+# python -m app.cli.export_functions <gear|kits|trips|comments> <file> [filter=value ...]
+# e.g.   python -m app.cli.export_functions gear unchecked.csv checked=0 mass_above=500
+if __name__ == "__main__":
+    from app.data.initializer import initialize_all
+
+    initialize_all()
+    cli_filters = dict(arg.split("=", 1) for arg in sys.argv[3:])
+    run_export(sys.argv[1], Path(sys.argv[2]), **cli_filters)
@@ -5,13 +5,14 @@ from app.config_manager import ConfigManager
 from app.lang import lang
 from app.data import db
 from app.data.db import add_gear, get_gear_by_id, get_overdue_inspection_gear, get_end_of_life_gear
+from app.data.db.paging import IdPager
 from app.core.utils.validation import prompt_validated_input, is_positive_number, is_valid_date, is_nonempty_string, is_positive_integer_or_empty, is_yes_no
 from app.core.utils.db_utils import fuzzy_search
 from app.core.gear_item import Gear
 from app.cli.brand_functions import list_brands
 from app.cli.category_functions import pick_category
 from app.cli.comment_functions import list_comments
-from app.cli.cli_utils import paged_list, print_header, show_diff, prompt_field, fuzzy_pick, list_pick, confirm, print_table
+from app.cli.cli_utils import paged_list, print_header, show_diff, prompt_field, fuzzy_pick, list_pick, confirm, print_table, print_references
 
 #------------------------------
 # Load config and language
@@ -124,18 +125,18 @@ def input_gear():
 
 # column key -> translation key (resolved via lang.t() at display time)
 GEAR_LIST_COLUMNS = {
-    "id_gear":     "gear_functions.fields.id",
-    "name":        "gear_functions.fields.name",
-    "variant":     "gear_functions.fields.variant",
-    "brand":       "gear_functions.fields.brand",
-    "size":        "gear_functions.fields.size",
-    "mass_pcs":    "gear_functions.fields.mass",
-    "amount":      "gear_functions.fields.amount",
-    "color":       "gear_functions.fields.color",
-    "category_id": "gear_functions.fields.category",
-    "prod_date":   "gear_functions.fields.prod_date",
-    "last_checked":"gear_functions.fields.last_checked",
-    "lifespan":    "gear_functions.fields.lifespan"
+    "id_gear":       "gear_functions.fields.id",
+    "name":          "gear_functions.fields.name",
+    "variant":       "gear_functions.fields.variant",
+    "brand.name":    "gear_functions.fields.brand",
+    "size":          "gear_functions.fields.size",
+    "mass_pcs":      "gear_functions.fields.mass",
+    "amount":        "gear_functions.fields.amount",
+    "color":         "gear_functions.fields.color",
+    "category.name": "gear_functions.fields.category",
+    "prod_date":     "gear_functions.fields.prod_date",
+    "last_checked":  "gear_functions.fields.last_checked",
+    "lifespan":      "gear_functions.fields.lifespan"
 }
 
 def _get_category_name(category_id):
@@ -281,7 +282,7 @@ def list_gear(page_size: int = 10):
         input(lang.t("gear_functions.msg.enter_to_return"))
 
     paged_list(
-        items        = db.get_all_gear(),
+        items        = db.gear_pager(),
         columns      = GEAR_LIST_COLUMNS,
         default_cols = ["name", "variant", "size", "amount"],
         on_select    = lambda g: display_full_gear(g),
@@ -291,17 +292,23 @@ def list_gear(page_size: int = 10):
     )
 
 
-def list_unchecked_gear(page_size: int = 10):
-    """Paginated gear list with drill-down to full detail and comments."""
-    def on_select(item):
-        display_full_gear(item["id_gear"])
-        list_comments(item["id_gear"])
-        input(lang.t("gear_functions.msg.enter_to_return"))
+def _print_report_summary(table, mask):
+    """Count and mass of the reported gear, per category, from the GearTable columns."""
+    print(lang.t("gear_functions.msg.report_summary", count=table.count(mask), mass=f"{table.total_mass(mask):g}"))
+    for category_id, mass in sorted(table.mass_by_category(mask).items(), key=lambda kv: -kv[1]):
+        category = db.get_category_by_id(category_id) if category_id else None
+        print(f"  {category.name if category else '—':<20} {mass:>10g} g")
+
+
+def _report_gear(table, mask, order_by, default_cols: list[str], page_size: int):
+    """Page through the gear in mask (ordered by GearTable.ids order_by), hydrating one page at a time."""
+    if table.count(mask):
+        _print_report_summary(table, mask)
 
     paged_list(
-        items        = db.get_overdue_inspection_gear(),
+        items        = IdPager(table.ids(mask, order_by=order_by), db.get_gear_by_ids),
         columns      = GEAR_LIST_COLUMNS,
-        default_cols = ["name", "variant", "last_checked"],
+        default_cols = default_cols,
         on_select    = lambda g: display_full_gear(g),
         page_size    = page_size,
         title_key    = "gear_functions.title.list_gear",
@@ -309,22 +316,17 @@ def list_unchecked_gear(page_size: int = 10):
     )
 
 
-def list_overdue_gear(page_size: int = 10):
-    """Paginated gear list with drill-down to full detail and comments."""
-    def on_select(item):
-        display_full_gear(item["id_gear"])
-        list_comments(item["id_gear"])
-        input(lang.t("gear_functions.msg.enter_to_return"))
+def list_unchecked_gear(page_size: int = 10):
+    """Gear due for inspection, never checked and longest unchecked first."""
+    table = db.get_gear_table()
+    _report_gear(table, table.overdue_mask(), "last_checked", ["name", "variant", "last_checked"], page_size)
 
-    paged_list(
-        items        = db.get_end_of_life_gear(),
-        columns      = GEAR_LIST_COLUMNS,
-        default_cols = ["name", "variant", "prod_date", "lifespan"],
-        on_select    = lambda g: display_full_gear(g),
-        page_size    = page_size,
-        title_key    = "gear_functions.title.list_gear",
-        empty_key    = "gear_functions.error.no_gear",
-    )
+
+def list_overdue_gear(page_size: int = 10):
+    """Gear past its lifespan, longest expired first."""
+    table = db.get_gear_table()
+    life = table.lifecycle()
+    _report_gear(table, life.expired, life.expires, ["name", "variant", "prod_date", "lifespan"], page_size)
 
 
 
@@ -334,13 +336,7 @@ def delete_gear():
     if not row:
         return
 
-    kit_count  = count_kit_references(row["id_gear"])
-    trip_count = count_trip_references_gear(row["id_gear"])
-
-    if kit_count:
-        print(lang.t("delete_functions.msg.warn_kits", count=kit_count))
-    if trip_count:
-        print(lang.t("delete_functions.msg.warn_trips", count=trip_count))
+    print_references(db.where_used("gear", row["id_gear"]))
     if not confirm("delete_functions.msg.confirm", name=row["name"]):
         print(lang.t("delete_functions.msg.cancelled"))
         return
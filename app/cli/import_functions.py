@@ -0,0 +1,58 @@
+import csv
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from app.lang import lang
+from app.data import db
+
+
+def import_gear():
+    """Ask for a CSV / JSON Lines file and bulk import the gear in it."""
+    print(lang.t("import_functions.title.import_gear"))
+    print(lang.t("import_functions.msg.columns"))
+    path = Path(input(lang.t("import_functions.cli.file_path")).strip().strip('"'))
+    if not path.is_file():
+        print(lang.t("import_functions.error.no_file", path=path))
+        return
+    run_import(path)
+
+
+def run_import(path: Path) -> dict | None:
+    """Import one file, printing progress and a summary; None if the file can't be read."""
+    started = time.perf_counter()
+
+    def progress(imported: int, skipped: int):
+        print("\r" + lang.t("import_functions.msg.progress", imported=imported, skipped=skipped), end="", flush=True)
+
+    try:
+        result = db.import_gear_file(path, progress)
+    except (OSError, UnicodeDecodeError, ValueError, csv.Error, sqlite3.Error) as e:
+        # Nothing was written: the import runs in one transaction
+        print()
+        print(lang.t("import_functions.error.failed", path=path, error=e))
+        return None
+
+    elapsed = time.perf_counter() - started
+    rate = result["imported"] / elapsed if elapsed else 0
+    print()
+    print(lang.t("import_functions.msg.done", imported=result["imported"], skipped=result["skipped"],
+                 seconds=f"{elapsed:.2f}", rate=f"{rate:,.0f}"))
+    if result["brands_created"] or result["categories_created"]:
+        print(lang.t("import_functions.msg.created", brands=result["brands_created"],
+                     categories=result["categories_created"]))
+    for number, column, value in result["errors"]:
+        print(lang.t("import_functions.error.invalid_row", row=number, column=column, value=value))
+    if result["skipped"] > len(result["errors"]):
+        print(lang.t("import_functions.error.more_errors", count=result["skipped"] - len(result["errors"])))
+    return result
+
+
+# python -m app.cli.import_functions <file> [<file> ...]
+if __name__ == "__main__":
+    from app.data.initializer import initialize_all
+
+    initialize_all()
+    for arg in sys.argv[1:]:
+        run_import(Path(arg))
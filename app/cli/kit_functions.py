@@ -3,7 +3,7 @@ from app.lang import lang
 from app.data import db
 from app.core.utils.db_utils import fuzzy_search
 from app.core.kit_item import Kit
-from app.cli.cli_utils import paged_list, print_table, show_diff, prompt_field
+from app.cli.cli_utils import paged_list, print_table, show_diff, prompt_field, fuzzy_pick, confirm, print_references
 from app.cli.comment_functions import list_comments
 
 KIT_LIST_COLUMNS = {
@@ -35,16 +35,11 @@ def _pick_gear() -> tuple | None:
         print(lang.t("kit_functions.error.no_gear"))
         return None
 
-    # Convert dicts to Gear objects and add index
-    gear_objects = []
-    for i, r in enumerate(results, 1):
-        gear = db.get_gear_by_id(r["id_gear"])
-        if gear:
-            gear.idx = i  # add index as attribute
-            gear_objects.append(gear)
+    # Add an index column to the result rows
+    rows = [{"idx": i, **r} for i, r in enumerate(results, 1)]
 
     print_table(
-        items   = gear_objects,
+        items   = rows,
         columns = ["idx", "name", "variant", "mass_pcs", "amount"],
         labels  = ["#", "Name", "Variant", "Mass(g)", "Stock"],
     )
@@ -84,12 +79,6 @@ def _show_current_gear(kit: Kit):
         print(f"  {gear.name} {gear.variant or ''}  x{amt}  — {mass}g")
 
 
-def _count_kit_references(gear_id: int) -> int:
-    """Count how many kits reference this gear."""
-    kits = db.get_all_kits()
-    return sum(1 for k in kits if gear_id in [g.id_gear for g in k.gear_list])
-
-
 def display_full_kit(kit: Kit):
     """Print full detail of a kit."""
     print(lang.t("kit_functions.title.kit_detail"))
@@ -167,15 +156,13 @@ def input_kit():
 
 def list_kits():
     """Paged list of all kits."""
-    kits = db.get_all_kits()
-
     def on_select(item: Kit):
         display_full_kit(item)
         list_comments(item.id_kit)
         input(lang.t("kit_functions.msg.enter_to_return"))
 
     paged_list(
-        items        = kits,
+        items        = db.kit_pager(),
         columns      = KIT_LIST_COLUMNS,
         default_cols = DEFAULT_KIT_COLS,
         on_select    = on_select,
@@ -185,7 +172,7 @@ def list_kits():
 
 def edit_kit():
     print(lang.t("edit_functions.title.edit_kit"))
-    row = _fuzzy_pick("Kit", "user_db", ["id_kit", "name"], ["ID", "Name"])
+    row = fuzzy_pick("Kit", "user_db", ["id_kit", "name"], ["ID", "Name"])
     if not row:
         return
 
@@ -262,14 +249,11 @@ def edit_kit():
 
 def delete_kit():
     print(lang.t("delete_functions.title.delete_kit"))
-    row = _fuzzy_pick("Kit", "user_db", ["id_kit", "name"], ["ID", "Name"])
+    row = fuzzy_pick("Kit", "user_db", ["id_kit", "name"], ["ID", "Name"])
     if not row:
         return
 
-    trip_count = _count_trip_references_kit(row["id_kit"])
-    if trip_count:
-        print(lang.t("delete_functions.msg.warn_trips", count=trip_count))
-
+    print_references(db.where_used("kit", row["id_kit"]))
     if not confirm("delete_functions.msg.confirm", name=row["name"]):
         print(lang.t("delete_functions.msg.cancelled"))
         return
@@ -1,13 +1,7 @@
 from app.lang import lang
 
-from app.data import db
-from app.cli.gear_functions import input_gear, edit_gear, display_full_gear, list_gear, delete_gear, list_unchecked_gear, list_overdue_gear
-from app.cli.trip_functions import input_trip, edit_trip, list_trips, delete_trip
-from app.cli.kit_functions import input_kit, edit_kit, list_kits, delete_kit
-from app.cli.category_functions import input_category, list_categories, edit_category, delete_category
-from app.cli.brand_functions import input_brand, list_brands, edit_brand, delete_brand
-from app.cli.consumable_functions import input_consumable, edit_consumable, list_consumables, delete_consumable
-from app.cli.comment_functions import input_comment, list_comments
+# The CLI function modules (and through them the database layer and fuzzy
+# search) are imported by the submenu that uses them, not at startup.
 
 # ====================================================
 # Print Menu function
@@ -82,6 +76,11 @@ def main_menu():
 # ====================================================
 def gear_menu():
     """ Displays gear menu """
+    from app.cli.gear_functions import input_gear, edit_gear, list_gear, delete_gear
+    from app.cli.category_functions import list_categories
+    from app.cli.brand_functions import list_brands
+    from app.cli.import_functions import import_gear
+
     # key -> label_key
     commands = {
             "1": "menu.general_menu.options.create",
@@ -89,6 +88,7 @@ def gear_menu():
             "3": "menu.general_menu.options.list",
             "4": "menu.gear_menu.options.category",
             "5": "menu.gear_menu.options.brand",
+            "I": "menu.gear_menu.options.import",
             "D": "menu.general_menu.options.delete",
             "B": "menu.general_menu.options.back"
             }
@@ -111,6 +111,9 @@ def gear_menu():
             case "5":
                 list_brands()
                 continue
+            case "I":
+                import_gear()
+                continue
             case "D":
                 delete_gear()
                 continue
@@ -126,6 +129,8 @@ def gear_menu():
 # ====================================================
 def kit_menu():
     """ Displays kit menu """
+    from app.cli.kit_functions import input_kit, edit_kit, list_kits, delete_kit
+
     # key -> label_key
     commands = {
             "1": "menu.general_menu.options.create",
@@ -162,6 +167,8 @@ def kit_menu():
 # ====================================================
 def trips_menu():
     """ Displays trips menu """
+    from app.cli.trip_functions import input_trip, edit_trip, list_trips, delete_trip
+
     # key -> label_key
     commands = {
             "1": "menu.general_menu.options.create",
@@ -199,6 +206,9 @@ def trips_menu():
 # ====================================================
 def reports_menu():
     """ Displays reports menu """
+    from app.cli.gear_functions import list_unchecked_gear, list_overdue_gear
+    from app.cli.export_functions import export_data
+
     # key -> label_key
     commands = {
             "1": "menu.reports_menu.options.expired",
@@ -211,10 +221,13 @@ def reports_menu():
 
         match choice:
             case "1":
-                list_unchecked_gear()
+                list_overdue_gear()
                 continue
             case "2":
-                list_overdue_gear()
+                list_unchecked_gear()
+                continue
+            case "3":
+                export_data()
                 continue
             case "B":
                 main_menu()
@@ -255,6 +268,10 @@ def settings_menu():
 # ====================================================
 def edit_base_submenu():
     """ Displays Edit Base submenu """
+    from app.cli.brand_functions import input_brand, list_brands, edit_brand, delete_brand
+    from app.cli.category_functions import input_category, list_categories, edit_category, delete_category
+    from app.cli.consumable_functions import input_consumable, edit_consumable, list_consumables, delete_consumable
+
     # key -> label_key
     commands = {
             "1": "menu.edit_base_submenu.options.addbrand",
@@ -327,6 +344,8 @@ def edit_base_submenu():
 # ====================================================
 def debug_menu():
     """ Displays DEBUG menu """
+    from app.cli.comment_functions import input_comment, list_comments
+
     # key -> label_key
     commands = {
             "1": "menu.debug_menu.options.add_comment",
@@ -8,7 +8,7 @@ from app.core.utils.validation import (
 from app.core.trip import Trip
 from app.core.gear_item import Gear
 from app.core.kit_item import Kit
-from app.cli.cli_utils import paged_list, print_table, show_diff, prompt_field
+from app.cli.cli_utils import paged_list, print_table, show_diff, prompt_field, fuzzy_pick, confirm
 from app.cli.comment_functions import list_comments
 
 
@@ -44,24 +44,6 @@ def _trips_to_display_rows(trips: list[Trip]) -> list[dict]:
         for t in trips
     ]
 
-def _count_trip_references_gear(gear_id: int) -> int:
-    """Count how many trips reference this gear."""
-    trips = db.get_all_trips()
-    return sum(
-        1 for t in trips
-        if any(hasattr(item, "id_gear") and item.id_gear == gear_id for item in t.items)
-    )
-
-
-def _count_trip_references_kit(kit_id: int) -> int:
-    """Count how many trips reference this kit."""
-    trips = db.get_all_trips()
-    return sum(
-        1 for t in trips
-        if any(hasattr(item, "id_kit") and item.id_kit == kit_id for item in t.items)
-    )
-
-
 # -----------------------------------------------
 # Item selection (gear + kits combined)
 # -----------------------------------------------
@@ -150,7 +132,7 @@ def _show_current_items(trip: Trip):
     print(lang.t("trip_functions.msg.current_items"))
     for item, amt in zip(trip.items, trip.item_amounts):
         marker = "[K]" if isinstance(item, Kit) else "[G]"
-        mass   = item.total_mass() if isinstance(item, Kit) else (item.mass_pcs or 0) * amt
+        mass   = (item.total_mass if isinstance(item, Kit) else (item.mass_pcs or 0)) * amt
         print(f"  {marker} {item.name}  x{amt}  — {mass}g")
 
 
@@ -243,7 +225,7 @@ def display_full_trip(trip: Trip):
     gear_rows = []
     for item, amt in zip(trip.items, trip.item_amounts):
         if isinstance(item, Kit):
-            mass = item.total_mass() * amt
+            mass = item.total_mass * amt
             gear_rows.append({"marker": "[K]", "name": item.name, "variant": "—", "amount": amt, "mass": f"{mass}g"})
         else:
             mass = (item.mass_pcs or 0) * amt
@@ -383,7 +365,7 @@ def input_trip():
 
 def edit_trip():
     print(lang.t("edit_functions.title.edit_trip"))
-    row = _fuzzy_pick("Trip", "user_db", ["id_trip", "name"], ["ID", "Name"])
+    row = fuzzy_pick("Trip", "user_db", ["id_trip", "name"], ["ID", "Name"])
     if not row:
         return
 
@@ -496,8 +478,6 @@ def edit_trip():
 
 def list_trips():
     """Paged list of all trips."""
-    trips = db.get_all_trips()
-
     def on_select(item):
         trip = db.get_trip_by_id(item["id_trip"])
         display_full_trip(trip)
@@ -505,7 +485,10 @@ def list_trips():
         input(lang.t("trip_functions.msg.enter_to_return"))
 
     paged_list(
-        items        = _trips_to_display_rows(trips),
+        items        = db.trip_pager(
+            hydrate = lambda ids: _trips_to_display_rows(db.get_trips_lazy(ids)),
+            key     = lambda row: row["id_trip"],
+        ),
         columns      = TRIP_LIST_COLUMNS,
         default_cols = DEFAULT_TRIP_COLS,
         on_select    = on_select,
@@ -515,7 +498,7 @@ def list_trips():
 
 def delete_trip():
     print(lang.t("delete_functions.title.delete_trip"))
-    row = _fuzzy_pick("Trip", "user_db", ["id_trip", "name"], ["ID", "Name"])
+    row = fuzzy_pick("Trip", "user_db", ["id_trip", "name"], ["ID", "Name"])
     if not row:
         return
 
@@ -2,7 +2,26 @@ import json
 from pathlib import Path
 
 class ConfigManager:
+    """
+    Settings from defaults.json merged with config.json.
+
+    There is one shared instance per config directory: every module can
+    call ConfigManager() at import time, the files are only read by the
+    first call, and set() is seen by all of them.
+    """
+    _instances: dict[Path, "ConfigManager"] = {}
+
+    def __new__(cls, config_dir=None):
+        key = Path(config_dir or "app/config").resolve()
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = cls._instances[key] = super().__new__(cls)
+            instance._loaded = False
+        return instance
+
     def __init__(self, config_dir=None):
+        if self._loaded:
+            return
         if config_dir is None:
             config_dir = "app/config"  # default path
         self.config_dir = Path(config_dir)
@@ -10,7 +29,10 @@ class ConfigManager:
         self.default_file = self.config_dir / "defaults.json"
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.config = self._load_config()
+        self._loaded = True
 
+    def reload(self):
+        """Read the files again (e.g. after config.json was edited by hand)."""
         self.config = self._load_config()
 
     def _load_config(self) -> dict:
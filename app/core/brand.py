@@ -6,8 +6,13 @@ from typing import Optional
 class Brand:
     """Represents a brand/manufacturer."""
     
-    # Class-level cache for brands (load once)
+    __slots__ = ("id_brand", "name", "description", "url")
+    
+    # Class-level cache for brands (load once), cleared by the brand
+    # write functions in app.data.db.program_db
     _brands_cache: dict[int, Brand] | None = None
+    cache_hits = 0
+    cache_misses = 0
     
     def __init__(
         self,
@@ -92,11 +97,20 @@ class Brand:
     @classmethod
     def get_by_id(cls, brand_id: int) -> Brand | None:
         """Get a Brand object by its ID, loading from database if needed."""
+        if cls._brands_cache is None:
+            cls.cache_misses += 1
+        else:
+            cls.cache_hits += 1
         brands = cls.load_from_db()
         result = brands.get(brand_id)
         return result
     
     @classmethod
     def clear_cache(cls):
-        """Clear the brand cache (useful for testing or after database updates)."""
+        """Clear the brand cache (called after every brand write)."""
         cls._brands_cache = None
+    
+    @classmethod
+    def cache_stats(cls) -> dict[str, int]:
+        """Lookup counters: served from the cache (hits) vs. loaded from the DB (misses)."""
+        return {"hits": cls.cache_hits, "misses": cls.cache_misses}
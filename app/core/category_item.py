@@ -4,6 +4,14 @@ from __future__ import annotations
 class Category:
     """Represents a gear category."""
     
+    __slots__ = ("id_category", "name", "description")
+    
+    # Class-level cache for categories (load once), cleared by the category
+    # write functions in app.data.db.program_db
+    _categories_cache: dict[int, Category] | None = None
+    cache_hits = 0
+    cache_misses = 0
+    
     def __init__(
         self,
         id_category: int,
@@ -16,3 +24,38 @@ class Category:
     
     def __repr__(self):
         return f"<Category {self.id_category}: {self.name}>"
+    
+    @classmethod
+    def load_from_db(cls) -> dict[int, Category]:
+        """
+        Load all categories from program_db and cache them.
+        Returns a dict mapping id_category -> Category object.
+        """
+        if cls._categories_cache is not None:
+            return cls._categories_cache
+        
+        from app.data.db.program_db import get_all_categories
+        cls._categories_cache = {
+            row[0]: cls(id_category=row[0], name=row[1], description=row[2])
+            for row in get_all_categories()
+        }
+        return cls._categories_cache
+    
+    @classmethod
+    def get_by_id(cls, category_id: int) -> Category | None:
+        """Get a Category object by its ID, loading from database if needed."""
+        if cls._categories_cache is None:
+            cls.cache_misses += 1
+        else:
+            cls.cache_hits += 1
+        return cls.load_from_db().get(category_id)
+    
+    @classmethod
+    def clear_cache(cls):
+        """Clear the category cache (called after every category write)."""
+        cls._categories_cache = None
+    
+    @classmethod
+    def cache_stats(cls) -> dict[str, int]:
+        """Lookup counters: served from the cache (hits) vs. loaded from the DB (misses)."""
+        return {"hits": cls.cache_hits, "misses": cls.cache_misses}
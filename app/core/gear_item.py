@@ -1,15 +1,24 @@
 from __future__ import annotations
-from datetime import date, timedelta
+from datetime import date
 from typing import Optional, List, Union
 import json
 from pathlib import Path
 
+from app.core import lifecycle
 from app.core.brand import Brand
 
 class Gear:
     """
     Represents a single gear item in the system.
     """
+    # No per-instance __dict__: list views build thousands of these
+    __slots__ = (
+        "id_gear", "name", "variant", "brand_id", "_brand", "size", "mass_pcs",
+        "_price_cents", "amount", "color", "category_id", "_category", "comments",
+        "description", "prod_date", "checked", "last_checked", "lifespan", "kit_only",
+        "id_consumable",  # only set on Gear standing in for a consumable (Trip.consumables)
+    )
+
     def __init__(
         self,
         name: str,
@@ -151,13 +160,11 @@ class Gear:
     # -----------------------------
     def is_expired(self) -> bool:
         """
-        Return True if the gear is expired based on prod_date + lifespan.
-        If lifespan is 0 or None, it is considered 'never expires'.
+        Return True if the gear is expired based on prod_date + lifespan
+        years (see app.core.lifecycle). If lifespan is 0 or None, it is
+        considered 'never expires'.
         """
-        if not self.prod_date or not self.lifespan or self.lifespan == 0:
-            return False
-        expiry_date = self.prod_date + timedelta(days=self.lifespan * 365)
-        return date.today() > expiry_date
+        return lifecycle.is_expired(self.prod_date, self.lifespan)
     
     def check(self):
         """
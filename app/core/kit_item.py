@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Optional
+from typing import Callable, List, Optional
 from app.core.gear_item import Gear
 
 
@@ -7,6 +7,7 @@ class Kit:
     """
     Represents a collection of gear items.
     """
+    __slots__ = ("id_kit", "name", "description", "comments", "gear_list", "mass_correction", "gear_amount")
 
     def __init__(
         self,
@@ -70,6 +71,81 @@ class Kit:
     def __repr__(self) -> str:
         return (
             f"<Kit id={self.id_kit}, name={self.name}, "
-            f"items={len(self.gear_list)}, total_mass={self.total_mass()}g>"
+            f"items={self.item_count}, total_mass={self.total_mass}g>"
         )
 
+
+class LazyKit(Kit):
+    """
+    Kit that loads its gear only when gear_list / gear_amount is accessed.
+
+    item_count and total_mass are served from the aggregates computed in
+    the database as long as the gear has not been loaded, so list views
+    never build the Gear objects.
+
+    loader() must return (gear_list, gear_amount).
+    """
+    __slots__ = ("_loader", "_gear_list", "_gear_amount", "_item_count", "_total_mass")
+
+    def __init__(
+        self,
+        id_kit: int,
+        name: str,
+        loader: Callable[[], tuple[List[Gear], List[int]]],
+        description: Optional[str] = None,
+        comments: Optional[List[int]] = None,
+        mass_correction: int = 0,
+        item_count: int = 0,
+        total_mass: float = 0,
+    ):
+        self.id_kit = id_kit
+        self.name = name
+        self.description = description
+        self.comments = comments or []
+        self.mass_correction = mass_correction
+        self._loader = loader
+        self._gear_list = None
+        self._gear_amount = None
+        self._item_count = item_count
+        self._total_mass = total_mass
+
+    @property
+    def loaded(self) -> bool:
+        return self._gear_list is not None
+
+    def _load(self):
+        if self._gear_list is None:
+            self._gear_list, self._gear_amount = self._loader()
+
+    @property
+    def gear_list(self) -> List[Gear]:
+        self._load()
+        return self._gear_list
+
+    @gear_list.setter
+    def gear_list(self, value: List[Gear]):
+        self._load()
+        self._gear_list = value
+
+    @property
+    def gear_amount(self) -> List[int]:
+        self._load()
+        return self._gear_amount
+
+    @gear_amount.setter
+    def gear_amount(self, value: List[int]):
+        self._load()
+        self._gear_amount = value
+
+    @property
+    def total_mass(self) -> float:
+        if not self.loaded:
+            return self._total_mass
+        return Kit.total_mass.fget(self)
+
+    @property
+    def item_count(self) -> int:
+        if not self.loaded:
+            return self._item_count
+        return len(self._gear_list)
+
@@ -0,0 +1,100 @@
+"""
+lifecycle.py
+----------------------------------
+End-of-life and inspection rules for gear, in one place.
+
+- A gear item expires `lifespan` calendar years after its production date
+  (29 February rolls over to 1 March, like SQLite's '+N years'); it is
+  expired from that day on. A lifespan of 0 or None never expires.
+- An inspection is overdue when the gear was never checked, or was last
+  checked INSPECTION_INTERVAL_DAYS or more days ago.
+
+expiry_date() / is_expired() answer for one item (Gear.is_expired);
+evaluate() computes the same for whole columns of ordinals in one pass
+(GearTable, and through it the expired / overdue reports).
+"""
+
+from array import array
+from datetime import date
+
+INSPECTION_INTERVAL_DAYS = 365
+
+# Stands in for "no date" in the ordinal columns (valid ordinals start at 1)
+NO_DATE = 0
+
+
+def add_years(day: date, years: int) -> date:
+    """day + years calendar years; 29 February becomes 1 March in common years."""
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        return date(day.year + years, 3, 1)
+
+
+def expiry_date(prod_date: date | None, lifespan: int | None) -> date | None:
+    """First day the gear is expired, or None if it never expires."""
+    if not prod_date or not lifespan or lifespan <= 0:
+        return None
+    return add_years(prod_date, lifespan)
+
+
+def is_expired(prod_date: date | None, lifespan: int | None, today: date | None = None) -> bool:
+    expires = expiry_date(prod_date, lifespan)
+    return expires is not None and expires <= (today or date.today())
+
+
+class Lifecycle:
+    """
+    Result of evaluate(), one entry per row: expiry ordinal (NO_DATE if
+    never), days until expiry, days since the last check (NEVER where there
+    is no expiry / check) and the expired / inspection_due masks.
+    """
+
+    # days_* value of rows that never expire / were never checked
+    NEVER = -(2 ** 62)
+
+    def __init__(self, expires: array, days_until_expiry: array, days_since_check: array,
+                 expired: bytearray, inspection_due: bytearray):
+        self.expires           = expires
+        self.days_until_expiry = days_until_expiry
+        self.days_since_check  = days_since_check
+        self.expired           = expired
+        self.inspection_due    = inspection_due
+
+
+def evaluate(prod_dates, lifespans, last_checked, today: date | None = None) -> Lifecycle:
+    """
+    Apply the rules above to columns of ordinals (NO_DATE = missing) and
+    lifespans in years, all of the same length.
+    """
+    today = (today or date.today()).toordinal()
+    due_before = today - INSPECTION_INTERVAL_DAYS
+    never = Lifecycle.NEVER
+    # Many items share production date and lifespan; compute each expiry once
+    expiry_of: dict[tuple[int, int], int] = {}
+
+    expires, until = array("q"), array("q")
+    since = array("q")
+    expired, due = bytearray(), bytearray()
+    for prod, years, checked in zip(prod_dates, lifespans, last_checked):
+        if prod != NO_DATE and years and years > 0:
+            key = (prod, years)
+            end = expiry_of.get(key)
+            if end is None:
+                end = expiry_of[key] = add_years(date.fromordinal(prod), years).toordinal()
+            expires.append(end)
+            until.append(end - today)
+            expired.append(end <= today)
+        else:
+            expires.append(NO_DATE)
+            until.append(never)
+            expired.append(False)
+
+        if checked != NO_DATE:
+            since.append(today - checked)
+            due.append(checked <= due_before)
+        else:
+            since.append(never)
+            due.append(True)
+
+    return Lifecycle(expires, until, since, expired, due)
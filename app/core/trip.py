@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Optional, Union
+from typing import Callable, List, Optional, Union
 from datetime import date
 from app.core.gear_item import Gear
 from app.core.kit_item import Kit
@@ -9,6 +9,11 @@ class Trip:
     """
     Represents a trip with gear and consumables.
     """
+    __slots__ = (
+        "id_trip", "name", "description", "comments", "tags", "trip_month", "duration",
+        "max_altitude", "no_people", "items", "item_amounts", "gear_mass_correction",
+        "consumables", "consumable_amounts", "consumable_mass_correction",
+    )
 
     def __init__(
         self,
@@ -58,7 +63,7 @@ class Trip:
 
     def gear_mass(self) -> float:
         total = sum(
-            (item.total_mass() if isinstance(item, Kit) else (item.mass_pcs or 0)) * amt
+            (item.total_mass if isinstance(item, Kit) else (item.mass_pcs or 0)) * amt
             for item, amt in zip(self.items, self.item_amounts)
         )
         total += self.gear_mass_correction
@@ -107,3 +112,103 @@ class Trip:
             f"gear_mass={self.gear_mass()}g, consumable_mass={self.consumable_mass()}g>"
         )
 
+
+class LazyTrip(Trip):
+    """
+    Trip that loads its items and consumables only when they are accessed.
+
+    gear_mass, consumable_mass, total_mass and total_value are served from
+    the aggregates computed in the database (`totals`, keys "gear_mass",
+    "consumable_mass", "total_value"; corrections included) as long as
+    nothing has been loaded, so list views never build Kit or Gear objects.
+
+    loader() must return (items, item_amounts, consumables, consumable_amounts).
+    """
+    __slots__ = ("_loader", "_totals", "_contents")
+
+    def __init__(
+        self,
+        id_trip: int,
+        name: str,
+        loader: Callable[[], tuple[list, list, list, list]],
+        totals: dict,
+        description: Optional[str] = None,
+        comments: Optional[List[int]] = None,
+        tags: Optional[List[str]] = None,
+        trip_month: Optional[date] = None,
+        duration: int = 0,
+        max_altitude: Optional[int] = None,
+        no_people: int = 1,
+        gear_mass_correction: int = 0,
+        consumable_mass_correction: int = 0,
+    ):
+        self.id_trip = id_trip
+        self.name = name
+        self.description = description
+        self.comments = comments or []
+        self.tags = tags or []
+        self.trip_month = trip_month
+        self.duration = duration
+        self.max_altitude = max_altitude
+        self.no_people = no_people
+        self.gear_mass_correction = gear_mass_correction
+        self.consumable_mass_correction = consumable_mass_correction
+        self._loader = loader
+        self._totals = totals
+        self._contents = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._contents is not None
+
+    def _load(self) -> list:
+        if self._contents is None:
+            self._contents = list(self._loader())
+        return self._contents
+
+    @property
+    def items(self) -> list:
+        return self._load()[0]
+
+    @items.setter
+    def items(self, value: list):
+        self._load()[0] = value
+
+    @property
+    def item_amounts(self) -> list:
+        return self._load()[1]
+
+    @item_amounts.setter
+    def item_amounts(self, value: list):
+        self._load()[1] = value
+
+    @property
+    def consumables(self) -> list:
+        return self._load()[2]
+
+    @consumables.setter
+    def consumables(self, value: list):
+        self._load()[2] = value
+
+    @property
+    def consumable_amounts(self) -> list:
+        return self._load()[3]
+
+    @consumable_amounts.setter
+    def consumable_amounts(self, value: list):
+        self._load()[3] = value
+
+    def gear_mass(self) -> float:
+        if not self.loaded:
+            return self._totals["gear_mass"]
+        return super().gear_mass()
+
+    def consumable_mass(self) -> float:
+        if not self.loaded:
+            return self._totals["consumable_mass"]
+        return super().consumable_mass()
+
+    def total_value(self) -> float:
+        if not self.loaded:
+            return self._totals["total_value"]
+        return super().total_value()
@@ -1,9 +1,15 @@
+import atexit
+import heapq
+import os
 import sqlite3
+from itertools import islice
 from pathlib import Path
-from fuzzywuzzy import fuzz
 
 from app.config_manager import ConfigManager
 from app.lang import lang
+from app.data.db.connection import get_connection
+from app.core.utils import search_engine
+from app.data.db.fts_db import has_fts_index, fts_table_name, match_expression
 
 # Load config once
 config = ConfigManager()
@@ -15,6 +21,13 @@ BASE_DIR = Path(__file__).resolve().parents[3] #·goes·from·app/data·->·proj
 #program_db_rel·=·config.get("paths.program_db",·"app/data/program_db.sqlite")
 #DB_PATH·=·(BASE_DIR·/·program_db_rel).resolve()
 
+# Rows pulled from the FTS index (best bm25 first) and re-ranked with fuzz
+FTS_CANDIDATES = 200
+
+# From this many rows on, scoring is spread over a process pool
+PARALLEL_THRESHOLD = 50_000
+PARALLEL_WORKERS   = os.cpu_count() or 1
+
 def fuzzy_search(
     table: str,
     search_columns: str | list[str],
@@ -59,41 +72,180 @@ def fuzzy_search(
     query = f"SELECT {columns_sql} FROM {table}"
 
     try:
-        with sqlite3.connect(db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            results = []
+        # The resident search engine answers without touching SQLite
+        rows = search_engine.candidates(db_path, table, search_columns, search_term, return_columns,
+                                        min_similarity)
+        if rows is None:
+            conn = get_connection(db_path)
+            rows = _fts_candidates(conn, table, query, search_columns, search_term)
+            if rows is None:
+                # No usable FTS index, term too short or no trigram hit: scan
+                rows = conn.execute(query).fetchall()
+        return _rank_rows(rows, search_columns, search_term, limit, sort_by, sort_order, min_similarity)
+
+    except sqlite3.Error as e:
+        print(lang.t("db_utils.error.query_failed"), e)
+        return []
 
-            for row in rows:
-                row_dict = dict(row)
-                best_score = 0
 
-                for col in search_columns:
-                    value = str(row_dict.get(col, ""))
-                    score = fuzz.partial_ratio(search_term.lower(), value.lower())
-                    best_score = max(best_score, score)
+def _fts_candidates(conn, table: str, query: str, search_columns: list[str], search_term: str) -> list | None:
+    """
+    Pre-filter rows through the FTS5 trigram index: only the
+    FTS_CANDIDATES rows sharing the most trigrams with the term are
+    returned for fuzzy scoring. Returns None if the index can't be used
+    (no index, unknown column, term too short) or no row shares a
+    trigram: a typo like "tnet" still matches "Tent" in a full scan.
+    """
+    expression = match_expression(table, search_columns, search_term)
+    if expression is None or not has_fts_index(conn, table):
+        return None
 
-                if best_score >= min_similarity:
-                    row_dict["_similarity"] = best_score
-                    results.append(row_dict)
+    fts = fts_table_name(table)
+    rows = conn.execute(
+        f"{query} WHERE rowid IN "
+        f"(SELECT rowid FROM {fts} WHERE {fts} MATCH ? ORDER BY rank LIMIT ?)",
+        (expression, FTS_CANDIDATES),
+    ).fetchall()
+    return rows or None
 
-            # Sort by requested column(s), then similarity
-            if sort_by:
-                for col in reversed(sort_by):
-                    results.sort(
-                        key=lambda x: x.get(col, ""),
-                        reverse=(sort_order.upper() == "DESC"),
-                    )
 
-            results.sort(key=lambda x: x["_similarity"], reverse=True)
+###############################################################################
+#               Scoring and ranking
+###############################################################################
 
-            if limit:
-                results = results[:limit]
+def _score_rows(rows, search_columns: list[str], search_term: str, min_similarity: int, start: int = 0):
+    """
+    Score rows against the term and yield those above min_similarity as
+    (position, row dict) pairs; position is the row's index in the full
+    result set (start is the offset of this batch).
+    """
+    from fuzzywuzzy import fuzz  # deferred: only needed once a search runs
 
-            return results
+    term = search_term.lower()
+    for i, row in enumerate(rows, start):
+        row_dict = dict(row)
+        best_score = 0
 
-    except sqlite3.Error as e:
-        print(lang.t("db_utils.error.query_failed"), e)
+        for col in search_columns:
+            value = str(row_dict.get(col, ""))
+            score = fuzz.partial_ratio(term, value.lower())
+            best_score = max(best_score, score)
+
+        if best_score >= min_similarity:
+            row_dict["_similarity"] = best_score
+            yield i, row_dict
+
+
+class _Desc:
+    """Inverts the ordering of a value, for descending keys in a tuple."""
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def _rank_key(position: int, row: dict, sort_by: list[str] | None, descending: bool) -> tuple:
+    """
+    Composite key equal to the classic ordering: similarity (high first),
+    then the sort_by columns, then original position (stable sort).
+    """
+    cols = tuple(
+        _Desc(row.get(col, "")) if descending else row.get(col, "")
+        for col in sort_by or ()
+    )
+    return (-row["_similarity"], cols, position)
+
+
+def _top_k(scored, limit: int | None, sort_by: list[str] | None, descending: bool) -> list[tuple[int, dict]]:
+    """
+    Best `limit` scored rows in rank order. Streams through a bounded heap,
+    so only `limit` rows are held at a time: O(n log limit) time, O(limit)
+    memory. Without a limit every row is sorted.
+    """
+    key = lambda item: _rank_key(item[0], item[1], sort_by, descending)
+    if limit:
+        return heapq.nsmallest(limit, scored, key=key)
+    return sorted(scored, key=key)
+
+
+def _score_chunk(rows, start, search_columns, search_term, min_similarity, limit, sort_by, descending):
+    """Process pool worker: score one chunk, return its own top `limit` in rank order."""
+    scored = _score_rows(rows, search_columns, search_term, min_similarity, start)
+    return _top_k(scored, limit, sort_by, descending)
+
+
+def _rank_rows(
+    rows,
+    search_columns: list[str],
+    search_term: str,
+    limit: int | None,
+    sort_by: list[str] | None,
+    sort_order: str,
+    min_similarity: int,
+    workers: int | None = None,
+) -> list[dict]:
+    """Score rows and return the best `limit` of them in result order."""
+    if workers is None:
+        workers = PARALLEL_WORKERS if len(rows) >= PARALLEL_THRESHOLD else 1
+    if workers > 1:
+        return _rank_parallel(rows, search_columns, search_term, limit, sort_by, sort_order, min_similarity, workers)
+
+    scored = _score_rows(rows, search_columns, search_term, min_similarity)
+    return [row for _, row in _top_k(scored, limit, sort_by, sort_order.upper() == "DESC")]
+
+
+def _rank_parallel(rows, search_columns, search_term, limit, sort_by, sort_order, min_similarity, workers) -> list[dict]:
+    """
+    Score rows in a process pool. Every chunk returns its own top `limit`
+    already in rank order, so the global top `limit` is a heap merge of
+    the chunk heads instead of a sort of every match.
+    """
+    if not rows:
         return []
+    rows = [dict(row) for row in rows]  # sqlite3.Row can't be pickled
+    descending = sort_order.upper() == "DESC"
+    size = -(-len(rows) // (workers * 4))  # a few chunks per worker to even out the load
+
+    pool = _process_pool(workers)
+    try:
+        futures = [
+            pool.submit(_score_chunk, rows[start:start + size], start, search_columns,
+                        search_term, min_similarity, limit, sort_by, descending)
+            for start in range(0, len(rows), size)
+        ]
+        chunks = [future.result() for future in futures]
+    except Exception:
+        _shutdown_pool()  # e.g. a worker died: start a fresh pool next time
+        raise
+
+    merged = heapq.merge(*chunks, key=lambda item: _rank_key(item[0], item[1], sort_by, descending))
+    return [row for _, row in islice(merged, limit or None)]
+
+
+# (workers, ProcessPoolExecutor) shared by all parallel searches, created on first use
+_pool = None
+
+
+def _process_pool(workers: int):
+    """The shared pool with `workers` processes; workers are spawned only once."""
+    global _pool
+    if _pool is None or _pool[0] != workers:
+        from concurrent.futures import ProcessPoolExecutor  # deferred: pulls in multiprocessing
+
+        _shutdown_pool()
+        _pool = (workers, ProcessPoolExecutor(max_workers=workers))
+    return _pool[1]
+
+
+@atexit.register
+def _shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool[1].shutdown(cancel_futures=True)
+        _pool = None
@@ -0,0 +1,199 @@
+"""
+Resident search engine for the interactive pickers.
+
+Keeps every searchable table in memory together with a trigram inverted
+index of its text columns. It is built once at startup (initialize_all),
+and after that the CRUD functions in app.data.db call refresh() / remove()
+for every row they write, so the index is never rebuilt from scratch.
+
+fuzzy_search asks candidates() for the rows worth scoring: the rows
+sharing a trigram with the term, plus every other resident row whose
+letters could still reach min_similarity (typos like "tnet" share no
+trigram with "tent" but score 75). Only rows that can't match are left
+out, so the results are those of a full scan. When the engine is not
+built for a table it falls back to SQLite.
+"""
+
+from collections import Counter
+from pathlib import Path
+
+from app.data.db.connection import fetch_in, get_connection
+
+# table (lower case) -> (db name, table, primary key, indexed columns)
+SEARCH_TABLES = {
+    "gear":       ("user_db",    "Gear",       "id_gear",       ["name", "variant", "description"]),
+    "kit":        ("user_db",    "Kit",        "id_kit",        ["name", "description"]),
+    "trip":       ("user_db",    "Trip",       "id_trip",       ["name", "description"]),
+    "brand":      ("program_db", "Brand",      "id_brand",      ["name", "description"]),
+    "category":   ("program_db", "Category",   "id_category",   ["category", "description"]),
+    "consumable": ("program_db", "Consumable", "id_consumable", ["name", "description"]),
+}
+
+
+def _trigrams(text: str) -> set[str]:
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _max_score(letters: Counter, length: int, value: str) -> int:
+    """
+    Upper bound of fuzz.partial_ratio for a term (letters: its character
+    counts, length: its length) and a lower-case value: SequenceMatcher
+    can't match more characters than the two strings share.
+    """
+    shorter = min(length, len(value))
+    if not shorter:
+        return 0
+    shared = sum(min(count, value.count(char)) for char, count in letters.items())
+    return round(200 * shared / (shorter + shared))
+
+
+class TableIndex:
+    """All rows of one table plus {column: {trigram: {row ids}}}."""
+
+    def __init__(self, db_path: Path, table: str, pk: str, columns: list[str]):
+        self.db_path  = Path(db_path).resolve()
+        self.table    = table
+        self.pk       = pk
+        self.columns  = columns
+        self.rows     = {}
+        self.postings = {col: {} for col in columns}
+
+    def load(self):
+        conn = get_connection(self.db_path)
+        for row in conn.execute(f"SELECT * FROM {self.table}"):
+            self.put(dict(row))
+
+    def put(self, row: dict):
+        row_id = row[self.pk]
+        old = self.rows.get(row_id)
+        if old is not None:
+            self._unindex(row_id, old)
+        # Updating in place keeps the table's row order for tie breaks
+        self.rows[row_id] = row
+        for col in self.columns:
+            for gram in _trigrams(str(row.get(col) or "")):
+                self.postings[col].setdefault(gram, set()).add(row_id)
+
+    def discard(self, row_id: int):
+        row = self.rows.pop(row_id, None)
+        if row is not None:
+            self._unindex(row_id, row)
+
+    def _unindex(self, row_id: int, row: dict):
+        for col in self.columns:
+            postings = self.postings[col]
+            for gram in _trigrams(str(row.get(col) or "")):
+                ids = postings.get(gram)
+                if ids is not None:
+                    ids.discard(row_id)
+                    if not ids:
+                        del postings[gram]
+
+    def candidates(self, search_columns: list[str], term: str, min_similarity: int = 0) -> list[dict]:
+        """
+        The rows of a full scan that can reach min_similarity in
+        search_columns, in table order: rows sharing a trigram with term,
+        and rows whose letters (_max_score) could still score high enough.
+        """
+        if min_similarity <= 0 or not term:
+            return list(self.rows.values())
+
+        hits = set()
+        grams = _trigrams(term.strip())
+        for col in search_columns:
+            postings = self.postings[col]
+            for gram in grams:
+                hits.update(postings.get(gram, ()))
+
+        # Scored as fuzzy_search does: str() of the value, lower case
+        letters, length = Counter(term.lower()), len(term)
+        return [
+            row for row_id, row in self.rows.items()
+            if row_id in hits or any(
+                _max_score(letters, length, str(row.get(col, "")).lower()) >= min_similarity
+                for col in search_columns
+            )
+        ]
+
+
+# table (lower case) -> TableIndex, filled by build()
+_indexes: dict[str, TableIndex] = {}
+
+
+def build(db_paths: dict[str, Path]):
+    """
+    Load every searchable table into memory.
+    db_paths maps a db name ("user_db", "program_db") to its file.
+    """
+    _indexes.clear()
+    for key, (db_name, table, pk, columns) in SEARCH_TABLES.items():
+        if db_name not in db_paths or not _table_exists(db_paths[db_name], table):
+            continue  # fuzzy_search falls back to SQLite for this table
+        index = TableIndex(db_paths[db_name], table, pk, columns)
+        index.load()
+        _indexes[key] = index
+
+
+def _table_exists(db_path: Path, table: str) -> bool:
+    conn = get_connection(Path(db_path).resolve())
+    cursor = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,))
+    return cursor.fetchone() is not None
+
+
+def is_built(table: str) -> bool:
+    return table.lower() in _indexes
+
+
+def refresh(table: str, row_id: int, db_path: Path | str | None = None):
+    """Re-read one row after an insert or update. No-op if not built."""
+    if row_id is not None:
+        refresh_many(table, [row_id], db_path)
+
+
+def refresh_many(table: str, row_ids, db_path: Path | str | None = None):
+    """Re-read many rows after a bulk write (e.g. an import). No-op if not built."""
+    index = _indexes.get(table.lower())
+    if index is None or not row_ids:
+        return
+    if db_path is not None and Path(db_path).resolve() != index.db_path:
+        return
+    conn = get_connection(index.db_path)
+    rows = {row[index.pk]: row for row in fetch_in(conn, f"SELECT * FROM {index.table} WHERE {index.pk} IN ({{ids}})", row_ids)}
+    for row_id in row_ids:
+        row = rows.get(row_id)
+        if row is None:
+            index.discard(row_id)
+        else:
+            index.put(dict(row))
+
+
+def remove(table: str, row_id: int):
+    """Drop one row after a delete. No-op if not built."""
+    index = _indexes.get(table.lower())
+    if index is not None:
+        index.discard(row_id)
+
+
+def candidates(
+    db_path: Path | str,
+    table: str,
+    search_columns: list[str],
+    search_term: str,
+    return_columns: list[str] | None = None,
+    min_similarity: int = 0,
+) -> list[dict] | None:
+    """
+    Return the rows fuzzy_search should score, projected to return_columns,
+    or None if the engine can't serve this database, table or columns.
+    """
+    index = _indexes.get(table.lower())
+    if index is None or Path(db_path).resolve() != index.db_path:
+        return None
+    if any(col not in index.columns for col in search_columns):
+        return None
+
+    rows = index.candidates(search_columns, search_term, min_similarity)
+    if return_columns:
+        return [{col: row.get(col) for col in return_columns} for row in rows]
+    return [dict(row) for row in rows]
@@ -1,29 +1,60 @@
-# base functions
-from .base_db import table_exists, init_program_db, check_initialized
-# gear functions
-from .gear_db import add_gear, get_gear_by_id, get_all_gear, delete_gear, update_gear, get_gear_by_filter, get_overdue_inspection_gear, get_end_of_life_gear
-
-# kit functions
-from .kit_db  import add_kit,  get_kit_by_id,  get_all_kits,  delete_kit,  update_kit
-# trip functions
-from .trip_db import add_trip, get_trip_by_id, get_all_trips, delete_trip, update_trip
-# comment functions
-from .user_db import add_comment, get_comments_by_parent_id, get_comment_by_id, delete_comments_by_parent_id
-# brand functions
-from .program_db import add_brand, update_brand, get_all_brands, get_brand_by_id
-# consumable functions
-from .program_db import (
-    add_category, update_category, get_all_categories, get_category_by_id, delete_category, add_brand, update_brand, get_all_brands, get_brand_by_id, delete_brand, add_consumable, update_consumable, get_all_consumables, get_consumable_by_id, delete_consumable,
-)
-
-__all__ = [
-    table_exists, init_program_db, check_initialized,
-    add_gear, get_gear_by_id,
-    add_kit, get_kit_by_id, get_all_kits,
-    add_comment, get_comments_by_parent_id, get_comment_by_id,
-    add_category, update_category, get_all_categories, get_category_by_id,
-    add_brand, update_brand, get_all_brands, get_brand_by_id,
-    add_consumable, update_consumable, get_all_consumables, get_consumable_by_id,
-    add_trip, get_trip_by_id, get_all_trips,
-    add_comment, get_comments_by_parent_id, get_comment_by_id, delete_comments_by_parent_id, get_all_gear
-]
+"""
+Database API. The functions below are imported from their module on first
+use (module __getattr__), so importing app.data.db or one of its modules
+doesn't load every other one at startup.
+"""
+
+from importlib import import_module
+
+# module -> names it provides to `from app.data import db`
+_EXPORTS = {
+    # base functions
+    "base_db":      ["table_exists", "init_program_db", "check_initialized"],
+    # gear functions
+    "gear_db":      ["add_gear", "get_gear_by_id", "get_gear_by_ids", "get_all_gear", "delete_gear", "update_gear",
+                     "get_gear_by_filter", "get_overdue_inspection_gear", "get_end_of_life_gear", "gear_pager",
+                     "get_gear_rows_joined"],
+    # joined user_db + program_db queries (program_db ATTACHed as `program`)
+    "joined_db":    ["get_joined_connection"],
+    # columnar gear arrays for reports
+    "gear_table":   ["GearTable", "get_gear_table"],
+
+    # kit functions
+    "kit_db":       ["add_kit", "get_kit_by_id", "get_all_kits", "get_kits_bulk", "delete_kit", "update_kit",
+                     "kit_pager", "get_kits_lazy", "get_kit_totals"],
+    # trip functions
+    "trip_db":      ["add_trip", "get_trip_by_id", "get_all_trips", "get_trips_bulk", "delete_trip", "update_trip",
+                     "trip_pager", "get_trip_consumable_rows", "get_trips_lazy", "get_trip_totals"],
+    # bulk import
+    "import_db":    ["import_gear", "import_gear_file", "read_rows"],
+    # streaming export
+    "export_db":    ["export", "available_formats"],
+    # gear repository (batch brand/category resolution)
+    "repository":   ["GearRepository", "resolve_gear_references"],
+    # reference lookups
+    "reference_db": ["where_used", "is_referenced"],
+    # comment functions
+    "user_db":      ["add_comment", "get_comments_by_parent_id", "get_comment_by_id", "delete_comments_by_parent_id"],
+    # brand, category and consumable functions
+    "program_db":   ["add_category", "update_category", "get_all_categories", "get_category_by_id",
+                     "get_categories_by_ids", "delete_category", "add_brand", "update_brand", "get_all_brands",
+                     "get_brand_by_id", "get_brands_by_ids", "delete_brand", "brand_pager", "add_consumable",
+                     "update_consumable", "get_all_consumables", "get_consumable_by_id", "delete_consumable"],
+}
+
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULE_OF)
+
+
+def __getattr__(name: str):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
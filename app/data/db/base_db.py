@@ -3,6 +3,7 @@ from pathlib import Path
 
 from app.config_manager import ConfigManager  # assuming you have this
 from app.lang import lang
+from app.data.db.connection import get_connection, transaction
 
 # Load config once
 config = ConfigManager()  # reads defaults + user config
@@ -38,46 +39,42 @@ def init_program_db(db_path: Path | str = DB_PATH):
     - Consumable
     Only creates tables if they do not exist already.
     """
-    conn = sqlite3.connect(db_path)
     tables_created = False
-
-    # Create Brand table if missing
-    if not table_exists(conn, "Brand"):
-        conn.execute("""
-            CREATE TABLE Brand (
-                id_brand INTEGER PRIMARY KEY,  -- unique identifier for brand
-                name TEXT,                     -- brand name
-                description TEXT,              -- brand description
-                url TEXT                       -- brand website URL
-            )
-        """)
-        tables_created = True
-
-    # Create Category table if missing
-    if not table_exists(conn, "Category"):
-        conn.execute("""
-            CREATE TABLE Category (
-                id_category INTEGER PRIMARY KEY,  -- unique identifier for category
-                category TEXT,                    -- category name
-                description TEXT                  -- description of the category
-            )
-        """)
-        tables_created = True
-
-    # Create Consumable table if missing
-    if not table_exists(conn, "Consumable"):
-        conn.execute("""
-            CREATE TABLE Consumable (
-                id_consumable INTEGER PRIMARY KEY,  -- unique identifier for consumable
-                name TEXT,                          -- consumable name
-                description TEXT,                   -- description of consumable
-                weight INTEGER                      -- weight in grams (or units)
-            )
-        """)
-        tables_created = True
-
-    conn.commit()
-    conn.close()
+    with transaction(db_path) as conn:
+        # Create Brand table if missing
+        if not table_exists(conn, "Brand"):
+            conn.execute("""
+                CREATE TABLE Brand (
+                    id_brand INTEGER PRIMARY KEY,  -- unique identifier for brand
+                    name TEXT,                     -- brand name
+                    description TEXT,              -- brand description
+                    url TEXT                       -- brand website URL
+                )
+            """)
+            tables_created = True
+
+        # Create Category table if missing
+        if not table_exists(conn, "Category"):
+            conn.execute("""
+                CREATE TABLE Category (
+                    id_category INTEGER PRIMARY KEY,  -- unique identifier for category
+                    category TEXT,                    -- category name
+                    description TEXT                  -- description of the category
+                )
+            """)
+            tables_created = True
+
+        # Create Consumable table if missing
+        if not table_exists(conn, "Consumable"):
+            conn.execute("""
+                CREATE TABLE Consumable (
+                    id_consumable INTEGER PRIMARY KEY,  -- unique identifier for consumable
+                    name TEXT,                          -- consumable name
+                    description TEXT,                   -- description of consumable
+                    weight INTEGER                      -- weight in grams (or units)
+                )
+            """)
+            tables_created = True
 
     if tables_created:
         print(lang.t("program_db.msg.db_initialized", db_path=db_path))
@@ -88,11 +85,8 @@ def check_initialized(db_path: Path = DB_PATH) -> bool:
     Returns True if all required tables exist in the program DB.
     """
     required_tables = ["Brand", "Category", "Consumables"]
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-
-    c.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    conn = get_connection(db_path)
+    c = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
     existing_tables = [row[0] for row in c.fetchall()]
 
-    conn.close()
     return all(table in existing_tables for table in required_tables)
@@ -0,0 +1,117 @@
+"""
+Read-through cache for the list queries of app.data.db.
+
+Every table has a generation counter. The write functions (add_*, update_*,
+delete_*) call bump() for the table they changed, and a cached result is
+only served while the generations of all the tables it was built from are
+unchanged, so there is never anything to invalidate by hand.
+
+The cache is an LRU bounded by MAX_ENTRIES and by an estimate of the
+memory it holds (MAX_BYTES). Callers get a new list (or dict) on every
+call, but the objects inside are shared between calls: treat them as
+read-only and write changes back through update_*.
+
+Use:
+    @cached("gear", "brand", "category")
+    def get_all_gear(): ...
+"""
+
+import functools
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+MAX_ENTRIES = 128
+MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+
+_generations: dict[str, int] = {}
+_entries: "OrderedDict[tuple, tuple[tuple, Any, int]]" = OrderedDict()  # key -> (stamp, value, size)
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "bytes": 0}
+
+
+def bump(*tables: str):
+    """Mark tables as changed; cached results built from them are stale."""
+    with _lock:
+        for table in tables:
+            _generations[table] = _generations.get(table, 0) + 1
+
+
+def generation(table: str) -> int:
+    return _generations.get(table, 0)
+
+
+def _approx_size(value) -> int:
+    """Shallow estimate: the container plus each item (and its __dict__, if any)."""
+    size = sys.getsizeof(value)
+    items = value.values() if isinstance(value, dict) else value if isinstance(value, (list, tuple)) else ()
+    for item in items:
+        size += sys.getsizeof(item)
+        if hasattr(item, "__dict__"):
+            size += sys.getsizeof(item.__dict__)
+    return size
+
+
+def memoize(key: tuple, tables: tuple[str, ...], loader: Callable[[], Any]) -> Any:
+    """
+    Return the cached value for key, or call loader() and cache its result.
+    The entry is valid as long as none of `tables` has been bumped.
+    """
+    with _lock:
+        stamp = tuple(_generations.get(table, 0) for table in tables)
+        entry = _entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+            return entry[1]
+        _stats["misses"] += 1
+
+    # Load outside the lock; a bump meanwhile leaves the entry already stale
+    value = loader()
+    size = _approx_size(value)
+
+    with _lock:
+        old = _entries.pop(key, None)
+        if old is not None:
+            _stats["bytes"] -= old[2]
+        if size <= MAX_BYTES:
+            _entries[key] = (stamp, value, size)
+            _stats["bytes"] += size
+        while _entries and (len(_entries) > MAX_ENTRIES or _stats["bytes"] > MAX_BYTES):
+            _, (_, _, evicted) = _entries.popitem(last=False)
+            _stats["bytes"] -= evicted
+    return value
+
+
+def _copy(value):
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def cached(*tables: str):
+    """Cache a read function until one of `tables` is written to."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+            return _copy(memoize(key, tables, lambda: func(*args, **kwargs)))
+        wrapper.cache_tables = tables
+        return wrapper
+    return decorate
+
+
+def clear():
+    """Drop every cached result (the generations are kept)."""
+    with _lock:
+        _entries.clear()
+        _stats["bytes"] = 0
+
+
+def stats() -> dict[str, int]:
+    """hits, misses, cached entries and their estimated bytes."""
+    with _lock:
+        return {**_stats, "entries": len(_entries)}
@@ -0,0 +1,137 @@
+import atexit
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# One connection per database file per thread, opened on first use and kept
+# open for the lifetime of the thread. sqlite3 connections must not be shared
+# between threads, so the pool lives in thread-local storage.
+_local = threading.local()
+
+# Every connection ever handed out, so they can all be closed on exit
+_all_connections: list[sqlite3.Connection] = []
+_all_lock = threading.Lock()
+
+# Applied once when a connection is opened
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",      # readers don't block the writer
+    "PRAGMA synchronous = NORMAL",    # safe with WAL, far fewer fsyncs
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",     # ~16 MB page cache
+    "PRAGMA mmap_size = 67108864",    # 64 MB memory mapped I/O
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+def _open(db_path: str) -> sqlite3.Connection:
+    """Open a new connection and apply the tuned PRAGMAs."""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    with _all_lock:
+        _all_connections.append(conn)
+    return conn
+
+
+def _attach(conn: sqlite3.Connection, key: str, alias: str, db_path: Path | str):
+    """ATTACH db_path as alias on the pooled connection `key`, once."""
+    attached = _local.attached.setdefault(key, {})
+    path = str(Path(db_path).resolve())
+    if attached.get(alias) == path:
+        return
+    if alias in attached:
+        conn.execute(f"DETACH DATABASE {alias}")
+    conn.execute(f"ATTACH DATABASE ? AS {alias}", (path,))
+    attached[alias] = path
+
+
+def get_connection(db_path: Path | str, attach: dict[str, Path | str] | None = None) -> sqlite3.Connection:
+    """
+    Return the shared connection for db_path in the current thread.
+
+    Rows come back as sqlite3.Row, which still supports index access,
+    so callers that expect plain tuples keep working.
+    Don't close the returned connection; use `with conn:` to commit.
+
+    attach maps an alias to another database file that is ATTACHed to the
+    connection (only the first time), so one statement can join tables of
+    both files, e.g. get_connection(user_db, attach={"program": program_db})
+    and then "... JOIN program.Brand ...".
+    """
+    key = str(Path(db_path).resolve())
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _local.pool = {}
+        _local.attached = {}
+
+    conn = pool.get(key)
+    if conn is None:
+        conn = pool[key] = _open(key)
+    for alias, attach_path in (attach or {}).items():
+        _attach(conn, key, alias, attach_path)
+    return conn
+
+
+@contextmanager
+def transaction(db_path: Path | str, attach: dict[str, Path | str] | None = None):
+    """
+    Yield the shared connection inside a transaction.
+    Commits on success, rolls back if the block raises.
+    attach works as in get_connection().
+    """
+    conn = get_connection(db_path, attach)
+    with conn:
+        yield conn
+
+
+def close_connection(db_path: Path | str):
+    """Close and forget the current thread's connection for db_path."""
+    key = str(Path(db_path).resolve())
+    pool = getattr(_local, "pool", None) or {}
+    conn = pool.pop(key, None)
+    getattr(_local, "attached", {}).pop(key, None)
+    if conn is not None:
+        with _all_lock:
+            if conn in _all_connections:
+                _all_connections.remove(conn)
+        conn.close()
+
+
+@atexit.register
+def close_all():
+    """Close every pooled connection (all threads)."""
+    with _all_lock:
+        conns = list(_all_connections)
+        _all_connections.clear()
+    for conn in conns:
+        try:
+            conn.close()
+        except sqlite3.ProgrammingError:
+            # Connection belongs to another thread that already closed it
+            pass
+    _local.pool = {}
+    _local.attached = {}
+
+
+# SQLite caps the number of bound parameters per statement; stay well below it
+MAX_IN_PARAMS = 900
+
+
+def fetch_in(conn: sqlite3.Connection, query: str, ids) -> list[sqlite3.Row]:
+    """
+    Run a query containing a single `IN ({ids})` placeholder for a list of IDs.
+    Large lists are split into chunks, so any number of IDs costs
+    len(ids) / MAX_IN_PARAMS statements instead of one per ID.
+
+    Use:
+        fetch_in(conn, "SELECT * FROM Gear WHERE id_gear IN ({ids})", [1, 2, 3])
+    """
+    ids = list(dict.fromkeys(ids))  # unique, keep order
+    rows = []
+    for start in range(0, len(ids), MAX_IN_PARAMS):
+        chunk = ids[start:start + MAX_IN_PARAMS]
+        placeholders = ", ".join("?" * len(chunk))
+        rows.extend(conn.execute(query.format(ids=placeholders), chunk).fetchall())
+    return rows
@@ -0,0 +1,276 @@
+"""
+Streaming export of gear, kits, trips and comments to CSV, JSON Lines or
+Parquet.
+
+Rows go from a SQLite cursor to the file in chunks of CHUNK_SIZE, without
+Gear / Kit / Trip objects, so memory stays flat however large the tables
+are. JSON Lines are built by SQLite itself (json_object), one line per row.
+The file is written next to the target as <name>.part and renamed when
+complete, so a failed export leaves no half-written file behind.
+
+Gear is exported with the column names of the importer (import_db) and
+brand / category by name, so an export can be imported again. Gear can be
+filtered with the keywords of get_gear_by_filter (gear_db.GEAR_FILTERS).
+Kits and trips carry their totals (Kit_Totals / Trip_Totals) and their
+contents as JSON arrays.
+
+Parquet needs pyarrow, which is optional: available_formats() only lists
+it when pyarrow is installed.
+
+Use:
+    export("gear", "unchecked.csv", checked=0)
+    export("trips", "trips.parquet")
+"""
+
+import csv
+import importlib.util
+from pathlib import Path
+from typing import Callable, Iterator
+
+from app.data.db import totals_db
+from app.data.db.gear_db import gear_filter
+from app.data.db.joined_db import PROGRAM, get_joined_connection, joined_transaction
+
+CHUNK_SIZE = 5_000
+
+# File suffix -> format
+FORMATS = {
+    ".csv":     "csv",
+    ".jsonl":   "jsonl",
+    ".ndjson":  "jsonl",
+    ".parquet": "parquet",
+}
+
+# Column kinds: "int", "float", "text" and "json" (a JSON array or object
+# stored as text; nested in JSON Lines, text in CSV and Parquet)
+
+# Some older rows hold the category name itself in category_id
+_CATEGORY_NAME = "COALESCE(c.category, CASE WHEN typeof(g.category_id) = 'text' THEN g.category_id END)"
+
+# dataset -> (FROM clause, ORDER BY, [(column, SQL expression, kind), ...])
+DATASETS = {
+    "gear": (
+        f"""Gear g
+            LEFT JOIN {PROGRAM}.Brand    b ON b.id_brand    = g.brand_id
+            LEFT JOIN {PROGRAM}.Category c ON c.id_category = g.category_id""",
+        "g.id_gear",
+        [
+            ("id_gear",      "g.id_gear",                   "int"),
+            ("name",         "g.name",                      "text"),
+            ("variant",      "g.variant",                   "text"),
+            ("brand",        "b.name",                      "text"),
+            ("size",         "g.size",                      "text"),
+            ("mass_pcs",     "g.mass_pcs",                  "float"),
+            ("price",        "g.price_cents / 100.0",       "float"),
+            ("amount",       "g.amount",                    "float"),
+            ("color",        "g.color",                     "text"),
+            ("category",     _CATEGORY_NAME,                "text"),
+            ("description",  "g.description",               "text"),
+            ("prod_date",    "g.prod_date",                 "text"),
+            ("checked",      "COALESCE(g.checked = 1, 0)",  "int"),
+            ("last_checked", "g.last_checked",              "text"),
+            ("lifespan",     "NULLIF(g.lifespan, 0)",       "int"),
+            ("kit_only",     "COALESCE(g.kit_only = 1, 0)", "int"),
+        ],
+    ),
+    "kits": (
+        "Kit k LEFT JOIN Kit_Totals kt ON kt.kit_id = k.id_kit",
+        "k.id_kit",
+        [
+            ("id_kit",          "k.id_kit",                "int"),
+            ("name",            "k.name",                  "text"),
+            ("description",     "k.description",           "text"),
+            ("mass_correction", "k.mass_correction",       "float"),
+            ("item_count",      "kt.item_count",           "int"),
+            ("total_mass",      "kt.total_mass",           "float"),
+            ("value",           "kt.value_cents / 100.0",  "float"),
+            ("gear",            """(SELECT json_group_array(json_object('gear_id', gear_id, 'amount', amount))
+                                    FROM (SELECT gear_id, amount FROM Kit_Gear
+                                          WHERE kit_id = k.id_kit ORDER BY id))""", "json"),
+        ],
+    ),
+    "trips": (
+        "Trip t LEFT JOIN Trip_Totals tt ON tt.trip_id = t.id_trip",
+        "t.id_trip",
+        [
+            ("id_trip",                    "t.id_trip",                    "int"),
+            ("name",                       "t.name",                       "text"),
+            ("description",                "t.description",                "text"),
+            ("tag",                        "t.tag",                        "json"),
+            ("trip_month",                 "t.trip_month",                 "text"),
+            ("duration",                   "t.duration",                   "int"),
+            ("max_altitude",               "t.max_altitude",               "int"),
+            ("no_people",                  "t.no_people",                  "int"),
+            ("gear_mass_correction",       "t.gear_mass_correction",       "float"),
+            ("consumable_mass_correction", "t.consumable_mass_correction", "float"),
+            ("gear_mass",                  "tt.gear_mass",                 "float"),
+            ("consumable_mass",            "tt.consumable_mass",           "float"),
+            ("value",                      "tt.value_cents / 100.0",       "float"),
+            ("items",                      """(SELECT json_group_array(json_object('item_type', item_type, 'item_id', item_id, 'amount', amount))
+                                               FROM (SELECT item_type, item_id, amount FROM Trip_Items
+                                                     WHERE trip_id = t.id_trip ORDER BY id))""", "json"),
+            ("consumables",                """(SELECT json_group_array(json_object('consumable_id', consumable_id, 'amount', amount))
+                                               FROM (SELECT consumable_id, amount FROM Trip_Consumables
+                                                     WHERE trip_id = t.id_trip ORDER BY id))""", "json"),
+        ],
+    ),
+    "comments": (
+        "Comments",
+        "id_comment",
+        [
+            ("id_comment", "id_comment", "int"),
+            ("parent_id",  "parent_id",  "int"),
+            ("date",       "date",       "text"),
+            ("comment",    "comment",    "text"),
+        ],
+    ),
+}
+
+
+def available_formats() -> list[str]:
+    """Export formats usable here; parquet only with pyarrow installed."""
+    formats = ["csv", "jsonl"]
+    if importlib.util.find_spec("pyarrow") is not None:
+        formats.append("parquet")
+    return formats
+
+
+def format_of(path: Path | str) -> str:
+    """Export format from the file suffix; ValueError for unknown suffixes."""
+    suffix = Path(path).suffix.lower()
+    if suffix not in FORMATS:
+        raise ValueError(f"Unknown export format '{suffix}' (use {', '.join(FORMATS)})")
+    return FORMATS[suffix]
+
+
+###############################################################################
+#               Queries
+###############################################################################
+
+def _query(dataset: str, fmt: str, filters: dict) -> tuple[str, list]:
+    """SELECT of a dataset: the columns, or one json_object per row for JSON Lines."""
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset '{dataset}' (use {', '.join(DATASETS)})")
+    source, order_by, columns = DATASETS[dataset]
+
+    where, params = "", []
+    if filters:
+        if dataset != "gear":
+            raise ValueError(f"Only gear can be filtered, not {dataset}")
+        where, params = gear_filter(**filters)
+
+    if fmt == "jsonl":
+        pairs = ", ".join(f"'{name}', {_json_value(expr) if kind == 'json' else expr}"
+                          for name, expr, kind in columns)
+        select = f"json_object({pairs})"
+    else:
+        select = ", ".join(f"{expr} AS {name}" for name, expr, _ in columns)
+    return f"SELECT {select} FROM {source} {where} ORDER BY {order_by}", params
+
+
+def _json_value(expr: str) -> str:
+    """Nested JSON in a json_object; text that isn't valid JSON stays text."""
+    return f"CASE WHEN json_valid({expr}) THEN json({expr}) ELSE {expr} END"
+
+
+def _chunks(query: str, params, chunk_size: int) -> Iterator[list[tuple]]:
+    """The rows of query as plain tuples, chunk_size at a time."""
+    cursor = get_joined_connection().cursor()
+    cursor.row_factory = None
+    cursor.execute(query, params)
+    try:
+        while chunk := cursor.fetchmany(chunk_size):
+            yield chunk
+    finally:
+        cursor.close()
+
+
+###############################################################################
+#               Writers
+###############################################################################
+
+def _write_csv(path: Path, columns: list, chunks: Iterator[list[tuple]], progress) -> int:
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([name for name, _, _ in columns])
+        for chunk in chunks:
+            writer.writerows(chunk)
+            count += len(chunk)
+            progress(count)
+    return count
+
+
+def _write_jsonl(path: Path, columns: list, chunks: Iterator[list[tuple]], progress) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            f.writelines(f"{line}\n" for line, in chunk)
+            count += len(chunk)
+            progress(count)
+    return count
+
+
+def _write_parquet(path: Path, columns: list, chunks: Iterator[list[tuple]], progress) -> int:
+    """One row group per chunk, with the column types of the dataset."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet export needs pyarrow (pip install pyarrow)") from None
+
+    types = {"int": pa.int64(), "float": pa.float64(), "text": pa.string(), "json": pa.string()}
+    schema = pa.schema([(name, types[kind]) for name, _, kind in columns])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*chunk), schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(chunk)
+            progress(count)
+    return count
+
+
+_WRITERS = {
+    "csv":     _write_csv,
+    "jsonl":   _write_jsonl,
+    "parquet": _write_parquet,
+}
+
+
+###############################################################################
+#               Export
+###############################################################################
+
+def export(
+    dataset: str,
+    path: Path | str,
+    fmt: str | None = None,
+    progress: Callable[[int], None] | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    **filters,
+) -> int:
+    """
+    Stream one dataset ("gear", "kits", "trips", "comments") to path and
+    return the number of rows written. fmt defaults to the file suffix;
+    filters (gear only) are those of get_gear_by_filter. progress(rows) is
+    called after every chunk.
+    """
+    path = Path(path)
+    fmt = fmt or format_of(path)
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown export format '{fmt}' (use {', '.join(_WRITERS)})")
+    query, params = _query(dataset, fmt, filters)
+
+    if dataset in ("kits", "trips"):
+        with joined_transaction() as conn:
+            totals_db.recompute_missing(conn)
+
+    part = path.with_name(path.name + ".part")
+    try:
+        count = _WRITERS[fmt](part, DATASETS[dataset][2], _chunks(query, params, chunk_size),
+                              progress or (lambda rows: None))
+        part.replace(path)
+    finally:
+        part.unlink(missing_ok=True)
+    return count
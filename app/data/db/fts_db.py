@@ -0,0 +1,143 @@
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.lang import lang
+from app.data.db.connection import get_connection, transaction
+
+# Shortest search term the trigram index can serve
+MIN_TERM_LENGTH = 3
+
+# table (lower case) -> (table, primary key, indexed columns)
+FTS_TABLES = {
+    "gear":       ("Gear",       "id_gear",       ["name", "variant", "description"]),
+    "kit":        ("Kit",        "id_kit",        ["name", "description"]),
+    "brand":      ("Brand",      "id_brand",      ["name", "description"]),
+    "category":   ("Category",   "id_category",   ["category", "description"]),
+    "consumable": ("Consumable", "id_consumable", ["name", "description"]),
+}
+
+USER_FTS_TABLES    = ["gear", "kit"]
+PROGRAM_FTS_TABLES = ["brand", "category", "consumable"]
+
+
+def fts_table_name(table: str) -> str:
+    return f"{FTS_TABLES[table.lower()][0]}_fts"
+
+
+def create_fts_index(conn: sqlite3.Connection, table: str):
+    """
+    Create the external-content FTS5 trigram index of a table, the triggers
+    that keep it in sync, and fill it from the existing rows.
+    """
+    name, pk, columns = FTS_TABLES[table.lower()]
+    fts  = f"{name}_fts"
+    cols = ", ".join(columns)
+    new  = ", ".join(f"new.{c}" for c in columns)
+    old  = ", ".join(f"old.{c}" for c in columns)
+
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {cols}, content='{name}', content_rowid='{pk}', tokenize='trigram'
+        )
+    """)
+    conn.execute(_insert_trigger(name, pk, columns))
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {name} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {old});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {name} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {old});
+            INSERT INTO {fts} (rowid, {cols}) VALUES (new.{pk}, {new});
+        END
+    """)
+    conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+def _insert_trigger(name: str, pk: str, columns: list[str]) -> str:
+    fts  = f"{name}_fts"
+    cols = ", ".join(columns)
+    new  = ", ".join(f"new.{c}" for c in columns)
+    return f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {name} BEGIN
+            INSERT INTO {fts} (rowid, {cols}) VALUES (new.{pk}, {new});
+        END
+    """
+
+
+@contextmanager
+def deferred_index(conn: sqlite3.Connection, table: str):
+    """
+    For bulk inserts into a table of the main database: the index trigger
+    is dropped for the block, and the rows inserted meanwhile are indexed
+    with one statement at the end, several times faster than row by row.
+    Opens a transaction if none is open, so a failure rolls the trigger
+    back in; the caller commits.
+    """
+    if not has_fts_index(conn, table):
+        yield
+        return
+    name, pk, columns = FTS_TABLES[table.lower()]
+    fts  = f"{name}_fts"
+    cols = ", ".join(columns)
+
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    last_id = conn.execute(f"SELECT COALESCE(MAX({pk}), 0) FROM {name}").fetchone()[0]
+    conn.execute(f"DROP TRIGGER IF EXISTS {fts}_ai")
+    yield
+    conn.execute(f"INSERT INTO {fts} (rowid, {cols}) SELECT {pk}, {cols} FROM {name} WHERE {pk} > ?", (last_id,))
+    conn.execute(_insert_trigger(name, pk, columns))
+
+
+def ensure_fts_indexes(db_path: Path | str, tables: list[str]):
+    """
+    Create the search index of every table in `tables` that exists in the
+    database but has no index yet. If this SQLite build lacks FTS5 or the
+    trigram tokenizer, searches keep using the full table scan.
+    """
+    conn = get_connection(db_path)
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    missing = [
+        t for t in tables
+        if FTS_TABLES[t][0] in existing and fts_table_name(t) not in existing
+    ]
+    if not missing:
+        return
+
+    try:
+        with transaction(db_path) as conn:
+            for table in missing:
+                create_fts_index(conn, table)
+    except sqlite3.OperationalError as e:
+        print(lang.t("fts_db.error.fts_unavailable"), e)
+
+
+def match_expression(table: str, search_columns: list[str], term: str) -> str | None:
+    """
+    Build an FTS5 MATCH expression that finds rows sharing at least one
+    trigram with `term` in `search_columns`. Returns None if the index
+    can't serve the search (unknown table or column, term too short).
+    """
+    entry = FTS_TABLES.get(table.lower())
+    term  = term.strip().lower()
+    if not entry or len(term) < MIN_TERM_LENGTH:
+        return None
+    if any(col not in entry[2] for col in search_columns):
+        return None
+
+    trigrams = dict.fromkeys(term[i:i + 3] for i in range(len(term) - 2))
+    quoted   = " OR ".join('"' + t.replace('"', '""') + '"' for t in trigrams)
+    return f"{{{' '.join(search_columns)}}} : ({quoted})"
+
+
+def has_fts_index(conn: sqlite3.Connection, table: str) -> bool:
+    entry = FTS_TABLES.get(table.lower())
+    if not entry:
+        return False
+    cursor = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (fts_table_name(table),)
+    )
+    return cursor.fetchone() is not None
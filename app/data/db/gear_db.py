@@ -4,10 +4,17 @@ from datetime import date
 from datetime import datetime
 
 from app.core.gear_item import Gear
-from app.data.db.program_db import get_brand_by_id
 
 from app.config_manager import ConfigManager  # assuming you have this
 from app.lang import lang
+from app.core.utils import search_engine
+from app.data.db import cache
+from app.data.db.connection import get_connection, transaction, fetch_in
+from app.data.db import totals_db
+from app.data.db.gear_table import get_gear_table
+from app.data.db.joined_db import PROGRAM, get_joined_connection, joined_transaction
+from app.data.db.paging import KeysetPager
+from app.data.db.repository import GearRepository
 
 # Load config once
 config = ConfigManager()  # reads defaults + user config
@@ -22,93 +29,131 @@ DB_PATH = (BASE_DIR / user_db_rel).resolve()
 # Ensure parent folder exists
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+# Gear rows come back with their brand and category in one statement
+GEAR_SELECT = f"""
+    SELECT g.*,
+           b.id_brand    AS ref_brand_id,
+           b.name        AS brand_name,
+           b.description AS brand_description,
+           b.url         AS brand_url,
+           c.id_category AS ref_category_id,
+           c.category    AS category_name,
+           c.description AS category_description
+    FROM Gear g
+    LEFT JOIN {PROGRAM}.Brand    b ON b.id_brand    = g.brand_id
+    LEFT JOIN {PROGRAM}.Category c ON c.id_category = g.category_id
+"""
+
 
 def add_gear(gear: Gear) -> int:
     """Insert a new gear item and return its ID."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        INSERT INTO Gear (name, variant, brand_id, size, mass_pcs, price_cents, amount, color, category_id, description, prod_date, checked, lifespan, kit_only)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        gear.name,
-        gear.variant,
-        gear.brand_id,
-        gear.size,
-        gear.mass_pcs,
-        gear._price_cents,
-        gear.amount,
-        gear.color,
-        gear.category_id,
-        gear.description,
-        gear.prod_date.isoformat() if gear.prod_date else None,
-        gear.checked,
-        gear.lifespan,
-        gear.kit_only
-    ))
-
-    gear_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return gear_id
+    with transaction(DB_PATH) as conn:
+        cursor = conn.execute("""
+            INSERT INTO Gear (name, variant, brand_id, size, mass_pcs, price_cents, amount, color, category_id, description, prod_date, checked, lifespan, kit_only)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            gear.name,
+            gear.variant,
+            gear.brand_id,
+            gear.size,
+            gear.mass_pcs,
+            gear._price_cents,
+            gear.amount,
+            gear.color,
+            gear.category_id,
+            gear.description,
+            gear.prod_date.isoformat() if gear.prod_date else None,
+            gear.checked,
+            gear.lifespan,
+            gear.kit_only
+        ))
+
+    search_engine.refresh("Gear", cursor.lastrowid)
+    cache.bump("gear")
+    return cursor.lastrowid
 
 
 def update_gear(gear: Gear):
-    """Update all fields of an existing gear item."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("""
-        UPDATE Gear SET
-            name=?, variant=?, brand_id=?, size=?, mass_pcs=?, price_cents=?,
-            amount=?, color=?, category_id=?, description=?, prod_date=?,
-            checked=?, last_checked=?, lifespan=?, kit_only=?
-        WHERE id_gear=?
-    """, (
-        gear.name,
-        gear.variant,
-        gear.brand_id,
-        gear.size,
-        gear.mass_pcs,
-        gear._price_cents,
-        gear.amount,
-        gear.color,
-        gear.category_id,
-        gear.description,
-        gear.prod_date.isoformat() if gear.prod_date else None,
-        gear.checked,
-        gear.last_checked,
-        gear.lifespan,
-        gear.kit_only,
-        gear.id_gear,
-    ))
-    conn.commit()
-    conn.close()
+    """Update all fields of an existing gear item and the totals it is part of."""
+    with transaction(DB_PATH) as conn:
+        old = conn.execute("SELECT mass_pcs, price_cents FROM Gear WHERE id_gear = ?", (gear.id_gear,)).fetchone()
+        conn.execute("""
+            UPDATE Gear SET
+                name=?, variant=?, brand_id=?, size=?, mass_pcs=?, price_cents=?,
+                amount=?, color=?, category_id=?, description=?, prod_date=?,
+                checked=?, last_checked=?, lifespan=?, kit_only=?
+            WHERE id_gear=?
+        """, (
+            gear.name,
+            gear.variant,
+            gear.brand_id,
+            gear.size,
+            gear.mass_pcs,
+            gear._price_cents,
+            gear.amount,
+            gear.color,
+            gear.category_id,
+            gear.description,
+            gear.prod_date.isoformat() if gear.prod_date else None,
+            gear.checked,
+            gear.last_checked,
+            gear.lifespan,
+            gear.kit_only,
+            gear.id_gear,
+        ))
+        new = conn.execute("SELECT mass_pcs, price_cents FROM Gear WHERE id_gear = ?", (gear.id_gear,)).fetchone()
+        if old is not None:
+            totals_db.push_gear_delta(
+                conn,
+                gear.id_gear,
+                d_mass        = (new[0] or 0) - (old[0] or 0),
+                d_value_cents = (new[1] or 0) - (old[1] or 0),
+            )
+    search_engine.refresh("Gear", gear.id_gear)
+    cache.bump("gear")
+
+
 def delete_gear(gear_id: int):
-    """Delete a gear item and its comments."""
+    """Delete a gear item, its comments and every kit/trip reference to it."""
     from app.data.db.user_db import delete_comments_by_parent_id
     delete_comments_by_parent_id(gear_id)
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("DELETE FROM Gear WHERE id_gear = ?", (gear_id,))
-    conn.commit()
-    conn.close()
+    with joined_transaction() as conn:
+        kit_ids  = totals_db.kits_containing_gear(conn, [gear_id])
+        trip_ids = totals_db.trips_containing(conn, "gear", [gear_id])
+        conn.execute("DELETE FROM Kit_Gear WHERE gear_id = ?", (gear_id,))
+        conn.execute("DELETE FROM Trip_Items WHERE item_type = 'gear' AND item_id = ?", (gear_id,))
+        conn.execute("DELETE FROM Gear WHERE id_gear = ?", (gear_id,))
+        totals_db.refresh_after_gear(conn, [gear_id], kit_ids, trip_ids)
+    search_engine.remove("Gear", gear_id)
+    cache.bump("gear")
+
+
+def get_gear_rows_joined(where: str = "", params=(), order_by: str = "g.name, g.id_gear") -> list[sqlite3.Row]:
+    """
+    Gear rows with brand_name, category_name (and the other Brand / Category
+    columns, see GEAR_SELECT) joined from program_db in a single statement.
+    Gear columns in where / order_by need the `g.` prefix.
 
+    Use:
+        get_gear_rows_joined("WHERE g.checked = ?", (0,))
+    """
+    conn = get_joined_connection()
+    query = f"{GEAR_SELECT} {where}"
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    return conn.execute(query, params).fetchall()
 
-def get_all_gear() -> list[Gear]:
-    """Fetch all gear from the database, ordered by name."""
 
-    import sqlite3
-    from pathlib import Path
-    
-    # Update this to your actual DB_PATH
-    DB_PATH = Path("app/data/user_db.sqlite")
-    
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.execute("SELECT * FROM Gear ORDER BY name")
-    rows = cursor.fetchall()
-    conn.close()
+def _joined_rows_to_gear(rows) -> list[Gear]:
+    """Gear with brand and category already attached from joined rows."""
+    repo = GearRepository()
+    return [repo.resolve_joined(_row_to_gear(row), row) for row in rows]
+
 
-    return [_row_to_gear(row) for row in rows]
+@cache.cached("gear", "brand", "category")
+def get_all_gear() -> list[Gear]:
+    """Fetch all gear from the database, ordered by name."""
+    return _joined_rows_to_gear(get_gear_rows_joined())
 
 
 def get_gear_by_id(gear_id: int) -> Gear | None:
@@ -117,20 +162,54 @@ def get_gear_by_id(gear_id: int) -> Gear | None:
     and returns a Gear instance or None if not found.
     """
 
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM gear WHERE id_gear = ?", (gear_id,))
-        row = cursor.fetchone()
+    rows = get_gear_rows_joined("WHERE g.id_gear = ?", (gear_id,), order_by="")
+
+    if not rows:
+        return None
 
-        if row is None:
-            return None
+    return _joined_rows_to_gear(rows)[0]
 
-        brand = None
-        if row["brand_id"] is not None:
-            brand = get_brand_by_id(row["brand_id"])
 
-        return _row_to_gear(row) if row else None
+def get_gear_by_ids(gear_ids) -> dict[int, Gear]:
+    """
+    Fetch many gear items with one IN-list query.
+    Returns a dict mapping id_gear -> Gear; unknown IDs are simply missing.
+    """
+    if not gear_ids:
+        return {}
+    conn = get_joined_connection()
+    rows = fetch_in(conn, GEAR_SELECT + " WHERE g.id_gear IN ({ids})", gear_ids)
+    return {gear.id_gear: gear for gear in _joined_rows_to_gear(rows)}
+
+
+def gear_pager() -> KeysetPager:
+    """Page through all gear by name, loading one page of Gear at a time."""
+    return KeysetPager(DB_PATH, "Gear", "id_gear", lambda ids: get_gear_by_ids(ids).values())
+
+
+# get_gear_by_filter keyword -> condition on Gear (aliased g)
+GEAR_FILTERS = {
+    "checked":      "g.checked = ?",
+    "brand_id":     "g.brand_id = ?",
+    "category_id":  "g.category_id = ?",
+    "mass_above":   "g.mass_pcs > ?",
+    "amount_above": "g.amount > ?",
+}
+
+
+def gear_filter(**kwargs) -> tuple[str, list]:
+    """
+    WHERE clause (empty without filters) and its parameters for the filters
+    of get_gear_by_filter; unknown keywords and None values are ignored.
+    """
+    conditions = []
+    params = []
+    for key, value in kwargs.items():
+        if key in GEAR_FILTERS and value is not None:
+            conditions.append(GEAR_FILTERS[key])
+            params.append(value)
+    where = "WHERE " + " AND ".join(conditions) if conditions else ""
+    return where, params
 
 
 def get_gear_by_filter(**kwargs):
@@ -146,85 +225,28 @@ def get_gear_by_filter(**kwargs):
     Use:
         unchecked_heavy = get_gear_by_filter(checked=0, mass_above=500)
     """
+    where, params = gear_filter(**kwargs)
+    rows = get_gear_rows_joined(where, params, order_by="g.name")
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
-    conditions = []
-    params = []
-
-    # Map kwargs to SQL conditions
-    filter_mapping = {
-        "checked": ("checked = ?", lambda v: v),
-        "brand_id": ("brand_id = ?", lambda v: v),
-        "category_id": ("category_id = ?", lambda v: v),
-        "mass_above": ("mass_pcs > ?", lambda v: v),
-        "amount_above": ("amount > ?", lambda v: v),
-    }
-
-    for key, value in kwargs.items():
-        if key in filter_mapping and value is not None:
-            condition, transform = filter_mapping[key]
-            conditions.append(condition)
-            params.append(transform(value))
-
-    # Build query
-    query = "SELECT * FROM Gear"
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
-    query += " ORDER BY name"
-
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    conn.close()
-
-    return [_row_to_gear(row) for row in rows]
+    return _joined_rows_to_gear(rows)
 
 
 def get_overdue_inspection_gear():
-    """Get all gear not checked in over a year."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT
-            *,
-            COALESCE(julianday('now') - julianday(last_checked), 99999) as days_overdue
-        FROM Gear 
-        WHERE last_checked IS NULL 
-           OR julianday('now') - julianday(last_checked) > 365
-        ORDER BY days_overdue DESC
-    """)
-    
-    rows = cursor.fetchall()
-    conn.close()
-
-    return [_row_to_gear(row) for row in rows]
+    """Get all gear due for inspection (app.core.lifecycle), never checked and longest unchecked first."""
+    table = get_gear_table()
+    return _gear_in_order(table.ids(table.overdue_mask(), order_by="last_checked"))
 
 
 def get_end_of_life_gear():
-    """Get all gear past its lifespan (production date + lifespan years >= today)."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT
-            *,
-            julianday('now') - julianday(date(prod_date, '+' || lifespan || ' years')) as days_past_lifespan
-        FROM Gear 
-        WHERE lifespan IS NOT NULL 
-           AND lifespan > 0
-           AND date(prod_date, '+' || lifespan || ' years') <= date('now')
-        ORDER BY days_past_lifespan DESC
-    """)
-    
-    rows = cursor.fetchall()
-    conn.close()
+    """Get all gear past its lifespan (app.core.lifecycle), longest expired first."""
+    table = get_gear_table()
+    life = table.lifecycle()
+    return _gear_in_order(table.ids(life.expired, order_by=life.expires))
+
 
-    return [_row_to_gear(row) for row in rows]
+def _gear_in_order(gear_ids: list[int]) -> list[Gear]:
+    by_id = get_gear_by_ids(gear_ids)
+    return [by_id[gear_id] for gear_id in gear_ids if gear_id in by_id]
 
 
 def _convert_prod_date(date_str: str):
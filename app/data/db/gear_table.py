@@ -0,0 +1,141 @@
+"""
+Column-oriented view of the whole gear inventory for reports.
+
+GearTable holds one array.array per column, loaded with a single query and
+no Gear objects. Filters return a bytearray mask (1 = row matches) and the
+aggregates take an optional mask, so a report is a few passes over flat
+arrays; hydrate only the rows you show with get_gear_by_ids(table.ids(mask)).
+
+Dates are proleptic Gregorian ordinals (date.toordinal()), 0 where the
+value is missing; missing numbers are 0 as well. mass_pcs and amount are
+doubles, since the CLI accepts decimal input for them. Expiry and
+inspection follow app.core.lifecycle, evaluated over the columns in one
+pass.
+
+Use:
+    table = get_gear_table()
+    mask = table.overdue_mask()
+    table.count(mask), table.mass_by_category(mask)
+"""
+
+from array import array
+from datetime import date
+from itertools import compress
+from operator import mul
+from pathlib import Path
+
+from app.config_manager import ConfigManager
+from app.core.lifecycle import Lifecycle, evaluate
+from app.data.db import cache
+from app.data.db.connection import get_connection
+
+config = ConfigManager()
+BASE_DIR = Path(__file__).resolve().parents[3]
+DB_PATH = (BASE_DIR / config.get("paths.user_db", "app/data/user_db.sqlite")).resolve()
+
+# julianday() - 1721424.5 is the ordinal of a date; invalid dates become 0
+_ORDINAL = "COALESCE(CAST(julianday({col}) - 1721424.5 AS INTEGER), 0)"
+
+_COLUMNS_QUERY = f"""
+    SELECT id_gear,
+           CAST(COALESCE(mass_pcs, 0) AS REAL),
+           CAST(COALESCE(price_cents, 0) AS INTEGER),
+           CAST(COALESCE(amount, 0) AS REAL),
+           {_ORDINAL.format(col="prod_date")},
+           CAST(COALESCE(lifespan, 0) AS INTEGER),
+           {_ORDINAL.format(col="last_checked")},
+           -- older rows may hold a category name instead of an ID
+           CASE WHEN typeof(category_id) = 'integer' THEN category_id ELSE 0 END
+    FROM Gear
+    ORDER BY id_gear
+"""
+
+
+class GearTable:
+    """Gear columns as arrays; row i of every column is the same item."""
+
+    # name -> array typecode, in query order
+    COLUMNS = {
+        "id_gear":      "q",
+        "mass_pcs":     "d",
+        "price_cents":  "q",
+        "amount":       "d",
+        "prod_date":    "q",
+        "lifespan":     "q",
+        "last_checked": "q",
+        "category_id":  "q",
+    }
+
+    def __init__(self, rows: list[tuple]):
+        columns = list(zip(*rows)) or [()] * len(self.COLUMNS)
+        for (name, typecode), values in zip(self.COLUMNS.items(), columns):
+            setattr(self, name, array(typecode, values))
+
+    def __len__(self) -> int:
+        return len(self.id_gear)
+
+    def __sizeof__(self) -> int:
+        # Lets the read cache account for the arrays
+        return object.__sizeof__(self) + sum(getattr(self, name).__sizeof__() for name in self.COLUMNS)
+
+    # -----------------------------
+    # Filters (bytearray masks)
+    # -----------------------------
+    def lifecycle(self, today: date | None = None) -> Lifecycle:
+        """Expiry dates, days until expiry / since check and both masks for every row."""
+        return evaluate(self.prod_date, self.lifespan, self.last_checked, today)
+
+    def expired_mask(self, today: date | None = None) -> bytearray:
+        return self.lifecycle(today).expired
+
+    def overdue_mask(self, today: date | None = None) -> bytearray:
+        """Gear due for inspection."""
+        return self.lifecycle(today).inspection_due
+
+    def category_mask(self, category_id: int) -> bytearray:
+        return bytearray(cat == category_id for cat in self.category_id)
+
+    # -----------------------------
+    # Aggregates
+    # -----------------------------
+    def ids(self, mask: bytearray | None = None, order_by: str | array | None = None) -> list[int]:
+        """
+        IDs of the rows in mask (all rows if None), by id or ascending by
+        order_by: a column name or a per-row array (e.g. Lifecycle.expires).
+        """
+        rows = range(len(self)) if mask is None else compress(range(len(self)), mask)
+        if order_by is not None:
+            column = getattr(self, order_by) if isinstance(order_by, str) else order_by
+            rows = sorted(rows, key=column.__getitem__)
+        return [self.id_gear[i] for i in rows]
+
+    def count(self, mask: bytearray | None = None) -> int:
+        return len(self) if mask is None else sum(mask)
+
+    def total_mass(self, mask: bytearray | None = None) -> float:
+        """Sum of mass_pcs x amount."""
+        return sum(self._products(self.mass_pcs, mask))
+
+    def total_value_cents(self, mask: bytearray | None = None) -> int:
+        """Sum of price_cents x amount."""
+        return round(sum(self._products(self.price_cents, mask)))
+
+    def mass_by_category(self, mask: bytearray | None = None) -> dict[int | None, float]:
+        """{category_id: total mass}; gear without a category is under None."""
+        totals: dict[int | None, float] = {}
+        categories = self.category_id if mask is None else compress(self.category_id, mask)
+        for category_id, mass in zip(categories, self._products(self.mass_pcs, mask)):
+            key = category_id or None
+            totals[key] = totals.get(key, 0) + mass
+        return totals
+
+    def _products(self, column: array, mask: bytearray | None):
+        if mask is not None:
+            return map(mul, compress(column, mask), compress(self.amount, mask))
+        return map(mul, column, self.amount)
+
+
+@cache.cached("gear")
+def get_gear_table() -> GearTable:
+    """Load the columns of all gear with one query (cached until gear is written)."""
+    return GearTable(get_connection(DB_PATH).execute(_COLUMNS_QUERY).fetchall())
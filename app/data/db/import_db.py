@@ -0,0 +1,392 @@
+"""
+Bulk import of gear (with its brands and categories) from CSV or JSON Lines.
+
+Files are read a chunk of rows at a time and turned into columns: each
+column is validated with the validators of app.core.utils.validation (every
+distinct value once) and the valid rows are inserted with executemany. The
+whole file is imported in one transaction; an error anywhere rolls back
+everything. (user_db and the ATTACHed program_db each commit atomically,
+but SQLite does not guarantee an atomic commit across attached databases
+in WAL mode: a crash during the commit itself can keep new brands or
+categories without the gear that uses them.) The search index of Gear is
+filled once at the end instead of by its trigger for every row. Brand and
+category names are resolved to IDs (case-insensitively); names that don't
+exist yet are created in program_db in the same transaction.
+
+Invalid rows are skipped and reported; they don't abort the import.
+Imported gear is in no kit or trip yet, so Kit_Totals / Trip_Totals are
+unaffected.
+
+Columns (CSV header or JSON keys), only name is required:
+    name, variant, brand, size, mass_pcs, price, amount, color, category,
+    description, prod_date (DD.MM.YYYY, YYYY-MM-DD or an ISO timestamp),
+    checked, last_checked (default: today, as in add_gear), lifespan,
+    kit_only
+
+Unlike the CLI, 0 is a valid mass_pcs or price (weightless or free gear,
+as an export of such gear holds), so a file written by export_db imports
+again.
+"""
+
+import csv
+import json
+from datetime import datetime
+from itertools import compress, islice
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from app.core.brand import Brand
+from app.core.category_item import Category
+from app.core.utils import search_engine
+from app.core.utils.validation import is_positive_integer, is_positive_integer_or_empty, is_valid_date, is_yes_no
+from app.data.db import cache
+from app.data.db.fts_db import deferred_index
+from app.data.db import joined_db
+from app.data.db.joined_db import PROGRAM, joined_transaction
+
+CHUNK_SIZE = 5_000
+MAX_ERRORS = 100  # errors kept for the report; all are counted
+
+_INSERT_GEAR = """
+    INSERT INTO Gear (name, variant, brand_id, size, mass_pcs, price_cents, amount, color, category_id,
+                      description, prod_date, checked, last_checked, lifespan, kit_only)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_DATE), ?, ?)
+"""
+
+
+###############################################################################
+#               Reading
+###############################################################################
+
+def read_rows(path: Path | str) -> Iterator[dict]:
+    """Stream the rows of a .csv file or a JSON Lines file (.jsonl / .ndjson / .json) as dicts."""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.DictReader(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+# A chunk as columns: ({column: [stripped text per row]}, number of rows)
+Columns = tuple[dict[str, list[str]], int]
+
+
+def _csv_columns(path: Path, chunk_size: int) -> Iterator[Columns]:
+    """CSV chunks transposed to columns in C (zip), without a dict per row."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [name.strip() for name in next(reader, [])]
+        width = len(header)
+        while chunk := list(islice(reader, chunk_size)):
+            if set(map(len, chunk)) != {width}:
+                # Blank lines are skipped and short / long rows fitted, as csv.DictReader does
+                chunk = [(row + [""] * width)[:width] for row in chunk if row]
+                if not chunk:
+                    continue
+            columns = (list(map(str.strip, column)) for column in zip(*chunk))
+            yield dict(zip(header, columns)), len(chunk)
+
+
+def _jsonl_columns(path: Path, chunk_size: int) -> Iterator[Columns]:
+    """JSON Lines chunks, each decoded with one json.loads."""
+    start = 1
+    with open(path, encoding="utf-8") as f:
+        while lines := list(islice(f, chunk_size)):
+            numbers = range(start, start + len(lines))
+            start += len(lines)
+            if any(map(str.isspace, lines)):
+                numbers = [number for number, line in zip(numbers, lines) if not line.isspace()]
+                lines = [line for line in lines if not line.isspace()]
+            if lines:
+                rows = _json_rows(lines, numbers)
+                yield _dict_columns(rows, numbers), len(rows)
+
+
+def _json_rows(lines: list[str], numbers) -> list:
+    try:
+        return json.loads(f"[{','.join(lines)}]")
+    except json.JSONDecodeError:
+        # Decode line by line to name the broken one
+        for number, line in zip(numbers, lines):
+            try:
+                json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {number}: {e}") from None
+        raise
+
+
+def _dict_columns(rows: list[dict], numbers) -> dict[str, list[str]]:
+    """Rows as columns; ValueError naming the line (numbers) of a row that isn't an object."""
+    if set(map(type, rows)) != {dict}:
+        for number, row in zip(numbers, rows):
+            if not isinstance(row, dict):
+                raise ValueError(f"Line {number}: expected a JSON object, not {row!r:.60}")
+    try:
+        # Rows with every column (e.g. written by export_db) are transposed in C
+        transposed = zip(*map(_GET_COLUMNS, rows))
+    except KeyError:
+        transposed = ([row.get(name) for row in rows] for name in _INSERT_COLUMNS)
+    columns = {}
+    for name, values in zip(_INSERT_COLUMNS, transposed):
+        if set(map(type, values)) == {str}:
+            columns[name] = list(map(str.strip, values))
+        else:  # numbers, booleans or missing values
+            columns[name] = [_text(value) for value in values]
+    return columns
+
+
+###############################################################################
+#               Validation
+###############################################################################
+
+def _text(value) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def _check(result):
+    if result is None:
+        raise ValueError
+    return result
+
+
+def _required(validator: Callable):
+    return lambda value: _check(validator(value))
+
+
+def _optional(validator: Callable, default=None):
+    """Validator for a column that may be empty (-> default)."""
+    def check(value: str):
+        if not value:
+            return default
+        return _check(validator(value))
+    return check
+
+
+def _iso_date(value: str) -> str:
+    """DD.MM.YYYY (as entered in the CLI), an ISO date or timestamp, stored as ISO date."""
+    parsed = is_valid_date(value) or datetime.fromisoformat(value).date()
+    return parsed.isoformat()
+
+
+def _non_negative(value: str) -> float:
+    number = float(value)
+    if not number >= 0:  # also NaN
+        raise ValueError
+    return number
+
+
+def _price_cents(value: str) -> int:
+    return round(_non_negative(value.replace(",", ".")) * 100)
+
+
+# Validated columns -> converter of the stripped text; raises ValueError /
+# TypeError if invalid. The other columns are stored as stripped text;
+# name only has to be non-empty (is_nonempty_string of stripped text).
+_REQUIRED_TEXT = ("name",)
+_CONVERTERS = {
+    "mass_pcs":     _optional(_non_negative),
+    "price":        _optional(_price_cents),
+    "amount":       _optional(is_positive_integer, 1),
+    "prod_date":    _optional(_iso_date),
+    "checked":      _optional(is_yes_no, False),
+    "last_checked": _optional(_iso_date),
+    "lifespan":     _required(is_positive_integer_or_empty),
+    "kit_only":     _optional(is_yes_no, False),
+}
+
+# Parameters of _INSERT_GEAR; brand and category are resolved to IDs
+_INSERT_COLUMNS = ("name", "variant", "brand", "size", "mass_pcs", "price", "amount", "color", "category",
+                   "description", "prod_date", "checked", "last_checked", "lifespan", "kit_only")
+
+_BRAND, _CATEGORY = _INSERT_COLUMNS.index("brand"), _INSERT_COLUMNS.index("category")
+_GET_COLUMNS = itemgetter(*_INSERT_COLUMNS)
+
+_INVALID = object()
+
+
+class _Memo(dict):
+    """{text: converted value}, converting (and remembering) unknown texts on lookup."""
+
+    LIMIT = 20_000
+
+    def __init__(self, convert: Callable):
+        super().__init__()
+        self.convert = convert
+
+    def __missing__(self, text: str):
+        try:
+            result = self.convert(text)
+        except (ValueError, TypeError, AttributeError):
+            result = _INVALID
+        if len(self) < self.LIMIT:
+            self[text] = result
+        return result
+
+
+class _Column:
+    """
+    Converts one column of a chunk at a time. The same values (dates,
+    yes/no, amounts) repeat across an import, so each distinct value is
+    validated once and looked up afterwards (up to _Memo.LIMIT per column).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.required = name in _REQUIRED_TEXT
+        convert = _CONVERTERS.get(name)
+        self.memo = _Memo(convert) if convert else None
+
+    def values(self, texts: list[str]) -> list:
+        """Converted values; _INVALID where a value doesn't validate."""
+        if self.memo is not None:
+            return list(map(self.memo.__getitem__, texts))
+        if self.required and "" in texts:
+            return [text or _INVALID for text in texts]
+        return texts
+
+    @property
+    def validated(self) -> bool:
+        return self.memo is not None or self.required
+
+
+###############################################################################
+#               Names -> IDs
+###############################################################################
+
+class _NameResolver:
+    """{lower-case name: id} of one program_db table; creates missing names."""
+
+    def __init__(self, conn, table: str, id_col: str, name_col: str, insert: str):
+        self.conn = conn
+        self.insert = insert
+        self.created_ids = []
+        self.ids = {"": None}  # no name, no reference
+        for row_id, name in conn.execute(f"SELECT {id_col}, {name_col} FROM {PROGRAM}.{table} ORDER BY {id_col} DESC"):
+            if name:
+                self.ids[name.strip().lower()] = row_id  # lowest ID wins on duplicates
+
+    def resolve(self, names: list[str]) -> list[int | None]:
+        keys = list(map(str.lower, names))
+        missing = set(keys).difference(self.ids)
+        if missing:
+            # Created in file order, under the spelling of their first row
+            for name, key in zip(names, keys):
+                if key in missing:
+                    missing.discard(key)
+                    self.ids[key] = self.conn.execute(self.insert, (name,)).lastrowid
+                    self.created_ids.append(self.ids[key])
+        return list(map(self.ids.__getitem__, keys))
+
+    @property
+    def created(self) -> int:
+        return len(self.created_ids)
+
+
+###############################################################################
+#               Import
+###############################################################################
+
+def import_gear(
+    rows: Iterable[dict],
+    progress: Callable[[int, int], None] | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> dict:
+    """
+    Validate and insert gear rows (see read_rows) in one transaction.
+    progress(imported, skipped) is called after every chunk.
+
+    Returns {"imported", "skipped", "brands_created", "categories_created",
+    "errors": [(row number, column, value), ...]} (at most MAX_ERRORS errors;
+    a row is reported for its first invalid column).
+    """
+    return _import(_row_columns(iter(rows), chunk_size), progress)
+
+
+def _row_columns(rows: Iterator[dict], chunk_size: int) -> Iterator[Columns]:
+    start = 1
+    while chunk := list(islice(rows, chunk_size)):
+        yield _dict_columns(chunk, range(start, start + len(chunk))), len(chunk)
+        start += len(chunk)
+
+
+def import_gear_file(path: Path | str, progress: Callable[[int, int], None] | None = None,
+                     chunk_size: int = CHUNK_SIZE) -> dict:
+    """import_gear() of a CSV or JSON Lines file (see read_rows), read as columns."""
+    path = Path(path)
+    read = _csv_columns if path.suffix.lower() == ".csv" else _jsonl_columns
+    return _import(read(path, chunk_size), progress)
+
+
+def _import(chunks: Iterable[Columns], progress) -> dict:
+    imported = skipped = 0
+    errors = []
+    columns = [_Column(name) for name in _INSERT_COLUMNS]
+
+    with joined_transaction() as conn:
+        brand_id = _NameResolver(conn, "Brand", "id_brand", "name",
+                                 f"INSERT INTO {PROGRAM}.Brand (name, description, url) VALUES (?, '', '')")
+        category_id = _NameResolver(conn, "Category", "id_category", "category",
+                                    f"INSERT INTO {PROGRAM}.Category (category, description) VALUES (?, '')")
+        last_id = conn.execute("SELECT COALESCE(MAX(id_gear), 0) FROM Gear").fetchone()[0]
+        number = 0
+
+        with deferred_index(conn, "gear"):
+            for texts, count in chunks:
+                values = _convert_chunk(texts, count, columns, brand_id, category_id, number, errors)
+                conn.executemany(_INSERT_GEAR, values)
+                number += count
+                imported += len(values)
+                skipped += count - len(values)
+                if progress:
+                    progress(imported, skipped)
+        gear_ids = [row[0] for row in conn.execute("SELECT id_gear FROM Gear WHERE id_gear > ?", (last_id,))]
+
+    if imported or brand_id.created or category_id.created:
+        Brand.clear_cache()
+        Category.clear_cache()
+        cache.bump("gear", "brand", "category")
+        search_engine.refresh_many("Gear", gear_ids)
+        search_engine.refresh_many("Brand", brand_id.created_ids, joined_db.PROGRAM_DB_PATH)
+        search_engine.refresh_many("Category", category_id.created_ids, joined_db.PROGRAM_DB_PATH)
+
+    return {
+        "imported":           imported,
+        "skipped":            skipped,
+        "brands_created":     brand_id.created,
+        "categories_created": category_id.created,
+        "errors":             errors,
+    }
+
+
+def _convert_chunk(texts: dict[str, list[str]], count: int, columns: list[_Column], brand_id: _NameResolver,
+                   category_id: _NameResolver, offset: int, errors: list) -> list[tuple]:
+    """
+    The valid rows of a chunk ({column: texts} of count rows) as parameters
+    of _INSERT_GEAR, converted a column at a time. Invalid rows are added to
+    errors (up to MAX_ERRORS) as (row number, column, value); offset is the
+    number of earlier rows.
+    """
+    empty = [""] * count
+    texts = [texts.get(column.name, empty) for column in columns]
+    values = [column.values(column_texts) for column, column_texts in zip(columns, texts)]
+
+    invalid = {}
+    for column, column_texts, column_values in zip(columns, texts, values):
+        if column.validated and _INVALID in column_values:
+            for i, value in enumerate(column_values):
+                if value is _INVALID and i not in invalid:
+                    invalid[i] = (offset + i + 1, column.name, column_texts[i])
+    if invalid:
+        errors.extend(sorted(invalid.values())[:MAX_ERRORS - len(errors)])
+        keep = [i not in invalid for i in range(count)]
+        values = [list(compress(column_values, keep)) for column_values in values]
+
+    # Names are only resolved (and created) for valid rows
+    values[_BRAND] = brand_id.resolve(values[_BRAND])
+    values[_CATEGORY] = category_id.resolve(values[_CATEGORY])
+    return list(zip(*values))
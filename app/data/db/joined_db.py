@@ -0,0 +1,29 @@
+"""
+user_db connections with program_db ATTACHed, for statements that join
+tables of both files (gear with its brand, trips with their consumables).
+"""
+
+from pathlib import Path
+
+from app.config_manager import ConfigManager
+from app.data.db.connection import get_connection, transaction
+
+config = ConfigManager()
+BASE_DIR = Path(__file__).resolve().parents[3]
+user_db_rel = config.get("paths.user_db", "app/data/user_db.sqlite")
+DB_PATH = (BASE_DIR / user_db_rel).resolve()
+program_db_rel = config.get("paths.program_db", "app/data/program_db.sqlite")
+PROGRAM_DB_PATH = (BASE_DIR / program_db_rel).resolve()
+
+# program_db tables are addressed as program.<Table>
+PROGRAM = "program"
+
+
+def get_joined_connection():
+    """user_db connection with program_db attached as `program`."""
+    return get_connection(DB_PATH, attach={PROGRAM: PROGRAM_DB_PATH})
+
+
+def joined_transaction():
+    """transaction() on the user_db connection with program_db attached."""
+    return transaction(DB_PATH, attach={PROGRAM: PROGRAM_DB_PATH})
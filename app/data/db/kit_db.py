@@ -1,10 +1,16 @@
 import json
-import sqlite3
 from pathlib import Path
 
 from app.config_manager import ConfigManager
-from app.core.kit_item import Kit
-from app.data.db.gear_db import get_gear_by_id
+from app.core.kit_item import Kit, LazyKit
+from app.core.utils import search_engine
+from app.data.db import cache
+from app.data.db.paging import KeysetPager
+from app.data.db.connection import get_connection, transaction, fetch_in
+from app.data.db import totals_db
+from app.data.db.gear_db import get_gear_by_ids
+from app.data.db.joined_db import joined_transaction
+from app.data.db.totals_db import get_kit_totals
 
 config = ConfigManager()
 
@@ -15,63 +21,107 @@ DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 
 def add_kit(kit: Kit) -> int:
-    """Insert a new kit and return its ID."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO Kit (name, description, comments, gear_list, mass_correction, gear_amount)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (
-        kit.name,
-        kit.description,
-        json.dumps(kit.comments),
-        json.dumps([g.id_gear for g in kit.gear_list]),
-        kit.mass_correction,
-        json.dumps(kit.gear_amount),
-    ))
-    kit_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    """Insert a new kit and its gear, and return its ID."""
+    with joined_transaction() as conn:
+        cursor = conn.execute("""
+            INSERT INTO Kit (name, description, comments, mass_correction)
+            VALUES (?, ?, ?, ?)
+        """, (
+            kit.name,
+            kit.description,
+            json.dumps(kit.comments),
+            kit.mass_correction,
+        ))
+        kit_id = cursor.lastrowid
+        _write_kit_gear(conn, kit_id, kit)
+        totals_db.recompute_kits(conn, [kit_id])
+    search_engine.refresh("Kit", kit_id)
+    cache.bump("kit")
     return kit_id
 
 def update_kit(kit: Kit):
-    """Update all fields of an existing kit."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("""
-        UPDATE Kit SET
-            name=?, description=?, comments=?, gear_list=?,
-            mass_correction=?, gear_amount=?
-        WHERE id_kit=?
-    """, (
-        kit.name,
-        kit.description,
-        json.dumps(kit.comments),
-        json.dumps([g.id_gear for g in kit.gear_list]),
-        kit.mass_correction,
-        json.dumps(kit.gear_amount),
-        kit.id_kit,
-    ))
-    conn.commit()
-    conn.close()
+    """Update all fields of an existing kit, replace its gear and refresh the totals."""
+    with joined_transaction() as conn:
+        conn.execute("""
+            UPDATE Kit SET
+                name=?, description=?, comments=?, mass_correction=?
+            WHERE id_kit=?
+        """, (
+            kit.name,
+            kit.description,
+            json.dumps(kit.comments),
+            kit.mass_correction,
+            kit.id_kit,
+        ))
+        conn.execute("DELETE FROM Kit_Gear WHERE kit_id = ?", (kit.id_kit,))
+        _write_kit_gear(conn, kit.id_kit, kit)
+        totals_db.push_kit_change(conn, kit.id_kit)
+    search_engine.refresh("Kit", kit.id_kit)
+    cache.bump("kit")
+
+
+def _write_kit_gear(conn, kit_id: int, kit: Kit):
+    """Insert one Kit_Gear row per gear item, in list order."""
+    conn.executemany(
+        "INSERT INTO Kit_Gear (kit_id, gear_id, amount) VALUES (?, ?, ?)",
+        [(kit_id, g.id_gear, amt) for g, amt in zip(kit.gear_list, kit.gear_amount)],
+    )
+
 
 def get_kit_by_id(kit_id: int) -> Kit | None:
     """Fetch a single kit by ID, returning a Kit instance with Gear objects."""
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM Kit WHERE id_kit = ?", (kit_id,))
-        row = cursor.fetchone()
-        if row is None:
-            return None
-
-    gear_ids = json.loads(row["gear_list"]  or "[]")
-    amounts  = json.loads(row["gear_amount"] or "[]")
-    comments = json.loads(row["comments"]   or "[]")
+    kits = get_kits_bulk([kit_id])
+    return kits[0] if kits else None
+
+
+def get_kits_bulk(ids: list[int] | None = None) -> list[Kit]:
+    """
+    Fetch many kits (all kits if ids is None) ordered by name.
+    The gear of every kit is hydrated from a single gear query,
+    so the cost does not grow with the number of kits.
+    """
+    conn = get_connection(DB_PATH)
+    if ids is None:
+        rows = conn.execute("SELECT * FROM Kit ORDER BY name").fetchall()
+    else:
+        rows = fetch_in(conn, "SELECT * FROM Kit WHERE id_kit IN ({ids}) ORDER BY name", ids)
+    if not rows:
+        return []
+
+    contents = _get_kit_contents(conn, [row["id_kit"] for row in rows])
+    gear_map = get_gear_by_ids(_kit_gear_ids(contents))
+    return [_row_to_kit(row, contents, gear_map) for row in rows]
+
+
+def _get_kit_contents(conn, kit_ids) -> dict[int, list[tuple[int, int]]]:
+    """Return {kit_id: [(gear_id, amount), ...]} in the order gear was added."""
+    contents = {kit_id: [] for kit_id in kit_ids}
+    rows = fetch_in(
+        conn,
+        "SELECT kit_id, gear_id, amount FROM Kit_Gear WHERE kit_id IN ({ids}) ORDER BY id",
+        kit_ids,
+    )
+    for row in rows:
+        contents[row["kit_id"]].append((row["gear_id"], row["amount"]))
+    return contents
+
+
+def _kit_gear_ids(contents: dict) -> set[int]:
+    """Collect every gear ID referenced by a batch of kit contents."""
+    return {gear_id for entries in contents.values() for gear_id, _ in entries}
+
+
+def _row_to_kit(row, contents: dict, gear_map: dict) -> Kit:
+    """
+    Build a Kit from a database row, its contents and gear_map (id -> Gear).
+    Gear that no longer exists is skipped together with its amount.
+    """
+    comments = json.loads(row["comments"] or "[]")
 
     gear_list    = []
     gear_amounts = []
-    for gear_id, amt in zip(gear_ids, amounts):
-        gear = get_gear_by_id(gear_id)
+    for gear_id, amt in contents.get(row["id_kit"], []):
+        gear = gear_map.get(gear_id)
         if gear:
             gear_list.append(gear)
             gear_amounts.append(amt)
@@ -87,22 +137,61 @@ def get_kit_by_id(kit_id: int) -> Kit | None:
     )
 
 
+@cache.cached("kit", "gear", "brand", "category")
 def get_all_kits() -> list[Kit]:
     """Fetch all kits ordered by name, returning Kit instances."""
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT id_kit FROM Kit ORDER BY name")
-        ids = [row["id_kit"] for row in cursor.fetchall()]
+    return get_kits_bulk()
+
+
+def _load_kit_gear(kit_id: int) -> tuple[list, list]:
+    """(gear_list, gear_amount) of one kit, for LazyKit."""
+    kit = get_kit_by_id(kit_id)
+    return (kit.gear_list, kit.gear_amount) if kit else ([], [])
+
+
+def get_kits_lazy(ids: list[int] | None = None) -> list[LazyKit]:
+    """
+    Fetch many kits (all kits if ids is None) ordered by name, without
+    their gear: item_count and total_mass come from get_kit_totals and the
+    gear is only loaded when kit.gear_list is accessed.
+    """
+    conn = get_connection(DB_PATH)
+    if ids is None:
+        rows = conn.execute("SELECT * FROM Kit ORDER BY name").fetchall()
+    else:
+        rows = fetch_in(conn, "SELECT * FROM Kit WHERE id_kit IN ({ids}) ORDER BY name", ids)
+    totals = get_kit_totals([row["id_kit"] for row in rows]) if rows else {}
+
+    return [
+        LazyKit(
+            id_kit          = row["id_kit"],
+            name            = row["name"],
+            loader          = lambda kit_id=row["id_kit"]: _load_kit_gear(kit_id),
+            description     = row["description"],
+            comments        = json.loads(row["comments"] or "[]"),
+            mass_correction = row["mass_correction"] or 0,
+            item_count      = totals[row["id_kit"]]["item_count"],
+            total_mass      = totals[row["id_kit"]]["total_mass"],
+        )
+        for row in rows
+    ]
+
 
-    return [kit for kit_id in ids if (kit := get_kit_by_id(kit_id))]
+def kit_pager() -> KeysetPager:
+    """Page through all kits by name; the kits of a page are LazyKits."""
+    return KeysetPager(DB_PATH, "Kit", "id_kit", get_kits_lazy)
 
 
 def delete_kit(kit_id: int):
-    """Delete a kit and its comments."""
+    """Delete a kit, its comments and every reference to it."""
     from app.data.db.user_db import delete_comments_by_parent_id
     delete_comments_by_parent_id(kit_id)
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("DELETE FROM Kit WHERE id_kit = ?", (kit_id,))
-    conn.commit()
-    conn.close()
+    with joined_transaction() as conn:
+        trip_ids = totals_db.trips_containing(conn, "kit", [kit_id])
+        conn.execute("DELETE FROM Kit_Gear WHERE kit_id = ?", (kit_id,))
+        conn.execute("DELETE FROM Trip_Items WHERE item_type = 'kit' AND item_id = ?", (kit_id,))
+        conn.execute("DELETE FROM Kit WHERE id_kit = ?", (kit_id,))
+        totals_db.forget_kit(conn, kit_id)
+        totals_db.recompute_trips(conn, trip_ids)
+    search_engine.remove("Kit", kit_id)
+    cache.bump("kit")
@@ -0,0 +1,126 @@
+from pathlib import Path
+from typing import Any, Callable
+
+from app.data.db import cache
+from app.data.db.connection import get_connection
+
+
+class ListPager:
+    """Page source over an already loaded list."""
+
+    def __init__(self, items: list[Any]):
+        self.items = items
+
+    def count(self) -> int:
+        return len(self.items)
+
+    def page(self, number: int, size: int) -> list[Any]:
+        return self.items[number * size:(number + 1) * size]
+
+
+class IdPager:
+    """
+    Page source over a precomputed list of IDs (e.g. from a GearTable mask);
+    only the visible page is hydrated, in the order of the list.
+    """
+
+    def __init__(self, ids: list[int], hydrate: Callable[[list[int]], dict[int, Any]]):
+        self.ids     = ids
+        self.hydrate = hydrate
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def page(self, number: int, size: int) -> list[Any]:
+        ids = self.ids[number * size:(number + 1) * size]
+        by_id = self.hydrate(ids) if ids else {}
+        return [by_id[row_id] for row_id in ids if row_id in by_id]
+
+
+class KeysetPager:
+    """
+    Page source over a table ordered by (name, id).
+
+    Every page is one indexed query that continues after the last
+    (name, id) of the previous page, so page 500 costs the same as page 1,
+    and only the rows of the visible page are hydrated. The total count is
+    only queried when first asked for. Count and page keys are kept in the
+    read cache until the table is written to.
+
+    hydrate(ids) must return the objects for a list of IDs, in any order;
+    they are put back into page order here.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str,
+        table: str,
+        id_col: str,
+        hydrate: Callable[[list[int]], list[Any]],
+        key: Callable[[Any], int] | None = None,
+        name_col: str = "name",
+    ):
+        self.db_path  = db_path
+        self.table    = table
+        self.id_col   = id_col
+        self.name_col = name_col
+        self.hydrate  = hydrate
+        self.key      = key or (lambda obj: getattr(obj, id_col))
+        # (name, id) after which page n starts; None = start of the table.
+        # Valid for one generation of the table (an edit from the list
+        # shifts the rows after it)
+        self._starts: list[tuple | None] = [None]
+        self._generation = cache.generation(table.lower())
+
+    def count(self) -> int:
+        return cache.memoize(
+            ("pager_count", str(self.db_path), self.table),
+            (self.table.lower(),),
+            lambda: get_connection(self.db_path).execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0],
+        )
+
+    def page(self, number: int, size: int) -> list[Any]:
+        generation = cache.generation(self.table.lower())
+        if generation != self._generation:
+            self._starts, self._generation = [None], generation
+
+        # Pages are usually visited one after the other; jumping ahead walks
+        # the keys of the pages in between without hydrating them
+        while len(self._starts) <= number:
+            keys = self._page_keys(self._starts[-1], size)
+            if len(keys) < size:
+                return []
+            self._starts.append(keys[-1])
+
+        keys = self._page_keys(self._starts[number], size)
+        if number + 1 == len(self._starts) and len(keys) == size:
+            self._starts.append(keys[-1])
+
+        ids = [row_id for _, row_id in keys]
+        by_id = {self.key(obj): obj for obj in self.hydrate(ids)} if ids else {}
+        return [by_id[row_id] for row_id in ids if row_id in by_id]
+
+    def _page_keys(self, after: tuple | None, size: int) -> list[tuple]:
+        """(name, id) of the `size` rows following `after`."""
+        return cache.memoize(
+            ("pager_keys", str(self.db_path), self.table, self.name_col, self.id_col, after, size),
+            (self.table.lower(),),
+            lambda: self._query_page_keys(after, size),
+        )
+
+    def _query_page_keys(self, after: tuple | None, size: int) -> list[tuple]:
+        name, row_id = self.name_col, self.id_col
+        if after is None:
+            where, params = "", ()
+        elif after[0] is None:
+            # NULL names sort first; finish those, then every named row
+            where, params = f"WHERE ({name} IS NULL AND {row_id} > ?) OR {name} IS NOT NULL", (after[1],)
+        else:
+            where, params = f"WHERE ({name}, {row_id}) > (?, ?)", after
+
+        conn = get_connection(self.db_path)
+        rows = conn.execute(
+            f"SELECT {name}, {row_id} FROM {self.table} {where} ORDER BY {name}, {row_id} LIMIT ?",
+            (*params, size),
+        ).fetchall()
+        return [(row[0], row[1]) for row in rows]
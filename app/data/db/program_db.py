@@ -1,9 +1,17 @@
-import sqlite3
+from __future__ import annotations
 from pathlib import Path
 
 from app.config_manager import ConfigManager  # assuming you have this
 from app.lang import lang
 from app.core.brand import Brand
+from app.core.category_item import Category
+from app.core.utils import search_engine
+from app.data.db import cache
+from app.data.db.connection import get_connection, transaction, fetch_in
+from app.data.db.paging import KeysetPager
+from app.data.db.reference_db import is_referenced
+from app.data.db import totals_db
+from app.data.db.joined_db import PROGRAM, joined_transaction
 
 # Load config once
 config = ConfigManager()  # reads defaults + user config
@@ -18,77 +26,64 @@ DB_PATH = (BASE_DIR / program_db_rel).resolve()
 # Ensure parent folder exists
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-USER_DB_PATH = (BASE_DIR / ConfigManager().get("paths.user_db", "app/data/user_db.sqlite")).resolve()
-
 
 ###############################################################################
 #               Category functions
 ###############################################################################
 
-def add_category(category: str, description: str = "", db_path: str = DB_PATH):
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO Category (category, description) VALUES (?, ?)", (category, description))
-    conn.commit()
-    conn.close()
+def add_category(category: str, description: str = "", db_path: str = DB_PATH) -> int:
+    with transaction(db_path) as conn:
+        cursor = conn.execute("INSERT INTO Category (category, description) VALUES (?, ?)", (category, description))
+    Category.clear_cache()
+    search_engine.refresh("Category", cursor.lastrowid, db_path)
+    cache.bump("category")
+    return cursor.lastrowid
 
 
 def update_category(category_id: int, new_name: str, new_description: str):
     """Update category name and description by ID."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        UPDATE category
-        SET category = ?, description = ?
-        WHERE id_category = ?
-    """, (new_name, new_description, category_id))
-    conn.commit()
-    conn.close()
-
-
+    with transaction(DB_PATH) as conn:
+        conn.execute("""
+            UPDATE category
+            SET category = ?, description = ?
+            WHERE id_category = ?
+        """, (new_name, new_description, category_id))
+    Category.clear_cache()
+    search_engine.refresh("Category", category_id)
+    cache.bump("category")
+
+
+@cache.cached("category")
 def get_all_categories():
     """Return a list of all categories."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id_category, category, description FROM category ORDER BY category")
-    results = cursor.fetchall()
-    conn.close()
-    return results
+    conn = get_connection(DB_PATH)
+    cursor = conn.execute("SELECT id_category, category, description FROM category ORDER BY category")
+    return cursor.fetchall()
+
+
+def get_categories_by_ids(category_ids) -> list[Category]:
+    """Return the Categories for a list of IDs in one query."""
+    conn = get_connection(DB_PATH)
+    rows = fetch_in(conn, "SELECT id_category, category, description FROM Category WHERE id_category IN ({ids})", category_ids)
+    return [Category(id_category=row[0], name=row[1], description=row[2]) for row in rows]
 
 
 def get_category_by_id(category_id: int) -> Category | None:
-    """Return a single category by ID."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id_category, category, description FROM category WHERE id_category = ?", (category_id,))
-    result = cursor.fetchone()
-    conn.close()
-    
-    if result is None:
-        return None
-    
-    from app.core.category_item import Category
-    return Category(
-        id_category=result[0],
-        name=result[1],
-        description=result[2]
-    )
+    """Return a single category by ID (served from the Category cache)."""
+    return Category.get_by_id(category_id)
 
 
 def delete_category(category_id: int) -> bool:
     """
     Delete a category. Returns False if any gear references it.
     """
-    user_conn = sqlite3.connect(USER_DB_PATH)
-    cursor = user_conn.execute("SELECT COUNT(*) FROM Gear WHERE category_id = ?", (category_id,))
-    count = cursor.fetchone()[0]
-    user_conn.close()
-    if count > 0:
+    if is_referenced("category", category_id):
         return False
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("DELETE FROM Category WHERE id_category = ?", (category_id,))
-    conn.commit()
-    conn.close()
+    with transaction(DB_PATH) as conn:
+        conn.execute("DELETE FROM Category WHERE id_category = ?", (category_id,))
+    Category.clear_cache()
+    search_engine.remove("Category", category_id)
+    cache.bump("category")
     return True
 
 
@@ -96,33 +91,33 @@ def delete_category(category_id: int) -> bool:
 #               Brand functions
 ###############################################################################
 
-def add_brand(name: str, description: str = "", url: str = "", db_path: str = DB_PATH):
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO Brand (name, description, url) VALUES (?, ?, ?)", (name, description, url))
-    conn.commit()
-    conn.close()
+def add_brand(name: str, description: str = "", url: str = "", db_path: str = DB_PATH) -> int:
+    with transaction(db_path) as conn:
+        cursor = conn.execute("INSERT INTO Brand (name, description, url) VALUES (?, ?, ?)", (name, description, url))
+    Brand.clear_cache()
+    search_engine.refresh("Brand", cursor.lastrowid, db_path)
+    cache.bump("brand")
+    return cursor.lastrowid
 
 
 def update_brand(brand_id: int, new_name: str, new_description: str, new_url: str):
     """Update brand name, description and URL by ID."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        UPDATE Brand
-        SET name = ?, description = ?, url = ?
-        WHERE id_brand = ?
-    """, (new_name, new_description, new_url, brand_id))
-    conn.commit()
-    conn.close()
-
-
+    with transaction(DB_PATH) as conn:
+        conn.execute("""
+            UPDATE Brand
+            SET name = ?, description = ?, url = ?
+            WHERE id_brand = ?
+        """, (new_name, new_description, new_url, brand_id))
+    Brand.clear_cache()
+    search_engine.refresh("Brand", brand_id)
+    cache.bump("brand")
+
+
+@cache.cached("brand")
 def get_all_brands():
     """ Return a list of all brands """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id_brand, name, description, url FROM brand ORDER BY name")
-   # results = cursor.fetchall()
+    conn = get_connection(DB_PATH)
+    cursor = conn.execute("SELECT id_brand, name, description, url FROM brand ORDER BY name")
 
     return [
         Brand(
@@ -133,15 +128,24 @@ def get_all_brands():
         )
         for results in cursor.fetchall()
     ]
-    conn.close()
+
+def get_brands_by_ids(brand_ids) -> list[Brand]:
+    """Return the Brands for a list of IDs in one query."""
+    conn = get_connection(DB_PATH)
+    rows = fetch_in(conn, "SELECT id_brand, name, description, url FROM Brand WHERE id_brand IN ({ids})", brand_ids)
+    return [Brand(id_brand=row[0], name=row[1], description=row[2], url=row[3]) for row in rows]
+
+
+def brand_pager() -> KeysetPager:
+    """Page through all brands by name."""
+    return KeysetPager(DB_PATH, "Brand", "id_brand", get_brands_by_ids)
+
 
 def get_brand_by_id(brand_id: int) -> Brand | None:
     """Return a single brand by ID."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id_brand, name, description, url FROM brand WHERE id_brand = ?", (brand_id,))
+    conn = get_connection(DB_PATH)
+    cursor = conn.execute("SELECT id_brand, name, description, url FROM brand WHERE id_brand = ?", (brand_id,))
     result = cursor.fetchone()
-    conn.close()
 
     if result is None:
         return None
@@ -157,16 +161,13 @@ def delete_brand(brand_id: int) -> bool:
     """
     Delete a brand. Returns False if any gear references it.
     """
-    user_conn = sqlite3.connect(USER_DB_PATH)
-    cursor = user_conn.execute("SELECT COUNT(*) FROM Gear WHERE brand_id = ?", (brand_id,))
-    count = cursor.fetchone()[0]
-    user_conn.close()
-    if count > 0:
+    if is_referenced("brand", brand_id):
         return False
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("DELETE FROM Brand WHERE id_brand = ?", (brand_id,))
-    conn.commit()
-    conn.close()
+    with transaction(DB_PATH) as conn:
+        conn.execute("DELETE FROM Brand WHERE id_brand = ?", (brand_id,))
+    Brand.clear_cache()
+    search_engine.remove("Brand", brand_id)
+    cache.bump("brand")
     return True
 
 
@@ -174,62 +175,68 @@ def delete_brand(brand_id: int) -> bool:
 #               Consumables functions
 ###############################################################################
 
-def add_consumable(name: str, description: str = "", weight: int = 0, db_path: str = DB_PATH):
-    """Add new consumable to database."""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO Consumable (name, description, weight) VALUES (?, ?, ?)", (name, description, weight))
-    conn.commit()
-    conn.close()
+def add_consumable(name: str, description: str = "", weight: int = 0, db_path: str = DB_PATH) -> int:
+    """Add new consumable to database and return its ID."""
+    with transaction(db_path) as conn:
+        cursor = conn.execute("INSERT INTO Consumable (name, description, weight) VALUES (?, ?, ?)", (name, description, weight))
+    search_engine.refresh("Consumable", cursor.lastrowid, db_path)
+    cache.bump("consumable")
+    return cursor.lastrowid
 
 
 def update_consumable(consumable_id: int, new_name: str, new_description: str, new_weight: str):
     """Update consumable name, description and weightL by ID."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        UPDATE Consumable
-        SET name = ?, description = ?, weight = ?
-        WHERE id_consumable = ?
-    """, (new_name, new_description, new_weight, consumable_id))
-    conn.commit()
-    conn.close()
-
-
+    # Trip totals live in user_db: update through the joined connection so
+    # the consumable and its totals are written in one transaction
+    with joined_transaction() as conn:
+        old = conn.execute(f"SELECT weight FROM {PROGRAM}.Consumable WHERE id_consumable = ?", (consumable_id,)).fetchone()
+        conn.execute(f"""
+            UPDATE {PROGRAM}.Consumable
+            SET name = ?, description = ?, weight = ?
+            WHERE id_consumable = ?
+        """, (new_name, new_description, new_weight, consumable_id))
+        new = conn.execute(f"SELECT weight FROM {PROGRAM}.Consumable WHERE id_consumable = ?", (consumable_id,)).fetchone()
+        if old is not None:
+            totals_db.push_consumable_delta(conn, consumable_id, (new[0] or 0) - (old[0] or 0))
+    search_engine.refresh("Consumable", consumable_id)
+    cache.bump("consumable")
+
+
+@cache.cached("consumable")
 def get_all_consumables():
     """ Return a list of all consumables"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id_consumable, name, description, weight FROM Consumable ORDER BY name")
-    results = cursor.fetchall()
-    conn.close()
-    return results
+    conn = get_connection(DB_PATH)
+    cursor = conn.execute("SELECT id_consumable, name, description, weight FROM Consumable ORDER BY name")
+    return cursor.fetchall()
 
 
 def get_consumable_by_id(consumable_id: int):
     """Return a single consumable by ID."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id_consumable, name, description, weight FROM Consumable WHERE id_consumable = ?", (consumable_id,))
-    result = cursor.fetchone()
-    conn.close()
-    return result
+    conn = get_connection(DB_PATH)
+    cursor = conn.execute("SELECT id_consumable, name, description, weight FROM Consumable WHERE id_consumable = ?", (consumable_id,))
+    return cursor.fetchone()
+
+
+def get_consumables_by_ids(consumable_ids) -> dict:
+    """Return {id_consumable: row} for many consumables with one IN-list query."""
+    if not consumable_ids:
+        return {}
+    conn = get_connection(DB_PATH)
+    rows = fetch_in(
+        conn,
+        "SELECT id_consumable, name, description, weight FROM Consumable WHERE id_consumable IN ({ids})",
+        consumable_ids,
+    )
+    return {row[0]: row for row in rows}
 
 def delete_consumable(consumable_id: int) -> bool:
     """
     Delete a consumable. Returns False if any trip references it.
     """
-    user_conn = sqlite3.connect(USER_DB_PATH)
-    cursor = user_conn.execute("SELECT consumables FROM Trip")
-    rows = cursor.fetchall()
-    user_conn.close()
-    import json
-    for row in rows:
-        ids = json.loads(row[0] or "[]")
-        if consumable_id in ids:
-            return False
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("DELETE FROM Consumable WHERE id_consumable = ?", (consumable_id,))
-    conn.commit()
-    conn.close()
+    if is_referenced("consumable", consumable_id):
+        return False
+    with transaction(DB_PATH) as conn:
+        conn.execute("DELETE FROM Consumable WHERE id_consumable = ?", (consumable_id,))
+    search_engine.remove("Consumable", consumable_id)
+    cache.bump("consumable")
     return True
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+from app.config_manager import ConfigManager
+from app.data.db.connection import get_connection
+
+config = ConfigManager()
+BASE_DIR = Path(__file__).resolve().parents[3]
+user_db_rel = config.get("paths.user_db", "app/data/user_db.sqlite")
+DB_PATH = (BASE_DIR / user_db_rel).resolve()
+
+
+# entity -> [(referencing kind, query returning the referencing IDs)]
+# Every lookup is served by an index created in the user DB migrations.
+REFERENCES = {
+    "gear": [
+        ("kits",  "SELECT DISTINCT kit_id  FROM Kit_Gear   WHERE gear_id = ?"),
+        ("trips", "SELECT DISTINCT trip_id FROM Trip_Items WHERE item_type = 'gear' AND item_id = ?"),
+    ],
+    "kit": [
+        ("trips", "SELECT DISTINCT trip_id FROM Trip_Items WHERE item_type = 'kit' AND item_id = ?"),
+    ],
+    "brand": [
+        ("gear",  "SELECT id_gear FROM Gear WHERE brand_id = ?"),
+    ],
+    "category": [
+        ("gear",  "SELECT id_gear FROM Gear WHERE category_id = ?"),
+    ],
+    "consumable": [
+        ("trips", "SELECT DISTINCT trip_id FROM Trip_Consumables WHERE consumable_id = ?"),
+    ],
+}
+
+
+def where_used(entity: str, entity_id: int) -> dict[str, list[int]]:
+    """
+    Return the IDs of everything that references an entity, grouped by kind.
+
+    Use:
+        where_used("gear", 42)   ->  {"kits": [3, 7], "trips": [12]}
+        where_used("brand", 5)   ->  {"gear": []}
+    """
+    if entity not in REFERENCES:
+        raise ValueError(f"Unknown entity '{entity}', expected one of {list(REFERENCES)}")
+
+    conn = get_connection(DB_PATH)
+    return {
+        kind: [row[0] for row in conn.execute(query, (entity_id,))]
+        for kind, query in REFERENCES[entity]
+    }
+
+
+def is_referenced(entity: str, entity_id: int) -> bool:
+    """True if anything still references the entity."""
+    return any(where_used(entity, entity_id).values())
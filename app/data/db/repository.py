@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from app.core.brand import Brand
+from app.core.category_item import Category
+from app.core.gear_item import Gear
+from app.data.db.program_db import get_brands_by_ids, get_categories_by_ids
+
+
+class GearRepository:
+    """
+    Resolves the Brand and Category of many Gear items at once.
+
+    Brands and categories are kept in identity maps ({id: object}), so
+    every ID is fetched at most once per repository, and all gear of the
+    same brand share one Brand instance. Resolving any batch of gear
+    costs at most one Brand and one Category query.
+
+    Use:
+        repo = GearRepository()
+        repo.resolve(gear_list)      # gear.brand / gear.category won't query
+    """
+
+    def __init__(self):
+        self.brands: dict[int, Brand | None] = {}
+        self.categories: dict[int, Category | None] = {}
+
+    def resolve(self, gears: Iterable[Gear]) -> list[Gear]:
+        """Attach Brand and Category objects to every gear; returns the gear."""
+        gears = list(gears)
+        self._load_brands({g.brand_id for g in gears if g.brand_id is not None})
+        self._load_categories({g.category_id for g in gears if g.category_id is not None})
+
+        for gear in gears:
+            if gear.brand_id is not None:
+                gear._brand = self.brands.get(gear.brand_id)
+            if gear.category_id is not None:
+                gear._category = self.categories.get(gear.category_id)
+        return gears
+
+    def resolve_joined(self, gear: Gear, row) -> Gear:
+        """
+        Attach Brand and Category from the program_db columns of a joined
+        gear row (gear_db.GEAR_SELECT) instead of querying for them.
+        """
+        if gear.brand_id is not None:
+            if gear.brand_id not in self.brands:
+                self.brands[gear.brand_id] = Brand(
+                    id_brand    = row["ref_brand_id"],
+                    name        = row["brand_name"],
+                    description = row["brand_description"],
+                    url         = row["brand_url"],
+                ) if row["ref_brand_id"] is not None else None
+            gear._brand = self.brands[gear.brand_id]
+        if gear.category_id is not None:
+            if gear.category_id not in self.categories:
+                self.categories[gear.category_id] = Category(
+                    id_category = row["ref_category_id"],
+                    name        = row["category_name"],
+                    description = row["category_description"],
+                ) if row["ref_category_id"] is not None else None
+            gear._category = self.categories[gear.category_id]
+        return gear
+
+    def _load_brands(self, ids: set[int]):
+        missing = ids - self.brands.keys()
+        if not missing:
+            return
+        for brand in get_brands_by_ids(missing):
+            self.brands[brand.id_brand] = brand
+        for brand_id in missing:
+            self.brands.setdefault(brand_id, None)  # unknown ID, don't ask again
+
+    def _load_categories(self, ids: set[int]):
+        missing = ids - self.categories.keys()
+        if not missing:
+            return
+        for category in get_categories_by_ids(missing):
+            self.categories[category.id_category] = category
+        for category_id in missing:
+            self.categories.setdefault(category_id, None)
+
+
+def resolve_gear_references(gears: Iterable[Gear]) -> list[Gear]:
+    """Resolve brand and category for one batch of gear (fresh identity maps)."""
+    return GearRepository().resolve(gears)
@@ -0,0 +1,270 @@
+"""
+Materialized mass / value totals of kits and trips (Kit_Totals, Trip_Totals).
+
+The write functions of gear_db, kit_db, trip_db and program_db call the
+functions below inside their own transaction, so the list views read
+precomputed numbers instead of walking the nested gear of every kit and
+trip. Rows that are missing (e.g. right after the migration that created
+the tables) are computed the first time they are read.
+
+Changes of contents (kits / trips written, gear deleted) recompute the
+affected rows. A changed gear mass or price, consumable weight or kit
+total is instead pushed as a delta along the reverse dependencies
+gear -> kits -> trips, so only the rows that contain the item are touched
+and nothing is rescanned.
+
+The connection passed in must have program_db attached (joined_db), as
+consumable weights live there.
+"""
+
+import sqlite3
+
+from app.data.db.connection import fetch_in
+from app.data.db.joined_db import PROGRAM, get_joined_connection, joined_transaction
+
+# Kits are recomputed from their gear
+_RECOMPUTE_KITS = """
+    INSERT OR REPLACE INTO Kit_Totals (kit_id, item_count, total_mass, value_cents)
+    SELECT k.id_kit,
+           COUNT(g.id_gear),
+           COALESCE(k.mass_correction, 0) + COALESCE(SUM(COALESCE(g.mass_pcs, 0) * kg.amount), 0),
+           COALESCE(SUM(COALESCE(g.price_cents, 0) * kg.amount), 0)
+    FROM Kit k
+    LEFT JOIN Kit_Gear kg ON kg.kit_id = k.id_kit
+    LEFT JOIN Gear g      ON g.id_gear = kg.gear_id
+    WHERE k.id_kit IN ({ids})
+    GROUP BY k.id_kit
+"""
+
+# Trips from their gear, the Kit_Totals of their kits and their consumables
+_RECOMPUTE_TRIPS = f"""
+    INSERT OR REPLACE INTO Trip_Totals (trip_id, gear_mass, consumable_mass, value_cents)
+    SELECT t.id_trip,
+           COALESCE(t.gear_mass_correction, 0) + COALESCE((
+               SELECT SUM(ti.amount * CASE ti.item_type
+                          WHEN 'kit' THEN (SELECT total_mass FROM Kit_Totals WHERE kit_id = ti.item_id)
+                          ELSE (SELECT mass_pcs FROM Gear WHERE id_gear = ti.item_id)
+                      END)
+               FROM Trip_Items ti
+               WHERE ti.trip_id = t.id_trip
+           ), 0),
+           COALESCE(t.consumable_mass_correction, 0) + COALESCE((
+               SELECT SUM(tc.amount * c.weight)
+               FROM Trip_Consumables tc
+               JOIN {PROGRAM}.Consumable c ON c.id_consumable = tc.consumable_id
+               WHERE tc.trip_id = t.id_trip
+           ), 0),
+           COALESCE((
+               SELECT SUM(ti.amount * CASE ti.item_type
+                          WHEN 'kit' THEN (SELECT value_cents FROM Kit_Totals WHERE kit_id = ti.item_id)
+                          ELSE (SELECT price_cents FROM Gear WHERE id_gear = ti.item_id)
+                      END)
+               FROM Trip_Items ti
+               WHERE ti.trip_id = t.id_trip
+           ), 0)
+    FROM Trip t
+    WHERE t.id_trip IN ({{ids}})
+"""
+
+
+###############################################################################
+#               Dependencies
+###############################################################################
+
+def kits_containing_gear(conn: sqlite3.Connection, gear_ids) -> set[int]:
+    rows = fetch_in(conn, "SELECT DISTINCT kit_id FROM Kit_Gear WHERE gear_id IN ({ids})", gear_ids)
+    return {row[0] for row in rows}
+
+
+def trips_containing(conn: sqlite3.Connection, item_type: str, item_ids) -> set[int]:
+    """Trips with any of item_ids as item_type ('gear' / 'kit') in Trip_Items."""
+    rows = fetch_in(
+        conn,
+        f"SELECT DISTINCT trip_id FROM Trip_Items WHERE item_type = '{item_type}' AND item_id IN ({{ids}})",
+        item_ids,
+    )
+    return {row[0] for row in rows}
+
+
+###############################################################################
+#               Recomputation
+###############################################################################
+
+def recompute_kits(conn: sqlite3.Connection, kit_ids):
+    """Recompute the Kit_Totals rows of kit_ids from their gear."""
+    if kit_ids:
+        fetch_in(conn, _RECOMPUTE_KITS, kit_ids)
+
+
+def recompute_trips(conn: sqlite3.Connection, trip_ids):
+    """Recompute the Trip_Totals rows of trip_ids (Kit_Totals must be current)."""
+    if not trip_ids:
+        return
+    # Kits whose totals were never computed are needed first
+    missing = fetch_in(conn, """
+        SELECT DISTINCT ti.item_id FROM Trip_Items ti
+        LEFT JOIN Kit_Totals kt ON kt.kit_id = ti.item_id
+        WHERE ti.item_type = 'kit' AND kt.kit_id IS NULL AND ti.trip_id IN ({ids})
+    """, trip_ids)
+    recompute_kits(conn, [row[0] for row in missing])
+    fetch_in(conn, _RECOMPUTE_TRIPS, trip_ids)
+
+
+def recompute_missing(conn: sqlite3.Connection):
+    """Compute the Kit_Totals / Trip_Totals rows that don't exist yet (e.g. before an export)."""
+    kits = conn.execute("SELECT id_kit FROM Kit WHERE id_kit NOT IN (SELECT kit_id FROM Kit_Totals)")
+    recompute_kits(conn, [row[0] for row in kits])
+    trips = conn.execute("SELECT id_trip FROM Trip WHERE id_trip NOT IN (SELECT trip_id FROM Trip_Totals)")
+    recompute_trips(conn, [row[0] for row in trips])
+
+
+def refresh_after_gear(conn: sqlite3.Connection, gear_ids, kit_ids=(), trip_ids=()):
+    """
+    Recompute everything gear_ids are part of. kit_ids / trip_ids add kits
+    and trips that no longer contain the gear (collected before a delete).
+    """
+    kit_ids = set(kit_ids) | kits_containing_gear(conn, gear_ids)
+    recompute_kits(conn, kit_ids)
+    trip_ids = set(trip_ids) | trips_containing(conn, "gear", gear_ids) | trips_containing(conn, "kit", kit_ids)
+    recompute_trips(conn, trip_ids)
+
+
+def forget_kit(conn: sqlite3.Connection, kit_id: int):
+    conn.execute("DELETE FROM Kit_Totals WHERE kit_id = ?", (kit_id,))
+
+
+def forget_trip(conn: sqlite3.Connection, trip_id: int):
+    conn.execute("DELETE FROM Trip_Totals WHERE trip_id = ?", (trip_id,))
+
+
+###############################################################################
+#               Deltas
+###############################################################################
+
+def _add(deltas: dict, key: int, d_mass, d_value):
+    old_mass, old_value = deltas.get(key, (0, 0))
+    deltas[key] = (old_mass + d_mass, old_value + d_value)
+
+
+def _apply_kit_deltas(conn: sqlite3.Connection, kit_deltas: dict[int, tuple]):
+    conn.executemany(
+        "UPDATE Kit_Totals SET total_mass = total_mass + ?, value_cents = value_cents + ? WHERE kit_id = ?",
+        [(d_mass, d_value, kit_id) for kit_id, (d_mass, d_value) in kit_deltas.items()],
+    )
+
+
+def _apply_trip_deltas(conn: sqlite3.Connection, trip_deltas: dict[int, tuple], column: str = "gear_mass"):
+    conn.executemany(
+        f"UPDATE Trip_Totals SET {column} = {column} + ?, value_cents = value_cents + ? WHERE trip_id = ?",
+        [(d_mass, d_value, trip_id) for trip_id, (d_mass, d_value) in trip_deltas.items()],
+    )
+
+
+def _kit_deltas_to_trips(conn: sqlite3.Connection, kit_deltas: dict[int, tuple], trip_deltas: dict[int, tuple]):
+    """Add the effect of changed kit totals to trip_deltas (kit delta x amount in the trip)."""
+    if not kit_deltas:
+        return
+    rows = fetch_in(conn, """
+        SELECT trip_id, item_id, SUM(amount) FROM Trip_Items
+        WHERE item_type = 'kit' AND item_id IN ({ids})
+        GROUP BY trip_id, item_id
+    """, kit_deltas)
+    for trip_id, kit_id, amount in rows:
+        d_mass, d_value = kit_deltas[kit_id]
+        _add(trip_deltas, trip_id, d_mass * amount, d_value * amount)
+
+
+def push_gear_delta(conn: sqlite3.Connection, gear_id: int, d_mass, d_value_cents):
+    """
+    A gear item's mass_pcs / price_cents changed by d_mass / d_value_cents:
+    add the change x pieces to every kit containing it, and to every trip
+    containing it directly or through one of those kits.
+    """
+    if not d_mass and not d_value_cents:
+        return
+    kit_deltas, trip_deltas = {}, {}
+    for kit_id, amount in conn.execute(
+        "SELECT kit_id, SUM(amount) FROM Kit_Gear WHERE gear_id = ? GROUP BY kit_id", (gear_id,)
+    ):
+        _add(kit_deltas, kit_id, d_mass * amount, d_value_cents * amount)
+    for trip_id, amount in conn.execute(
+        "SELECT trip_id, SUM(amount) FROM Trip_Items WHERE item_type = 'gear' AND item_id = ? GROUP BY trip_id", (gear_id,)
+    ):
+        _add(trip_deltas, trip_id, d_mass * amount, d_value_cents * amount)
+
+    _apply_kit_deltas(conn, kit_deltas)
+    _kit_deltas_to_trips(conn, kit_deltas, trip_deltas)
+    _apply_trip_deltas(conn, trip_deltas)
+
+
+def push_kit_change(conn: sqlite3.Connection, kit_id: int):
+    """
+    Recompute one kit after its contents changed and push the difference
+    of its totals to the trips containing it.
+    """
+    old = conn.execute("SELECT total_mass, value_cents FROM Kit_Totals WHERE kit_id = ?", (kit_id,)).fetchone()
+    recompute_kits(conn, [kit_id])
+    if old is None:
+        # Never computed: there is no baseline to add a delta to
+        recompute_trips(conn, trips_containing(conn, "kit", [kit_id]))
+        return
+    new = conn.execute("SELECT total_mass, value_cents FROM Kit_Totals WHERE kit_id = ?", (kit_id,)).fetchone()
+    trip_deltas = {}
+    _kit_deltas_to_trips(conn, {kit_id: (new[0] - old[0], new[1] - old[1])}, trip_deltas)
+    _apply_trip_deltas(conn, trip_deltas)
+
+
+def push_consumable_delta(conn: sqlite3.Connection, consumable_id: int, d_weight):
+    """A consumable's weight changed by d_weight: add it x amount to every trip using it."""
+    if not d_weight:
+        return
+    trip_deltas = {}
+    for trip_id, amount in conn.execute(
+        "SELECT trip_id, SUM(amount) FROM Trip_Consumables WHERE consumable_id = ? GROUP BY trip_id", (consumable_id,)
+    ):
+        _add(trip_deltas, trip_id, d_weight * amount, 0)
+    _apply_trip_deltas(conn, trip_deltas, column="consumable_mass")
+
+
+###############################################################################
+#               Reading
+###############################################################################
+
+def _read(query: str, ids, key: str, recompute) -> dict[int, sqlite3.Row]:
+    """Read summary rows for ids, computing the ones that are missing."""
+    ids = list(ids)
+    rows = {row[key]: row for row in fetch_in(get_joined_connection(), query, ids)}
+    missing = [row_id for row_id in ids if row_id not in rows]
+    if missing:
+        with joined_transaction() as conn:
+            recompute(conn, missing)
+            rows.update({row[key]: row for row in fetch_in(conn, query, missing)})
+    return rows
+
+
+def get_kit_totals(kit_ids) -> dict[int, sqlite3.Row]:
+    """{kit_id: (id_kit, item_count, total_mass, value_cents)} for many kits."""
+    return _read(
+        "SELECT kit_id AS id_kit, item_count, total_mass, value_cents FROM Kit_Totals WHERE kit_id IN ({ids})",
+        kit_ids, "id_kit", recompute_kits,
+    )
+
+
+def get_trip_totals(trip_ids) -> dict[int, dict]:
+    """
+    {trip_id: {"gear_mass", "consumable_mass", "total_value"}} for many
+    trips, corrections included; same numbers as the Trip methods of the
+    same name.
+    """
+    rows = _read(
+        "SELECT trip_id, gear_mass, consumable_mass, value_cents FROM Trip_Totals WHERE trip_id IN ({ids})",
+        trip_ids, "trip_id", recompute_trips,
+    )
+    return {
+        trip_id: {
+            "gear_mass":       row["gear_mass"],
+            "consumable_mass": row["consumable_mass"],
+            "total_value":     row["value_cents"] / 100,
+        }
+        for trip_id, row in rows.items()
+    }
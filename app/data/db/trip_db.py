@@ -1,14 +1,20 @@
 import json
-import sqlite3
 from pathlib import Path
 from typing import Union
 
 from app.config_manager import ConfigManager
-from app.core.trip import Trip
+from app.core.trip import Trip, LazyTrip
 from app.core.gear_item import Gear
 from app.core.kit_item import Kit
-from app.data.db.gear_db import get_gear_by_id
-from app.data.db.kit_db import get_kit_by_id
+from app.core.utils import search_engine
+from app.data.db import cache
+from app.data.db.paging import KeysetPager
+from app.data.db.connection import get_connection, transaction, fetch_in
+from app.data.db.gear_db import get_gear_by_ids
+from app.data.db import totals_db
+from app.data.db.joined_db import PROGRAM, get_joined_connection, joined_transaction
+from app.data.db.totals_db import get_trip_totals
+from app.data.db.kit_db import _get_kit_contents, _kit_gear_ids, _row_to_kit
 
 config = ConfigManager()
 BASE_DIR = Path(__file__).resolve().parents[3]
@@ -18,133 +24,171 @@ DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 
 def add_trip(trip: Trip) -> int:
-    """Insert a new trip and return its ID."""
-    # Store item IDs prefixed with type: "G:4" or "K:2"
-    item_ids = []
-    for item in trip.items:
-        if isinstance(item, Kit):
-            item_ids.append(f"K:{item.id_kit}")
-        else:
-            item_ids.append(f"G:{item.id_gear}")
-
-    consumable_ids = [c.id_consumable for c in trip.consumables]
-
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO Trip (
-            name, description, comment, tag, trip_month, duration,
-            max_altitude, no_people, gear, gear_amount, gear_mass_correction,
-            consumables, consumable_amount, consumable_mass_correction
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        trip.name,
-        trip.description,
-        json.dumps(trip.comments),
-        json.dumps(trip.tags),
-        int(trip.trip_month) if trip.trip_month else None,
-        trip.duration,
-        trip.max_altitude,
-        trip.no_people,
-        json.dumps(item_ids),
-        json.dumps(trip.item_amounts),
-        trip.gear_mass_correction,
-        json.dumps(consumable_ids),
-        json.dumps(trip.consumable_amounts),
-        trip.consumable_mass_correction,
-    ))
-    trip_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    """Insert a new trip with its items and consumables, and return its ID."""
+    with joined_transaction() as conn:
+        cursor = conn.execute("""
+            INSERT INTO Trip (
+                name, description, comment, tag, trip_month, duration,
+                max_altitude, no_people, gear_mass_correction, consumable_mass_correction
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            trip.name,
+            trip.description,
+            json.dumps(trip.comments),
+            json.dumps(trip.tags),
+            int(trip.trip_month) if trip.trip_month else None,
+            trip.duration,
+            trip.max_altitude,
+            trip.no_people,
+            trip.gear_mass_correction,
+            trip.consumable_mass_correction,
+        ))
+        trip_id = cursor.lastrowid
+        _write_trip_contents(conn, trip_id, trip)
+        totals_db.recompute_trips(conn, [trip_id])
+    search_engine.refresh("Trip", trip_id)
+    cache.bump("trip")
     return trip_id
 
 def update_trip(trip: Trip):
-    """Update all fields of an existing trip."""
-    item_ids = []
-    for item in trip.items:
+    """Update all fields of an existing trip, replace its contents and refresh its totals."""
+    with joined_transaction() as conn:
+        conn.execute("""
+            UPDATE Trip SET
+                name=?, description=?, comment=?, tag=?, trip_month=?, duration=?,
+                max_altitude=?, no_people=?, gear_mass_correction=?, consumable_mass_correction=?
+            WHERE id_trip=?
+        """, (
+            trip.name,
+            trip.description,
+            json.dumps(trip.comments),
+            json.dumps(trip.tags),
+            int(trip.trip_month) if trip.trip_month else None,
+            trip.duration,
+            trip.max_altitude,
+            trip.no_people,
+            trip.gear_mass_correction,
+            trip.consumable_mass_correction,
+            trip.id_trip,
+        ))
+        conn.execute("DELETE FROM Trip_Items WHERE trip_id = ?", (trip.id_trip,))
+        conn.execute("DELETE FROM Trip_Consumables WHERE trip_id = ?", (trip.id_trip,))
+        _write_trip_contents(conn, trip.id_trip, trip)
+        totals_db.recompute_trips(conn, [trip.id_trip])
+    search_engine.refresh("Trip", trip.id_trip)
+    cache.bump("trip")
+
+
+def _write_trip_contents(conn, trip_id: int, trip: Trip):
+    """Insert the Trip_Items and Trip_Consumables rows of a trip, in list order."""
+    items = []
+    for item, amt in zip(trip.items, trip.item_amounts):
         if isinstance(item, Kit):
-            item_ids.append(f"K:{item.id_kit}")
+            items.append((trip_id, "kit", item.id_kit, amt))
         else:
-            item_ids.append(f"G:{item.id_gear}")
-
-    consumable_ids = [c.id_consumable for c in trip.consumables]
-
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("""
-        UPDATE Trip SET
-            name=?, description=?, comment=?, tag=?, trip_month=?, duration=?,
-            max_altitude=?, no_people=?, gear=?, gear_amount=?, gear_mass_correction=?,
-            consumables=?, consumable_amount=?, consumable_mass_correction=?
-        WHERE id_trip=?
-    """, (
-        trip.name,
-        trip.description,
-        json.dumps(trip.comments),
-        json.dumps(trip.tags),
-        int(trip.trip_month) if trip.trip_month else None,
-        trip.duration,
-        trip.max_altitude,
-        trip.no_people,
-        json.dumps(item_ids),
-        json.dumps(trip.item_amounts),
-        trip.gear_mass_correction,
-        json.dumps(consumable_ids),
-        json.dumps(trip.consumable_amounts),
-        trip.consumable_mass_correction,
-        trip.id_trip,
-    ))
-    conn.commit()
-    conn.close()
-
-def _load_consumable_as_gear(consumable_id: int) -> Gear | None:
-    """Load a consumable from program_db and wrap it as a Gear-like object."""
-    from app.data.db.program_db import get_consumable_by_id
-    row = get_consumable_by_id(consumable_id)
-    if not row:
-        return None
+            items.append((trip_id, "gear", item.id_gear, amt))
+    conn.executemany(
+        "INSERT INTO Trip_Items (trip_id, item_type, item_id, amount) VALUES (?, ?, ?, ?)",
+        items,
+    )
+    conn.executemany(
+        "INSERT INTO Trip_Consumables (trip_id, consumable_id, amount) VALUES (?, ?, ?)",
+        [(trip_id, c.id_consumable, amt) for c, amt in zip(trip.consumables, trip.consumable_amounts)],
+    )
+
+
+def _consumable_to_gear(row) -> Gear:
+    """Wrap a consumable row from program_db as a Gear-like object."""
     # consumable tuple: (id, name, description, weight)
     g = Gear(name=row[1], variant="", mass_pcs=row[3], description=row[2])
     g.id_consumable = row[0]
     return g
 
 
-def get_trip_by_id(trip_id: int) -> Trip | None:
-    """Fetch a single trip by ID, returning a Trip instance."""
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM Trip WHERE id_trip = ?", (trip_id,))
-        row = cursor.fetchone()
-        if row is None:
-            return None
-
-    item_ids   = json.loads(row["gear"]             or "[]")
-    amounts    = json.loads(row["gear_amount"]       or "[]")
-    con_ids    = json.loads(row["consumables"]       or "[]")
-    con_amts   = json.loads(row["consumable_amount"] or "[]")
+def get_trip_consumable_rows(trip_ids) -> list:
+    """
+    Trip_Consumables rows of many trips joined with program_db's Consumable
+    in one statement: (id_consumable, name, description, weight, trip_id,
+    amount). id_consumable is NULL if the consumable no longer exists.
+    """
+    conn = get_joined_connection()
+    return fetch_in(conn, f"""
+        SELECT c.id_consumable, c.name, c.description, c.weight, tc.trip_id, tc.amount
+        FROM Trip_Consumables tc
+        LEFT JOIN {PROGRAM}.Consumable c ON c.id_consumable = tc.consumable_id
+        WHERE tc.trip_id IN ({{ids}})
+        ORDER BY tc.id
+    """, trip_ids)
+
+
+def get_trips_bulk(ids: list[int] | None = None) -> list[Trip]:
+    """
+    Fetch many trips (all trips if ids is None) ordered by name.
+
+    Everything the trips reference is loaded with one IN-list query per
+    table (Kit, Gear, Consumable) and the Trip objects are assembled from
+    in-memory ID maps, so the number of queries does not grow with the
+    number of trips. Gear and consumables come with their program_db data
+    joined in (see gear_db.GEAR_SELECT, get_trip_consumable_rows).
+    """
+    conn = get_connection(DB_PATH)
+    if ids is None:
+        trip_rows = conn.execute("SELECT * FROM Trip ORDER BY name").fetchall()
+    else:
+        trip_rows = fetch_in(conn, "SELECT * FROM Trip WHERE id_trip IN ({ids}) ORDER BY name", ids)
+    if not trip_rows:
+        return []
+
+    trip_ids = [row["id_trip"] for row in trip_rows]
+    items = {trip_id: [] for trip_id in trip_ids}
+    consumables = {trip_id: [] for trip_id in trip_ids}
+
+    # Collect every reference first
+    gear_ids, kit_ids = set(), set()
+    for row in fetch_in(conn, "SELECT trip_id, item_type, item_id, amount FROM Trip_Items WHERE trip_id IN ({ids}) ORDER BY id", trip_ids):
+        items[row["trip_id"]].append((row["item_type"], row["item_id"], row["amount"]))
+        (kit_ids if row["item_type"] == "kit" else gear_ids).add(row["item_id"])
+    con_map = {}
+    for row in get_trip_consumable_rows(trip_ids):
+        if row["id_consumable"] is None:
+            continue  # consumable was deleted from program_db
+        consumables[row["trip_id"]].append((row["id_consumable"], row["amount"]))
+        if row["id_consumable"] not in con_map:
+            con_map[row["id_consumable"]] = _consumable_to_gear(row)
+
+    kit_rows = fetch_in(conn, "SELECT * FROM Kit WHERE id_kit IN ({ids})", kit_ids) if kit_ids else []
+    kit_contents = _get_kit_contents(conn, [row["id_kit"] for row in kit_rows])
+    gear_map = get_gear_by_ids(gear_ids | _kit_gear_ids(kit_contents))
+    kit_map  = {row["id_kit"]: _row_to_kit(row, kit_contents, gear_map) for row in kit_rows}
+
+    return [
+        _row_to_trip(row, items[row["id_trip"]], consumables[row["id_trip"]], gear_map, kit_map, con_map)
+        for row in trip_rows
+    ]
+
+
+def _row_to_trip(row, items: list, consumables: list, gear_map: dict, kit_map: dict, con_map: dict) -> Trip:
+    """
+    Build a Trip from a database row, its contents and ID maps of gear,
+    kits and consumables. References that no longer resolve are skipped.
+    """
     comments   = json.loads(row["comment"]           or "[]")
     tags       = json.loads(row["tag"]               or "[]")
 
-    items        = []
+    trip_items   = []
     item_amounts = []
-    for ref, amt in zip(item_ids, amounts):
-        if ref.startswith("K:"):
-            obj = get_kit_by_id(int(ref[2:]))
-        else:
-            obj = get_gear_by_id(int(ref[2:]))
+    for item_type, item_id, amt in items:
+        obj = kit_map.get(item_id) if item_type == "kit" else gear_map.get(item_id)
         if obj:
-            items.append(obj)
+            trip_items.append(obj)
             item_amounts.append(amt)
 
-    con_ids  = json.loads(row["consumables"]       or "[]")
-    con_amts = json.loads(row["consumable_amount"] or "[]")
-
-    consumables        = []
+    trip_consumables   = []
     consumable_amounts = []
-    for cid, amt in zip(con_ids, con_amts):
-        c = _load_consumable_as_gear(cid)
+    for cid, amt in consumables:
+        c = con_map.get(cid)
         if c:
-            consumables.append(c)
+            trip_consumables.append(c)
             consumable_amounts.append(amt)
 
     return Trip(
@@ -157,29 +201,82 @@ def get_trip_by_id(trip_id: int) -> Trip | None:
         duration                   = row["duration"],
         max_altitude               = row["max_altitude"],
         no_people                  = row["no_people"],
-        items                      = items,
+        items                      = trip_items,
         item_amounts               = item_amounts,
         gear_mass_correction       = row["gear_mass_correction"] or 0,
-        consumables                = consumables,
+        consumables                = trip_consumables,
         consumable_amounts         = consumable_amounts,
         consumable_mass_correction = row["consumable_mass_correction"] or 0,
     )
 
 
+def get_trip_by_id(trip_id: int) -> Trip | None:
+    """Fetch a single trip by ID, returning a Trip instance."""
+    trips = get_trips_bulk([trip_id])
+    return trips[0] if trips else None
+
+
+@cache.cached("trip", "kit", "gear", "brand", "category", "consumable")
 def get_all_trips() -> list[Trip]:
     """Fetch all trips ordered by name."""
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT id_trip FROM Trip ORDER BY name")
-        ids = [row["id_trip"] for row in cursor.fetchall()]
-    return [t for trip_id in ids if (t := get_trip_by_id(trip_id))]
+    return get_trips_bulk()
+
+def _load_trip_contents(trip_id: int) -> tuple[list, list, list, list]:
+    """(items, item_amounts, consumables, consumable_amounts) of one trip, for LazyTrip."""
+    trip = get_trip_by_id(trip_id)
+    if trip is None:
+        return [], [], [], []
+    return trip.items, trip.item_amounts, trip.consumables, trip.consumable_amounts
+
+
+def get_trips_lazy(ids: list[int] | None = None) -> list[LazyTrip]:
+    """
+    Fetch many trips (all trips if ids is None) ordered by name, without
+    their contents: masses and value come from get_trip_totals and the
+    items are only loaded when trip.items / trip.consumables is accessed.
+    """
+    conn = get_connection(DB_PATH)
+    if ids is None:
+        rows = conn.execute("SELECT * FROM Trip ORDER BY name").fetchall()
+    else:
+        rows = fetch_in(conn, "SELECT * FROM Trip WHERE id_trip IN ({ids}) ORDER BY name", ids)
+    totals = get_trip_totals([row["id_trip"] for row in rows]) if rows else {}
+
+    return [
+        LazyTrip(
+            id_trip                    = row["id_trip"],
+            name                       = row["name"],
+            loader                     = lambda trip_id=row["id_trip"]: _load_trip_contents(trip_id),
+            totals                     = totals[row["id_trip"]],
+            description                = row["description"],
+            comments                   = json.loads(row["comment"] or "[]"),
+            tags                       = json.loads(row["tag"] or "[]"),
+            trip_month                 = row["trip_month"],
+            duration                   = row["duration"],
+            max_altitude               = row["max_altitude"],
+            no_people                  = row["no_people"],
+            gear_mass_correction       = row["gear_mass_correction"] or 0,
+            consumable_mass_correction = row["consumable_mass_correction"] or 0,
+        )
+        for row in rows
+    ]
+
+
+def trip_pager(hydrate=None, key=None) -> KeysetPager:
+    """
+    Page through all trips by name, loading one page of Trips at a time.
+    hydrate/key override how a page of IDs becomes display items.
+    """
+    return KeysetPager(DB_PATH, "Trip", "id_trip", hydrate or get_trips_bulk, key)
 
 def delete_trip(trip_id: int):
     """Delete a trip and its comments."""
     from app.data.db.user_db import delete_comments_by_parent_id
     delete_comments_by_parent_id(trip_id)
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("DELETE FROM Trip WHERE id_trip = ?", (trip_id,))
-    conn.commit()
-    conn.close()
+    with transaction(DB_PATH) as conn:
+        conn.execute("DELETE FROM Trip_Items WHERE trip_id = ?", (trip_id,))
+        conn.execute("DELETE FROM Trip_Consumables WHERE trip_id = ?", (trip_id,))
+        conn.execute("DELETE FROM Trip WHERE id_trip = ?", (trip_id,))
+        totals_db.forget_trip(conn, trip_id)
+    search_engine.remove("Trip", trip_id)
+    cache.bump("trip")
@@ -1,8 +1,8 @@
-import sqlite3
 from pathlib import Path
 
 from app.config_manager import ConfigManager  # assuming you have this
 from app.lang import lang
+from app.data.db.connection import get_connection, transaction
 
 # Load config once
 config = ConfigManager()  # reads defaults + user config
@@ -24,11 +24,8 @@ DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 def add_comment(comment: str, parent_id: int, date: int, db_path: str = DB_PATH):
     """ Add a comment ot the user_db """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO Comments (parent_id, date, comment) VALUES (?, ?, ?)", (parent_id, date, comment))
-    conn.commit()
-    conn.close()
+    with transaction(db_path) as conn:
+        conn.execute("INSERT INTO Comments (parent_id, date, comment) VALUES (?, ?, ?)", (parent_id, date, comment))
 
 
 #def update_comment(category_id: int, new_name: str, new_description: str):
@@ -46,27 +43,19 @@ def add_comment(comment: str, parent_id: int, date: int, db_path: str = DB_PATH)
 
 def get_comments_by_parent_id(parent_id: int):
     """Return a list of all comments with certain parent_id"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM Comments WHERE parent_id = ? ORDER BY date", (parent_id,))
-    results = cursor.fetchall()
-    conn.close()
-    return results
+    conn = get_connection(DB_PATH)
+    cursor = conn.execute("SELECT * FROM Comments WHERE parent_id = ? ORDER BY date", (parent_id,))
+    return cursor.fetchall()
 
 
 def get_comment_by_id(comment_id: int):
     """Return a single comment by ID."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM Comments WHERE id_comment = ? SORT BY date", (comment_id,))
-    result = cursor.fetchone()
-    conn.close()
-    return result
+    conn = get_connection(DB_PATH)
+    cursor = conn.execute("SELECT * FROM Comments WHERE id_comment = ?", (comment_id,))
+    return cursor.fetchone()
 
 
 def delete_comments_by_parent_id(parent_id: int):
     """Delete all comments for a given parent."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("DELETE FROM Comments WHERE parent_id = ?", (parent_id,))
-    conn.commit()
-    conn.close()
+    with transaction(DB_PATH) as conn:
+        conn.execute("DELETE FROM Comments WHERE parent_id = ?", (parent_id,))
@@ -2,6 +2,8 @@
 from pathlib import Path
 from app.data import user_db
 from app.data import db
+from app.core.utils import search_engine
+from app.data.db.fts_db import ensure_fts_indexes, PROGRAM_FTS_TABLES, USER_FTS_TABLES
 from app.config_manager import ConfigManager
 from app.lang import lang
 
@@ -22,6 +24,7 @@ def ensure_program_db_initialized():
     else:
         # Optional: only debug info, not standard user message
         print(lang.t("initializer.msg.program_db_found").format(db_path=program_db_path))
+    ensure_fts_indexes(program_db_path, PROGRAM_FTS_TABLES)
 
 def ensure_user_db_initialized():
     """Initialize the user database if required."""
@@ -31,6 +34,8 @@ def ensure_user_db_initialized():
     else:
         # Optional: only debug info
         print(lang.t("initializer.msg.user_db_found").format(db_path=user_db_path))
+    user_db.migrate_user_db(user_db_path)
+    ensure_fts_indexes(user_db_path, USER_FTS_TABLES)
 
 def initialize_all():
     """
@@ -39,5 +44,6 @@ def initialize_all():
     """
     ensure_program_db_initialized()
     ensure_user_db_initialized()
+    search_engine.build({"program_db": program_db_path, "user_db": user_db_path})
     print(lang.t("initializer.msg.db_ready"))
 
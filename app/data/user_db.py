@@ -4,6 +4,7 @@ from pathlib import Path
 
 from app.config_manager import ConfigManager
 from app.lang import lang
+from app.data.db.connection import get_connection, transaction
 
 # Load config
 config = ConfigManager()
@@ -37,88 +38,121 @@ def init_user_db(db_path: Path | str = DB_PATH):
     - Kit
     - Trip
     - Comments
+    - Kit_Gear, Trip_Items, Trip_Consumables (kit/trip contents)
     Only creates tables if they do not exist already.
     """
-    conn = sqlite3.connect(db_path)
     tables_created = False
+    with transaction(db_path) as conn:
+        # Create Gear table if missing
+        if not table_exists(conn, "Gear"):
+            conn.execute("""
+                CREATE TABLE Gear (
+                    id_gear INTEGER PRIMARY KEY,      -- unique identifier for gear
+                    name TEXT NOT NULL,                -- gear name
+                    variant TEXT,                      -- gear type/category
+                    brand_id INTEGER,                  -- foreign key to Brand
+                    size TEXT,                         -- gear size
+                    mass_pcs INTEGER,                  -- mass per piece
+                    price_cents INTEGER,               -- price per piece in cents
+                    amount INTEGER,                    -- number of items
+                    color TEXT,                        -- color in HEX
+                    category_id INTEGER,                -- foreign key to Category
+                    description TEXT,                  -- description of the gear
+                    prod_date DATE,                    -- production/manufacture date
+                    checked BOOLEAN DEFAULT 0,         -- boolean flag (0/1) if checked
+                    last_checked DATE DEFAULT CURRENT_DATE, -- last checked date
+                    lifespan INTEGER,                  -- lifespan in years (0 or NULL = infinite)
+                    kit_only BOOLEAN DEFAULT 0         -- boolean (0/1) if only in kits
+                )
+            """)
+            tables_created = True
 
-    # Create Gear table if missing
-    if not table_exists(conn, "Gear"):
-        conn.execute("""
-            CREATE TABLE Gear (
-                id_gear INTEGER PRIMARY KEY,      -- unique identifier for gear
-                name TEXT,                         -- gear name
-                variant TEXT,                         -- gear type/category
-                brand_id INTEGER,                     -- foreign key to Brand
-                size TEXT,                          -- gear size
-                mass_pcs INTEGER,                  -- mass per piece
-                price REAL,                        -- price per piece
-                amount INTEGER,                     -- number of items
-                color TEXT,                         -- color in HEX
-                category_id INTEGER,                   -- foreign key to Category
-                comments TEXT,                      -- list of comment IDs
-                description TEXT,                   -- description of the gear
-                prod_date TEXT,                     -- production/manufacture date
-                checked INTEGER,                    -- boolean flag (0/1) if checked
-                last_checked ,TEXT DEFAULT CURRENT_TIMESTAMP -- last checked date
-                lifespan INTEGER,                   -- lifespan in years (0 or NULL = infinite)
-                kit_only INTEGER                     -- boolean (0/1) if only in kits
-            )
-        """)
-        tables_created = True
-
-    # Create Kit table if missing
-    if not table_exists(conn, "Kit"):
-        conn.execute("""
-            CREATE TABLE Kit (
-                id_kit INTEGER PRIMARY KEY,         -- unique identifier for kit
-                name TEXT,                          -- kit name
-                description TEXT,                   -- description of the kit
-                comments TEXT,                      -- list of comment IDs
-                gear_list TEXT,                     -- list of gear IDs
-                mass_correction INTEGER,            -- manual mass correction
-                gear_amount TEXT                    -- list of amounts for each gear
-            )
-        """)
-        tables_created = True
-
-    # Create Trip table if missing
-    if not table_exists(conn, "Trip"):
-        conn.execute("""
-            CREATE TABLE Trip (
-                id_trip INTEGER PRIMARY KEY,        -- unique identifier for trip
-                name TEXT,                          -- trip name
-                description TEXT,                   -- description of the trip
-                comment TEXT,                       -- list of comment IDs
-                tag TEXT,                           -- list of tags
-                trip_month TEXT,                     -- trip month (YYYY-MM)
-                duration INTEGER,                   -- duration in days
-                max_altitude INTEGER,               -- max altitude in meters
-                no_people INTEGER,                  -- number of participants
-                gear TEXT,                          -- list of gear/kit IDs
-                gear_amount TEXT,                   -- amounts for each gear/kit
-                gear_mass_correction INTEGER,       -- manual gear mass correction
-                consumables TEXT,                   -- list of consumable IDs
-                consumable_amount TEXT,             -- amounts for consumables
-                consumable_mass_correction INTEGER  -- manual consumable mass correction
-            )
-        """)
-        tables_created = True
-
-    # Create Comments table if missing
-    if not table_exists(conn, "Comments"):
-        conn.execute("""
-            CREATE TABLE Comments (
-                id_comment INTEGER PRIMARY KEY,     -- unique identifier for comment
-                parent_id INTEGER,                  -- ID of gear/kit/trip this comment belongs to
-                date TEXT,                          -- date of the comment
-                comment TEXT                        -- comment text
-            )
-        """)
-        tables_created = True
-
-    conn.commit()
-    conn.close()
+        # Create Kit table if missing
+        if not table_exists(conn, "Kit"):
+            conn.execute("""
+                CREATE TABLE Kit (
+                    id_kit INTEGER PRIMARY KEY,         -- unique identifier for kit
+                    name TEXT,                          -- kit name
+                    description TEXT,                   -- description of the kit
+                    comments TEXT,                      -- list of comment IDs
+                    gear_list TEXT,                     -- legacy, contents live in Kit_Gear
+                    mass_correction INTEGER,            -- manual mass correction
+                    gear_amount TEXT                    -- legacy, contents live in Kit_Gear
+                )
+            """)
+            tables_created = True
+
+        # Create Trip table if missing
+        if not table_exists(conn, "Trip"):
+            conn.execute("""
+                CREATE TABLE Trip (
+                    id_trip INTEGER PRIMARY KEY,        -- unique identifier for trip
+                    name TEXT,                          -- trip name
+                    description TEXT,                   -- description of the trip
+                    comment TEXT,                       -- list of comment IDs
+                    tag TEXT,                           -- list of tags
+                    trip_month TEXT,                     -- trip month (YYYY-MM)
+                    duration INTEGER,                   -- duration in days
+                    max_altitude INTEGER,               -- max altitude in meters
+                    no_people INTEGER,                  -- number of participants
+                    gear TEXT,                          -- legacy, contents live in Trip_Items
+                    gear_amount TEXT,                   -- legacy, contents live in Trip_Items
+                    gear_mass_correction INTEGER,       -- manual gear mass correction
+                    consumables TEXT,                   -- legacy, contents live in Trip_Consumables
+                    consumable_amount TEXT,             -- legacy, contents live in Trip_Consumables
+                    consumable_mass_correction INTEGER  -- manual consumable mass correction
+                )
+            """)
+            tables_created = True
+
+        # Create Comments table if missing
+        if not table_exists(conn, "Comments"):
+            conn.execute("""
+                CREATE TABLE Comments (
+                    id_comment INTEGER PRIMARY KEY,     -- unique identifier for comment
+                    parent_id INTEGER,                  -- ID of gear/kit/trip this comment belongs to
+                    date TEXT,                          -- date of the comment
+                    comment TEXT                        -- comment text
+                )
+            """)
+            tables_created = True
+
+        # Create Kit_Gear table if missing (one row per gear in a kit)
+        if not table_exists(conn, "Kit_Gear"):
+            conn.execute("""
+                CREATE TABLE Kit_Gear (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, -- keeps the order gear was added
+                    kit_id INTEGER NOT NULL,              -- foreign key to Kit
+                    gear_id INTEGER NOT NULL,             -- foreign key to Gear
+                    amount INTEGER DEFAULT 1              -- number of pieces in the kit
+                )
+            """)
+            tables_created = True
+
+        # Create Trip_Items table if missing (one row per gear or kit in a trip)
+        if not table_exists(conn, "Trip_Items"):
+            conn.execute("""
+                CREATE TABLE Trip_Items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, -- keeps the order items were added
+                    trip_id INTEGER NOT NULL,             -- foreign key to Trip
+                    item_type TEXT NOT NULL,              -- 'gear' or 'kit'
+                    item_id INTEGER NOT NULL,             -- id_gear or id_kit
+                    amount INTEGER DEFAULT 1              -- number taken along
+                )
+            """)
+            tables_created = True
+
+        # Create Trip_Consumables table if missing
+        if not table_exists(conn, "Trip_Consumables"):
+            conn.execute("""
+                CREATE TABLE Trip_Consumables (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, -- keeps the order consumables were added
+                    trip_id INTEGER NOT NULL,             -- foreign key to Trip
+                    consumable_id INTEGER NOT NULL,       -- foreign key to Consumable (program DB)
+                    amount INTEGER DEFAULT 1              -- number taken along
+                )
+            """)
+            tables_created = True
 
     if tables_created:
         print(lang.t("user_db.msg.db_initialized", db_path=db_path))
@@ -127,21 +161,118 @@ def check_initialized(db_path: Path = DB_PATH) -> bool:
     """
     Returns True if all required tables exist in the user DB.
     """
-    required_tables = ["Gear", "Kit", "Trip", "Comments"]
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-
-    c.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    required_tables = ["Gear", "Kit", "Trip", "Comments", "Kit_Gear", "Trip_Items", "Trip_Consumables"]
+    conn = get_connection(db_path)
+    c = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
     existing_tables = [row[0] for row in c.fetchall()]
 
-    conn.close()
     return all(table in existing_tables for table in required_tables)
 
+
+###############################################################################
+#               Migrations
+###############################################################################
+
+def _migrate_contents_to_junction_tables(conn: sqlite3.Connection):
+    """
+    Version 1: move the parallel JSON arrays of Kit and Trip into
+    Kit_Gear, Trip_Items and Trip_Consumables and index those tables.
+    """
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_kit_gear_kit ON Kit_Gear(kit_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_kit_gear_gear ON Kit_Gear(gear_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_trip_items_trip ON Trip_Items(trip_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_trip_items_item ON Trip_Items(item_type, item_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_trip_consumables_trip ON Trip_Consumables(trip_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_trip_consumables_consumable ON Trip_Consumables(consumable_id)")
+
+    kit_gear = []
+    for row in conn.execute("SELECT id_kit, gear_list, gear_amount FROM Kit ORDER BY id_kit"):
+        gear_ids = json.loads(row[1] or "[]")
+        amounts  = json.loads(row[2] or "[]")
+        kit_gear.extend((row[0], gear_id, amt) for gear_id, amt in zip(gear_ids, amounts))
+    conn.executemany("INSERT INTO Kit_Gear (kit_id, gear_id, amount) VALUES (?, ?, ?)", kit_gear)
+
+    trip_items, trip_consumables = [], []
+    for row in conn.execute("SELECT id_trip, gear, gear_amount, consumables, consumable_amount FROM Trip ORDER BY id_trip"):
+        # Item references are stored as "G:4" (gear) or "K:2" (kit)
+        for ref, amt in zip(json.loads(row[1] or "[]"), json.loads(row[2] or "[]")):
+            item_type = "kit" if ref.startswith("K:") else "gear"
+            trip_items.append((row[0], item_type, int(ref[2:]), amt))
+        for cid, amt in zip(json.loads(row[3] or "[]"), json.loads(row[4] or "[]")):
+            trip_consumables.append((row[0], cid, amt))
+    conn.executemany("INSERT INTO Trip_Items (trip_id, item_type, item_id, amount) VALUES (?, ?, ?, ?)", trip_items)
+    conn.executemany("INSERT INTO Trip_Consumables (trip_id, consumable_id, amount) VALUES (?, ?, ?)", trip_consumables)
+
+
+def _index_gear_references(conn: sqlite3.Connection):
+    """
+    Version 2: index the brand and category columns of Gear, so
+    where_used() can answer reference checks without a table scan.
+    """
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_gear_brand ON Gear(brand_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_gear_category ON Gear(category_id)")
+
+
+def _index_list_order(conn: sqlite3.Connection):
+    """
+    Version 3: index (name, id) of Gear, Kit and Trip, the order the
+    paged lists walk them in (see app.data.db.paging.KeysetPager).
+    """
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_gear_name ON Gear(name, id_gear)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_kit_name ON Kit(name, id_kit)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_trip_name ON Trip(name, id_trip)")
+
+
+def _create_totals_tables(conn: sqlite3.Connection):
+    """
+    Version 4: summary tables with the mass and value of every kit and
+    trip, kept up to date by the write functions (see
+    app.data.db.totals_db). Rows missing here are computed on first read.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS Kit_Totals (
+            kit_id INTEGER PRIMARY KEY,           -- foreign key to Kit
+            item_count INTEGER NOT NULL,          -- gear entries that still exist
+            total_mass INTEGER NOT NULL,          -- gear mass x amount + mass_correction
+            value_cents INTEGER NOT NULL          -- gear price x amount
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS Trip_Totals (
+            trip_id INTEGER PRIMARY KEY,          -- foreign key to Trip
+            gear_mass INTEGER NOT NULL,           -- gear and kits + gear_mass_correction
+            consumable_mass INTEGER NOT NULL,     -- consumables + consumable_mass_correction
+            value_cents INTEGER NOT NULL          -- gear and kit gear price x amount
+        )
+    """)
+
+
+# Applied in order; PRAGMA user_version stores how many have run
+MIGRATIONS = [
+    _migrate_contents_to_junction_tables,
+    _index_gear_references,
+    _index_list_order,
+    _create_totals_tables,
+]
+
+
+def migrate_user_db(db_path: Path | str = DB_PATH):
+    """
+    Bring an existing user database up to the current schema version.
+    Each migration runs exactly once, inside the same transaction as the
+    version bump, so an interrupted migration is rolled back completely.
+    """
+    with transaction(db_path) as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, migration in enumerate(MIGRATIONS, 1):
+            if version < number:
+                migration(conn)
+                conn.execute(f"PRAGMA user_version = {number}")
+                print(lang.t("user_db.msg.db_migrated", version=number, db_path=db_path))
+
+
 def get_all_gear() -> list[dict]:
     """Fetch all gear from the database, ordered by name."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_connection(DB_PATH)
     cursor = conn.execute("SELECT * FROM Gear ORDER BY name")
-    rows = [dict(r) for r in cursor.fetchall()]
-    conn.close()
-    return rows
+    return [dict(r) for r in cursor.fetchall()]
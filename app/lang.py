@@ -1,31 +1,81 @@
 import json
+import pickle
 from pathlib import Path
 from app.config_manager import ConfigManager
 
+FALLBACK_LANG = "en"
+
+# Compiled namespaces (<lang>/<namespace>.pickle), rebuilt when their JSON
+# changes. Kept with the user config, not in app/i18n, where every folder
+# is a language
+CATALOG_DIR = Path("app/config/.catalog")
+
+
 class Language:
-    def __init__(self, lang_code: str = "en"):
+    """
+    Translations of one language with English as fallback.
+
+    Every JSON file in app/i18n/<lang> is a namespace named after the file
+    (menu.json -> "menu.*"). A namespace is loaded the first time one of its
+    keys is looked up, flattened into self.catalog together with its English
+    fallback, so only the parts of the app that are used get parsed.
+    """
+
+    def __init__(self, lang_code: str = FALLBACK_LANG):
         self.lang_code = lang_code
         self.lang_dir = Path("app/i18n")
-        # load selected language and fallback language (English)
-        self.translations = self._load_all_files(self.lang_code)
-        if self.lang_code != "en":
-            self.fallback_translations = self._load_all_files("en")
-        else:
-            self.fallback_translations = {}
-
-    def _load_all_files(self, lang_code: str) -> dict:
-        merged = {}
         lang_path = self.lang_dir / lang_code
         if not lang_path.exists():
             raise FileNotFoundError(f"Language folder {lang_path} not found")
+        self.codes = [lang_code] if lang_code == FALLBACK_LANG else [lang_code, FALLBACK_LANG]
+        # flat {"namespace.topkey.subkey": value} of the loaded namespaces
+        self.catalog: dict = {}
+        self.namespaces: set[str] = set()
+
+    def _load_namespace(self, namespace: str):
+        """Add one namespace (selected language, English filling the gaps) to the catalog."""
+        self.namespaces.add(namespace)
+        files = [self.lang_dir / code / f"{namespace}.json" for code in self.codes]
+        files = [file for file in files if file.is_file()]
+        if not files:
+            return
+        stamp = [(str(file), file.stat().st_mtime_ns, file.stat().st_size) for file in files]
 
-        for file in lang_path.glob("*.json"):
-            key_prefix = file.stem  # use filename as top-level key
+        cache_file = CATALOG_DIR / self.lang_code / f"{namespace}.pickle"
+        try:
+            with open(cache_file, "rb") as f:
+                cached = pickle.load(f)
+            if cached["stamp"] == stamp:
+                self.catalog.update(cached["catalog"])
+                return
+        except (OSError, pickle.PickleError, EOFError, KeyError, TypeError):
+            pass
+
+        flat = {}
+        for file in files:
             with open(file, "r", encoding="utf-8") as f:
                 data = json.load(f)
+            translated = {}
+            self._flatten(data, namespace, translated)
+            for key, value in translated.items():
+                if flat.get(key) is None:
+                    flat[key] = value
+        self.catalog.update(flat)
+
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, "wb") as f:
+                pickle.dump({"stamp": stamp, "catalog": flat}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass  # read-only install: just rebuild next time
 
-            merged[key_prefix] = data
-        return merged
+    @classmethod
+    def _flatten(cls, node, key: str, flat: dict):
+        """Store node under key and every nested value under its dotted key."""
+        flat[key] = node
+        if isinstance(node, dict):
+            for part, child in node.items():
+                cls._flatten(child, f"{key}.{part}", flat)
 
     def t(self, key: str, **kwargs) -> str:
         """
@@ -33,26 +83,17 @@ class Language:
         kwargs can be used for dynamic replacements: lang.t("messages.hello", name="Joe").
         Falls back to English if key is missing in selected language.
         """
-        value = self._get_from_dict(self.translations, key)
+        value = self.catalog.get(key)
         if value is None:
-            value = self._get_from_dict(self.fallback_translations, key)
-            if value is None:
+            namespace = key.split(".", 1)[0]
+            if namespace in self.namespaces:
                 return f"[MISSING: {key}]"
+            self._load_namespace(namespace)
+            return self.t(key, **kwargs)
         if isinstance(value, str) and kwargs:
             return value.format(**kwargs)
         return value
 
-    @staticmethod
-    def _get_from_dict(d: dict, key: str):
-        parts = key.split(".")
-        node = d
-        try:
-            for part in parts:
-                node = node[part]
-            return node
-        except (KeyError, TypeError):
-            return None
-
 # --- initialize using config ---
 _config = ConfigManager()       # reads defaults + user config
 user_lang = _config.get("general.language", "en")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Connection Benchmark
+Measures the per-call overhead of opening a fresh SQLite connection for every
+query (the old pattern in app/data/db) against the pooled connection from
+app.data.db.connection, on a throw-away user DB with 10k gear items.
+
+Run from the project root:
+    python -m app.testing.bench_db_connections
+"""
+
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from app.data import user_db
+from app.data.db import base_db, gear_db, program_db
+from app.data.db.connection import close_all
+
+GEAR_ITEMS = 10_000
+LOOKUPS = 5_000
+
+
+def build_databases(folder: Path) -> tuple[Path, Path]:
+    """Create a program DB and a user DB with GEAR_ITEMS gear rows."""
+    program_path = folder / "program_db.sqlite"
+    user_path = folder / "user_db.sqlite"
+    base_db.init_program_db(program_path)
+    user_db.init_user_db(user_path)
+
+    conn = sqlite3.connect(user_path)
+    conn.executemany(
+        "INSERT INTO Gear (name, variant, brand_id, mass_pcs, price_cents, amount, category_id) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (f"Gear {i}", f"Variant {i % 7}", None, random.randint(10, 2000),
+             random.randint(100, 50000), 1, None)
+            for i in range(GEAR_ITEMS)
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return program_path, user_path
+
+
+def bench_connect_per_call(user_path: Path, ids: list[int]) -> float:
+    """The old pattern: connect, query, close for every lookup."""
+    start = time.perf_counter()
+    for gear_id in ids:
+        conn = sqlite3.connect(user_path)
+        conn.row_factory = sqlite3.Row
+        row = conn.execute("SELECT * FROM Gear WHERE id_gear = ?", (gear_id,)).fetchone()
+        gear_db._row_to_gear(row)
+        conn.close()
+    return time.perf_counter() - start
+
+
+def bench_pooled(ids: list[int]) -> float:
+    """The new pattern: gear_db.get_gear_by_id on the shared connection."""
+    start = time.perf_counter()
+    for gear_id in ids:
+        gear_db.get_gear_by_id(gear_id)
+    return time.perf_counter() - start
+
+
+def run_benchmark():
+    with tempfile.TemporaryDirectory() as tmp:
+        program_path, user_path = build_databases(Path(tmp))
+
+        # Point the DB modules at the throw-away databases
+        gear_db.DB_PATH = user_path
+        program_db.DB_PATH = program_path
+
+        ids = [random.randint(1, GEAR_ITEMS) for _ in range(LOOKUPS)]
+
+        before = bench_connect_per_call(user_path, ids)
+        after = bench_pooled(ids)
+        close_all()
+
+    print(f"{GEAR_ITEMS} gear items, {LOOKUPS} lookups by id")
+    print(f"  connect per call : {before * 1000:8.1f} ms  ({before / LOOKUPS * 1e6:6.1f} µs/call)")
+    print(f"  pooled connection: {after * 1000:8.1f} ms  ({after / LOOKUPS * 1e6:6.1f} µs/call)")
+    print(f"  speed-up         : {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark()
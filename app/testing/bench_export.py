@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Export Benchmark
+Fills throw-away databases with synthetic gear (plus kits, trips and
+comments) and exports every dataset with app.data.db.export_db, reporting
+rows per second and the peak Python memory of each export (tracemalloc, in
+a second run), which should stay flat however many rows are written.
+
+A plain dump of the Gear table (SELECT * into csv.writer, no joins) is
+timed in the same run: that is what SQLite and the csv module alone cost on
+this machine. Each gear export must reach TARGET_SHARE of its rate, so the
+check holds on slow and busy machines alike; REFERENCE_ROWS_PER_SECOND, the
+goal on a typical laptop, is printed for information. Exits with status 1
+when a gear export is below TARGET_SHARE.
+
+Run from the project root:
+    python -m app.testing.bench_export [rows]
+"""
+
+import csv
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.data import user_db
+from app.data.db import base_db, export_db, joined_db
+from app.data.db.connection import close_all, get_connection
+
+ROWS = 100_000
+TARGET_SHARE = 0.75
+REFERENCE_ROWS_PER_SECOND = 100_000
+
+
+def fresh_databases(folder: Path, count: int):
+    program_path, user_path = folder / "program.sqlite", folder / "user.sqlite"
+    base_db.init_program_db(program_path)
+    user_db.init_user_db(user_path)
+    user_db.migrate_user_db(user_path)
+
+    conn = sqlite3.connect(program_path)
+    conn.executemany("INSERT INTO Brand (name) VALUES (?)", [(f"Brand {i}",) for i in range(200)])
+    conn.executemany("INSERT INTO Category (category) VALUES (?)", [(f"Category {i}",) for i in range(40)])
+    conn.commit()
+    conn.close()
+
+    conn = sqlite3.connect(user_path)
+    conn.executemany("""
+        INSERT INTO Gear (name, variant, brand_id, size, mass_pcs, price_cents, amount, color, category_id,
+                          description, prod_date, checked, last_checked, lifespan, kit_only)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (f"Carabiner {i}", random.choice(["HMS", "Snapgate"]), random.randint(1, 200), "M",
+         random.randint(20, 2000), random.randint(100, 50000), random.randint(1, 10), "red",
+         random.randint(1, 40), "", f"{random.randint(2010, 2025)}-05-01", random.randint(0, 1),
+         "2025-01-15", random.choice([None, 5, 10]), 0)
+        for i in range(count)
+    ])
+    kits = max(count // 100, 1)
+    conn.executemany("INSERT INTO Kit (id_kit, name, description, mass_correction) VALUES (?, ?, '', 0)",
+                     [(i, f"Kit {i}") for i in range(1, kits + 1)])
+    conn.executemany("INSERT INTO Kit_Gear (kit_id, gear_id, amount) VALUES (?, ?, 1)",
+                     [(random.randint(1, kits), random.randint(1, count)) for _ in range(kits * 10)])
+    conn.executemany("INSERT INTO Trip (id_trip, name, description, tag) VALUES (?, ?, '', '[\"alpine\"]')",
+                     [(i, f"Trip {i}") for i in range(1, kits + 1)])
+    conn.executemany("INSERT INTO Trip_Items (trip_id, item_type, item_id, amount) VALUES (?, 'kit', ?, 1)",
+                     [(i, i) for i in range(1, kits + 1)])
+    conn.executemany("INSERT INTO Comments (parent_id, date, comment) VALUES (?, '2025-01-15', 'checked')",
+                     [(random.randint(1, count),) for _ in range(count // 10)])
+    conn.commit()
+    conn.close()
+    joined_db.DB_PATH, joined_db.PROGRAM_DB_PATH = user_path, program_path
+
+
+def plain_dump_rate(path: Path) -> float:
+    """Rows per second of SELECT * FROM Gear written with csv.writer, nothing else."""
+    start = time.perf_counter()
+    cursor = get_connection(joined_db.DB_PATH).cursor()
+    cursor.row_factory = None
+    cursor.execute("SELECT * FROM Gear")
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        while chunk := cursor.fetchmany(export_db.CHUNK_SIZE):
+            writer.writerows(chunk)
+            count += len(chunk)
+    cursor.close()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed
+    print(f"  {'plain':<9} {'.csv':<7} {count:>7} rows in {elapsed:.2f} s: {rate:>9,.0f} rows/s (SELECT * FROM Gear)")
+    return rate
+
+
+def run_export(dataset: str, path: Path) -> float:
+    start = time.perf_counter()
+    count = export_db.export(dataset, path)
+    elapsed = time.perf_counter() - start
+    # Again for the memory: tracemalloc slows down every allocation
+    tracemalloc.start()
+    export_db.export(dataset, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rate = count / elapsed
+    print(f"  {dataset:<9} {path.suffix:<7} {count:>7} rows in {elapsed:.2f} s: {rate:>9,.0f} rows/s, "
+          f"peak {peak / 1024 / 1024:.1f} MiB, {path.stat().st_size / 1024 / 1024:.1f} MiB written")
+    return rate
+
+
+def run_benchmark(count: int) -> int:
+    random.seed(7)
+    gear_rates = []
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        fresh_databases(folder, count)
+        print(f"{count} gear, target {TARGET_SHARE:.0%} of a plain dump ({REFERENCE_ROWS_PER_SECOND:,} rows/s "
+              f"on a typical laptop; formats: {', '.join(export_db.available_formats())})")
+        plain = plain_dump_rate(folder / "plain.csv")
+        suffixes = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet"}
+        for dataset in export_db.DATASETS:
+            for fmt in export_db.available_formats():
+                rate = run_export(dataset, folder / f"{dataset}{suffixes[fmt]}")
+                if dataset == "gear":
+                    gear_rates.append(rate)
+        close_all()
+
+    print(f"slowest gear export: {min(gear_rates) / plain:.0%} of a plain dump, "
+          f"{min(gear_rates) / REFERENCE_ROWS_PER_SECOND:.0%} of {REFERENCE_ROWS_PER_SECOND:,} rows/s")
+    return 0 if min(gear_rates) >= TARGET_SHARE * plain else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Fuzzy Search Benchmark
+Times db_utils.fuzzy_search on gear tables of growing size, once as a full
+table scan (no search index) and once pre-filtered through the FTS5
+trigram index, and reports whether the top results agree.
+
+Run from the project root:
+    python -m app.testing.bench_fuzzy_search
+"""
+
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from app.data import user_db
+from app.data.db.connection import close_all
+from app.data.db.fts_db import ensure_fts_indexes
+from app.core.utils import db_utils
+
+SIZES = (1_000, 10_000, 100_000)
+TERMS = ("tent", "sleping bag", "headlamp", "stove", "jacket")
+WORDS = ("tent", "sleeping bag", "headlamp", "stove", "jacket", "rope", "harness",
+         "carabiner", "gloves", "helmet", "backpack", "mat", "pot", "filter", "poles")
+
+
+def build_database(path: Path, size: int):
+    """Create a user DB with `size` randomly named gear rows."""
+    user_db.init_user_db(path)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO Gear (name, variant, description) VALUES (?, ?, ?)",
+        [
+            (f"{random.choice(WORDS)} {random.choice(WORDS)} {i}", f"Variant {i % 7}", "")
+            for i in range(size)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def time_search(path: Path, term: str) -> tuple[float, list]:
+    start = time.perf_counter()
+    results = db_utils.fuzzy_search(
+        table          = "Gear",
+        search_columns = "name",
+        search_term    = term,
+        return_columns = ["id_gear", "name"],
+        sort_by        = "name",
+        db_name        = "bench",
+    )
+    return time.perf_counter() - start, results
+
+
+def run_benchmark():
+    random.seed(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            path = Path(tmp) / f"gear_{size}.sqlite"
+            build_database(path, size)
+            # fuzzy_search resolves db_name through the config
+            db_utils.config.config["paths.bench"] = str(path)
+
+            scan = [time_search(path, term) for term in TERMS]
+            ensure_fts_indexes(path, ["gear"])
+            fts  = [time_search(path, term) for term in TERMS]
+
+            scan_ms = sum(t for t, _ in scan) / len(TERMS) * 1000
+            fts_ms  = sum(t for t, _ in fts)  / len(TERMS) * 1000
+            same    = all(
+                [r["_similarity"] for r in a] == [r["_similarity"] for r in b]
+                for (_, a), (_, b) in zip(scan, fts)
+            )
+            print(f"{size:>7} gear:  scan {scan_ms:8.1f} ms   fts {fts_ms:7.1f} ms   "
+                  f"same top scores: {same}")
+        close_all()
+
+
+if __name__ == "__main__":
+    run_benchmark()
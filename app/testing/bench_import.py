@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Import Benchmark
+Writes a CSV and a JSON Lines file of synthetic gear (with 1% invalid rows
+and brand / category names that partly don't exist yet) and imports them
+into throw-away databases with app.data.db.import_db, reporting rows per
+second.
+
+The same rows, already converted, are also inserted with a bare
+executemany in the same transaction setup (deferred FTS index): that is
+what SQLite alone costs on this machine. An import must reach TARGET_SHARE
+of that rate, so the check holds on slow and busy machines alike; the
+absolute rate is compared with REFERENCE_ROWS_PER_SECOND, the goal on a
+typical laptop, for information only. Exits with status 1 below
+TARGET_SHARE.
+
+Run from the project root:
+    python -m app.testing.bench_import [rows]
+"""
+
+import csv
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.data import user_db
+from app.data.db import base_db, import_db, joined_db
+from app.data.db.fts_db import PROGRAM_FTS_TABLES, USER_FTS_TABLES, deferred_index, ensure_fts_indexes
+from app.data.db.connection import close_all
+
+ROWS = 100_000
+TARGET_SHARE = 0.33
+REFERENCE_ROWS_PER_SECOND = 50_000
+
+COLUMNS = ["name", "variant", "brand", "size", "mass_pcs", "price", "amount", "color",
+           "category", "description", "prod_date", "checked", "last_checked", "lifespan", "kit_only"]
+
+
+def make_rows(count: int) -> list[dict]:
+    brands = [f"Brand {i}" for i in range(200)]
+    categories = [f"Category {i}" for i in range(40)]
+    rows = []
+    for i in range(count):
+        rows.append({
+            "name":         f"Carabiner {i}",
+            "variant":      random.choice(["HMS", "Snapgate", "Wiregate"]),
+            "brand":        random.choice(brands),
+            "size":         random.choice(["S", "M", "L", ""]),
+            "mass_pcs":     str(random.randint(20, 2000)),
+            "price":        f"{random.randint(100, 50000) / 100:.2f}",
+            "amount":       str(random.randint(1, 10)),
+            "color":        random.choice(["red", "blue", ""]),
+            "category":     random.choice(categories),
+            "description":  "",
+            "prod_date":    f"{random.randint(1, 28):02}.{random.randint(1, 12):02}.{random.randint(2010, 2025)}",
+            "checked":      random.choice(["yes", "no"]),
+            "last_checked": random.choice(["", "2024-05-01", "2025-01-15"]),
+            "lifespan":     random.choice(["", "5", "10"]),
+            "kit_only":     random.choice(["no", "no", "yes"]),
+        })
+        if i % 100 == 0:
+            rows[-1]["mass_pcs"] = "heavy"  # invalid
+    return rows
+
+
+def fresh_databases(folder: Path, name: str):
+    program_path, user_path = folder / f"{name}_program.sqlite", folder / f"{name}_user.sqlite"
+    base_db.init_program_db(program_path)
+    user_db.init_user_db(user_path)
+    user_db.migrate_user_db(user_path)
+    conn = sqlite3.connect(program_path)
+    conn.executemany("INSERT INTO Brand (name) VALUES (?)", [(f"Brand {i}",) for i in range(100)])
+    conn.commit()
+    conn.close()
+    # The FTS triggers on Gear / Brand / Category are part of every insert
+    ensure_fts_indexes(program_path, PROGRAM_FTS_TABLES)
+    ensure_fts_indexes(user_path, USER_FTS_TABLES)
+    joined_db.DB_PATH, joined_db.PROGRAM_DB_PATH = user_path, program_path
+
+
+def raw_insert_rate(rows: list[dict]) -> float:
+    """Rows per second of executemany alone, for the valid rows already converted."""
+    params = [
+        (row["name"], row["variant"], random.randint(1, 100), row["size"], float(row["mass_pcs"]),
+         round(float(row["price"]) * 100), int(row["amount"]), row["color"], random.randint(1, 40),
+         row["description"], row["prod_date"], row["checked"] == "yes", row["last_checked"] or None,
+         int(row["lifespan"] or 0), row["kit_only"] == "yes")
+        for row in rows if row["mass_pcs"].isdigit()
+    ]
+    start = time.perf_counter()
+    with joined_db.joined_transaction() as conn, deferred_index(conn, "gear"):
+        for i in range(0, len(params), import_db.CHUNK_SIZE):
+            conn.executemany(import_db._INSERT_GEAR, params[i:i + import_db.CHUNK_SIZE])
+    elapsed = time.perf_counter() - start
+    rate = len(params) / elapsed
+    print(f"  {'raw':<7} {len(params)} rows inserted with executemany alone in {elapsed:.2f} s: {rate:,.0f} rows/s")
+    return rate
+
+
+def run_import(path: Path) -> float:
+    start = time.perf_counter()
+    result = import_db.import_gear_file(path)
+    elapsed = time.perf_counter() - start
+    rate = result["imported"] / elapsed
+    print(f"  {path.suffix:<7} {result['imported']} imported, {result['skipped']} skipped, "
+          f"{result['brands_created']} brands / {result['categories_created']} categories created "
+          f"in {elapsed:.2f} s: {rate:,.0f} rows/s")
+    return rate
+
+
+def run_benchmark(count: int) -> int:
+    random.seed(7)
+    rows = make_rows(count)
+    rates = []
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        csv_path, jsonl_path = folder / "gear.csv", folder / "gear.jsonl"
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        with open(jsonl_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+
+        print(f"{count} rows, target {TARGET_SHARE:.0%} of the raw insert rate "
+              f"({REFERENCE_ROWS_PER_SECOND:,} rows/s on a typical laptop)")
+        fresh_databases(folder, "raw")
+        raw = raw_insert_rate(rows)
+        close_all()
+        for path in (csv_path, jsonl_path):
+            fresh_databases(folder, path.suffix[1:])
+            rates.append(run_import(path))
+            close_all()
+
+    print(f"slowest import: {min(rates) / raw:.0%} of the raw insert rate, "
+          f"{min(rates) / REFERENCE_ROWS_PER_SECOND:.0%} of {REFERENCE_ROWS_PER_SECOND:,} rows/s")
+    return 0 if min(rates) >= TARGET_SHARE * raw else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS))
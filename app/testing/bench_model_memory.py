@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Model Memory Benchmark
+Measures the bytes per instance of the core models (Gear, Kit, Trip, Brand,
+Category) with tracemalloc, by building many of them the way the database
+layer does. Attribute values are shared between instances, so only the
+objects themselves are counted.
+
+Run from the project root:
+    python -m app.testing.bench_model_memory [count]
+e.g.
+    python -m app.testing.bench_model_memory 100000
+"""
+
+import sys
+import tracemalloc
+from datetime import date
+
+from app.core.brand import Brand
+from app.core.category_item import Category
+from app.core.gear_item import Gear
+from app.core.kit_item import Kit
+from app.core.trip import Trip
+
+COUNT = 100_000
+PROD_DATE = date(2020, 5, 1)
+
+
+def make_gear(i: int) -> Gear:
+    return Gear(
+        id_gear      = i,
+        name         = "Carabiner",
+        variant      = "HMS",
+        brand_id     = 3,
+        size         = "M",
+        mass_pcs     = 85,
+        price        = 12.5,
+        amount       = 4,
+        color        = "red",
+        category_id  = 2,
+        description  = "",
+        prod_date    = PROD_DATE,
+        checked      = True,
+        last_checked = None,
+        lifespan     = 10,
+        kit_only     = False,
+    )
+
+
+def make_kit(i: int) -> Kit:
+    return Kit(id_kit=i, name="Rack", description="", mass_correction=0)
+
+
+def make_trip(i: int) -> Trip:
+    return Trip(id_trip=i, name="Tour", description="", duration=3, no_people=2)
+
+
+def make_brand(i: int) -> Brand:
+    return Brand(id_brand=i, name="Petzl", description="", url="")
+
+
+def make_category(i: int) -> Category:
+    return Category(id_category=i, name="Climbing", description="")
+
+
+def bytes_per_instance(factory, count: int) -> float:
+    factory(0)  # warm up (interned values, method lookups)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    total -= sys.getsizeof(objects)  # the list holding them
+    total -= sum(sys.getsizeof(i) for i in range(257, count))  # ids above the small int cache
+    return total / count
+
+
+def run_benchmark(count: int):
+    print(f"{count} instances each")
+    for name, factory in (("Gear", make_gear), ("Kit", make_kit), ("Trip", make_trip),
+                          ("Brand", make_brand), ("Category", make_category)):
+        per_instance = bytes_per_instance(factory, count)
+        print(f"  {name:<9} {per_instance:8.1f} bytes/instance   {per_instance * count / 2**20:8.1f} MB total")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else COUNT)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Parallel Search Benchmark
+Times the serial and the process pool scoring paths of db_utils.fuzzy_search
+on synthetic gear names, as they come from a full table scan, and checks
+that both return the same results in the same order. The first parallel
+search spawns the shared process pool; its latency is reported apart from
+the searches that reuse the pool.
+
+Run from the project root:
+    python -m app.testing.bench_parallel_search [sizes ...]
+e.g.
+    python -m app.testing.bench_parallel_search 10000 100000 1000000
+"""
+
+import os
+import random
+import sys
+import time
+
+from app.core.utils import db_utils
+
+SIZES = (10_000, 100_000, 1_000_000)
+TERM = "tent"
+WORKERS = max(2, os.cpu_count() or 1)
+WORDS = ("tent", "sleeping bag", "headlamp", "stove", "jacket", "rope", "harness",
+         "carabiner", "gloves", "helmet", "backpack", "mat", "pot", "filter", "poles")
+
+
+def synthetic_rows(size: int) -> list[dict]:
+    return [
+        {"id_gear": i, "name": f"{random.choice(WORDS)} {random.choice(WORDS)} {i}"}
+        for i in range(size)
+    ]
+
+
+def time_rank(rows: list[dict], workers: int) -> tuple[float, list[dict]]:
+    start = time.perf_counter()
+    results = db_utils._rank_rows(
+        rows,
+        search_columns = ["name"],
+        search_term    = TERM,
+        limit          = 10,
+        sort_by        = ["name"],
+        sort_order     = "ASC",
+        min_similarity = 60,
+        workers        = workers,
+    )
+    return time.perf_counter() - start, results
+
+
+def run_benchmark(sizes):
+    random.seed(1)
+    print(f"term '{TERM}', limit 10, {WORKERS} workers, {os.cpu_count()} CPUs")
+    for size in sizes:
+        rows = synthetic_rows(size)
+        serial, serial_results = time_rank(rows, workers=1)
+        first = None
+        if db_utils._pool is None:
+            first, _ = time_rank(rows, workers=WORKERS)
+        parallel, parallel_results = time_rank(rows, workers=WORKERS)
+        print(f"{size:>9} rows:  serial {serial:8.2f} s   parallel {parallel:8.2f} s   "
+              f"speed-up {serial / parallel:5.2f}x   same results: {serial_results == parallel_results}")
+        if first is not None:
+            print(f"{'':>16}first parallel search, spawning the pool: {first:8.2f} s")
+
+
+if __name__ == "__main__":
+    run_benchmark([int(arg) for arg in sys.argv[1:]] or SIZES)
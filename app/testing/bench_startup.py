@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Imports main.py in fresh interpreters with -X importtime and reports the
+cumulative import time of main (best of RUNS), the wall time against a bare
+interpreter, and the app modules that cost the most. Exits with status 1
+when the import time of main is above TARGET_MS.
+
+Nothing is initialized or opened: only the imports done before the first
+menu are measured.
+
+Run from the project root:
+    python -m app.testing.bench_startup [runs]
+"""
+
+import subprocess
+import sys
+import time
+
+RUNS = 10
+TARGET_MS = 60
+TOP = 10
+
+
+def import_times() -> dict[str, int]:
+    """{module: cumulative microseconds} of one cold `import main`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def wall_time(code: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return time.perf_counter() - start
+
+
+def run_benchmark(runs: int) -> int:
+    samples = [import_times() for _ in range(runs)]
+    best = min(samples, key=lambda times: times["main"])
+    main_ms = best["main"] / 1000
+
+    bare = min(wall_time("pass") for _ in range(runs))
+    full = min(wall_time("import main") for _ in range(runs))
+
+    print(f"import main:   {main_ms:7.1f} ms (best of {runs}, target {TARGET_MS} ms)")
+    print(f"wall time:     {full * 1000:7.1f} ms (bare interpreter {bare * 1000:.1f} ms)")
+    print("\nSlowest app modules (cumulative):")
+    app_modules = sorted(((us, name) for name, us in best.items() if name.startswith("app")), reverse=True)
+    for us, name in app_modules[:TOP]:
+        print(f"  {us / 1000:7.1f} ms  {name}")
+
+    return 0 if main_ms <= TARGET_MS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else RUNS))
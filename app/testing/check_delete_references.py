@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Delete References Check
+Runs the brand delete dialogs of the CLI (brand_functions and
+delete_functions) against throw-away databases with scripted input: a
+brand still used by gear must be refused by the where_used() check, an
+unused one must reach the confirmation and be deleted. Exits with status 1
+on the first failure.
+
+Run from the project root:
+    python -m app.testing.check_delete_references
+"""
+
+import builtins
+import io
+import sqlite3
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from app.lang import lang
+from app.data import user_db
+from app.data.db import base_db, cache, program_db, reference_db
+from app.data.db.connection import close_all
+from app.cli import brand_functions, delete_functions
+
+DIALOGS = {
+    "brand_functions.delete_brand":  brand_functions.delete_brand,
+    "delete_functions.delete_brand": delete_functions.delete_brand,
+}
+
+
+def fresh_databases(folder: Path):
+    """Brands 'Unused' and 'Used', one gear item of brand 'Used'."""
+    program_path, user_path = folder / "program.sqlite", folder / "user.sqlite"
+    base_db.init_program_db(program_path)
+    user_db.init_user_db(user_path)
+    user_db.migrate_user_db(user_path)
+
+    conn = sqlite3.connect(program_path)
+    conn.execute("DELETE FROM Brand")
+    conn.executemany("INSERT INTO Brand (id_brand, name, description, url) VALUES (?, ?, '', '')",
+                     [(1, "Used"), (2, "Unused")])
+    conn.commit()
+    conn.close()
+    conn = sqlite3.connect(user_path)
+    conn.execute("INSERT INTO Gear (name, brand_id) VALUES ('Harness', 1)")
+    conn.commit()
+    conn.close()
+    program_db.DB_PATH, reference_db.DB_PATH = program_path, user_path
+    cache.bump("brand", "gear")
+
+
+def run_dialog(dialog, answers: list[str]) -> str:
+    """Output of dialog() with input() answering from answers."""
+    replies = iter(answers)
+    real_input = builtins.input
+    builtins.input = lambda prompt="": print(prompt) or next(replies)
+    out = io.StringIO()
+    try:
+        with redirect_stdout(out):
+            dialog()
+    finally:
+        builtins.input = real_input
+    return out.getvalue()
+
+
+def brand_names() -> set[str]:
+    return {brand.name for brand in program_db.get_all_brands()}
+
+
+def run_checks() -> int:
+    for label, dialog in DIALOGS.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            with redirect_stdout(io.StringIO()):
+                fresh_databases(Path(tmp))
+
+            # Brands are listed by name: 1 = Unused, 2 = Used
+            output = run_dialog(dialog, ["2"])
+            if lang.t("delete_functions.msg.has_references", name="Used") not in output or "Used" not in brand_names():
+                print(f"FAIL {label}: brand in use was not refused\n{output}")
+                return 1
+
+            output = run_dialog(dialog, ["1", "Y"])
+            if lang.t("delete_functions.msg.deleted", name="Unused") not in output or "Unused" in brand_names():
+                print(f"FAIL {label}: unused brand was not deleted\n{output}")
+                return 1
+            close_all()
+        print(f"{label}: ok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_checks())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Export / Import Round Trip Check
+Exports the gear of a throw-away database with app.data.db.export_db (CSV
+and JSON Lines), imports each file into fresh databases with import_db and
+exports that again: both exports must hold the same gear. The source has
+the values an import used to reject: free and weightless gear (price /
+mass 0), an infinite lifespan (0), dates with a time part, no price, no
+brand and an old category name in category_id. Exits with status 1 on the
+first difference.
+
+Dates come back as dates (the time part is dropped), and an empty
+last_checked comes back as today, as in add_gear.
+
+Run from the project root:
+    python -m app.testing.check_export_import
+"""
+
+import csv
+import io
+import sqlite3
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from datetime import date
+from pathlib import Path
+
+from app.data import user_db
+from app.data.db import base_db, export_db, import_db, joined_db
+from app.data.db.connection import close_all
+
+GEAR = [
+    # name, brand_id, mass_pcs, price_cents, amount, category_id, prod_date, checked, last_checked, lifespan, kit_only
+    ("Tent",       1,    2100, 45000, 1, 1,         "2019-05-01",          1, "2025-01-15",          10, 0),
+    ("Spoon",      None, 0,    0,     4, 2,         None,                  0, None,                  0,  1),
+    ("Sticker",    2,    0.5,  None,  3, None,      "2021-03-04 10:22:33", 0, "2024-06-01T08:00:00", 0,  0),
+    ("Old stove",  1,    350,  1999,  1, "Cooking", "2015-07-20",          1, "2023-11-30 18:45",    5,  0),
+]
+
+DATE_COLUMNS = ("prod_date", "last_checked")
+
+
+def fresh_databases(folder: Path, name: str, seed: bool = False):
+    program_path, user_path = folder / f"{name}_program.sqlite", folder / f"{name}_user.sqlite"
+    with redirect_stdout(io.StringIO()):
+        base_db.init_program_db(program_path)
+        user_db.init_user_db(user_path)
+        user_db.migrate_user_db(user_path)
+    joined_db.DB_PATH, joined_db.PROGRAM_DB_PATH = user_path, program_path
+    if not seed:
+        return
+
+    conn = sqlite3.connect(program_path)
+    conn.execute("DELETE FROM Brand")
+    conn.execute("DELETE FROM Category")
+    conn.executemany("INSERT INTO Brand (id_brand, name, description, url) VALUES (?, ?, '', '')",
+                     [(1, "Hilleberg"), (2, "Acme")])
+    conn.executemany("INSERT INTO Category (id_category, category, description) VALUES (?, ?, '')",
+                     [(1, "Shelter"), (2, "Kitchen")])
+    conn.commit()
+    conn.close()
+    conn = sqlite3.connect(user_path)
+    conn.executemany("""
+        INSERT INTO Gear (name, brand_id, mass_pcs, price_cents, amount, category_id,
+                          prod_date, checked, last_checked, lifespan, kit_only)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, GEAR)
+    conn.commit()
+    conn.close()
+
+
+def read_export(path: Path) -> list[dict]:
+    """Exported gear rows as {column: text}; dates without time, as the import stores them."""
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    for row in rows:
+        for column in DATE_COLUMNS:
+            row[column] = row[column][:10]
+        if not row["last_checked"]:
+            row["last_checked"] = date.today().isoformat()
+    return rows
+
+
+def run_checks() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        fresh_databases(folder, "source", seed=True)
+        export_db.export("gear", folder / "gear.csv")
+        export_db.export("gear", folder / "gear.jsonl")
+        expected = read_export(folder / "gear.csv")
+        close_all()
+
+        for name in ("gear.csv", "gear.jsonl"):
+            fresh_databases(folder, Path(name).suffix[1:])
+            result = import_db.import_gear_file(folder / name)
+            if result["imported"] != len(GEAR) or result["errors"]:
+                print(f"FAIL {name}: {result['imported']} of {len(GEAR)} imported, errors {result['errors']}")
+                return 1
+            export_db.export("gear", folder / "again.csv")
+            got = read_export(folder / "again.csv")
+            close_all()
+            for want, row in zip(expected, got):
+                if want != row:
+                    print(f"FAIL {name}: {want['name']!r} changed in the round trip")
+                    print(f"  exported: {want}")
+                    print(f"  imported: {row}")
+                    return 1
+            print(f"{name}: {len(got)} gear exported, imported and exported again unchanged")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_checks())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Fuzzy Ranking Check
+Compares the ranking of db_utils.fuzzy_search (bounded heap top-k and the
+process pool path) with the original sort-per-column implementation on
+random rows full of ties, for every sort_by / sort_order / limit mix.
+Exits with status 1 on the first mismatch.
+
+Run from the project root:
+    python -m app.testing.check_fuzzy_ranking
+"""
+
+import random
+import sys
+
+from fuzzywuzzy import fuzz
+
+from app.core.utils import db_utils
+
+CASES = 200
+PARALLEL_CASES = 10  # the process pool path is slow to call, check it on fewer cases
+NAMES = ("tent", "tent 2p", "Tent", "tnet", "stove", "tents", "ten", "pot", "tentacle", "")
+TERMS = ("tent", "ten", "stove", "t", "xyz")
+SORTS = (None, ["name"], ["mass"], ["mass", "name"], ["name", "mass"], ["missing"])
+LIMITS = (None, 0, 1, 3, 10, 1000)
+
+
+def legacy_rank(rows, search_columns, search_term, limit, sort_by, sort_order, min_similarity):
+    """The ranking of fuzzy_search before the heap based top-k."""
+    results = []
+    for row in rows:
+        row_dict = dict(row)
+        best_score = 0
+        for col in search_columns:
+            value = str(row_dict.get(col, ""))
+            score = fuzz.partial_ratio(search_term.lower(), value.lower())
+            best_score = max(best_score, score)
+        if best_score >= min_similarity:
+            row_dict["_similarity"] = best_score
+            results.append(row_dict)
+
+    if sort_by:
+        for col in reversed(sort_by):
+            results.sort(key=lambda x: x.get(col, ""), reverse=(sort_order.upper() == "DESC"))
+    results.sort(key=lambda x: x["_similarity"], reverse=True)
+    if limit:
+        results = results[:limit]
+    return results
+
+
+def random_rows() -> list[dict]:
+    return [
+        {"id": i, "name": random.choice(NAMES), "mass": random.randint(0, 3)}
+        for i in range(random.randint(0, 60))
+    ]
+
+
+def run_checks() -> int:
+    random.seed(42)
+    checked = 0
+    for case in range(CASES):
+        rows = random_rows()
+        term = random.choice(TERMS)
+        for sort_by in SORTS:
+            for sort_order in ("ASC", "DESC", "desc"):
+                for limit in LIMITS:
+                    args = (rows, ["name"], term, limit, sort_by, sort_order, 60)
+                    expected = legacy_rank(*args)
+                    for workers in ((1, 3) if case < PARALLEL_CASES else (1,)):
+                        got = db_utils._rank_rows(*args, workers=workers)
+                        checked += 1
+                        if got != expected:
+                            print(f"MISMATCH term={term!r} sort_by={sort_by} order={sort_order} "
+                                  f"limit={limit} workers={workers}")
+                            print(f"  expected: {[(r['id'], r['_similarity']) for r in expected]}")
+                            print(f"  got:      {[(r['id'], r['_similarity']) for r in got]}")
+                            return 1
+    print(f"{checked} rankings checked, all identical to the original ordering.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_checks())
@@ -29,7 +29,8 @@ def get_lang_file_keys(lang_dir):
     lang_keys = {}
     for lang in os.listdir(lang_dir):
         lang_path = os.path.join(lang_dir, lang)
-        if os.path.isdir(lang_path):
+        # Skip folders that aren't languages (__pycache__, hidden folders)
+        if os.path.isdir(lang_path) and not lang.startswith((".", "_")):
             combined = {}
             for file in os.listdir(lang_path):
                 if file.endswith(".json"):
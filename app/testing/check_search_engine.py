@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Search Engine Check
+Ranks the candidates of the resident search engine (search_engine) and a
+full scan of the same table with db_utils._rank_rows, on a throw-away
+Brand table with far more matches than a term's top scorers (300 "Tent
+Zeta n" rows before 50 "Tent Alpha n" rows, plus noise), for several
+terms (typos sharing no trigram with any row among them), sort orders,
+limits and thresholds; every ranking must be identical. Also builds the engine on a database without the user tables. Exits with
+status 1 on the first mismatch.
+
+Run from the project root:
+    python -m app.testing.check_search_engine
+"""
+
+import io
+import random
+import sqlite3
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from app.core.utils import db_utils, search_engine
+from app.data.db import base_db
+from app.data.db.connection import close_all, get_connection
+
+TERMS = ("tent", "tent alpha", "zeta 12", "alp", "te", "qqq", "tnet", "roep", "stvoe", "pezl")
+SORTS = (None, ["name"], ["description"])
+LIMITS = (None, 10, 400)
+MIN_SIMILARITIES = (60, 80)
+
+
+def make_program_db(path: Path):
+    with redirect_stdout(io.StringIO()):
+        base_db.init_program_db(path)
+    random.seed(3)
+    names = [f"Tent Zeta {i}" for i in range(300)] + [f"Tent Alpha {i}" for i in range(50)]
+    names += [f"{random.choice(['Stove', 'Rope', 'Pot'])} {i}" for i in range(200)]
+    conn = sqlite3.connect(path)
+    conn.execute("DELETE FROM Brand")
+    conn.executemany("INSERT INTO Brand (name, description) VALUES (?, ?)",
+                     [(name, random.choice(["", "tent", "light"])) for name in names])
+    conn.commit()
+    conn.close()
+
+
+def run_checks() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        program_path, empty_path = Path(tmp) / "program.sqlite", Path(tmp) / "empty.sqlite"
+        make_program_db(program_path)
+        sqlite3.connect(empty_path).close()
+
+        # No Gear / Kit / Trip tables: those are skipped, not a crash
+        search_engine.build({"program_db": program_path, "user_db": empty_path})
+        if search_engine.is_built("gear") or not search_engine.is_built("brand"):
+            print("FAIL build: tables missing in user_db were not skipped")
+            return 1
+
+        # More matches than the old 200 candidate cut, ties broken by name
+        first = db_utils._rank_rows(search_engine.candidates(program_path, "Brand", ["name"], "tent"),
+                                    ["name"], "tent", 10, ["name"], "ASC", 60, workers=1)
+        if first[0]["name"] != "Tent Alpha 0":
+            print(f"FAIL 'tent' sorted by name starts with {first[0]['name']!r}, not 'Tent Alpha 0'")
+            return 1
+
+        scan = get_connection(program_path.resolve()).execute("SELECT * FROM Brand").fetchall()
+        checked = 0
+        for term in TERMS:
+            for columns in (["name"], ["name", "description"]):
+                for min_similarity in MIN_SIMILARITIES:
+                    engine = search_engine.candidates(program_path, "Brand", columns, term,
+                                                      min_similarity=min_similarity)
+                    for sort_by in SORTS:
+                        for limit in LIMITS:
+                            args = (columns, term, limit, sort_by, "ASC", min_similarity)
+                            expected = db_utils._rank_rows(scan, *args, workers=1)
+                            got = db_utils._rank_rows(engine, *args, workers=1)
+                            checked += 1
+                            if got != expected:
+                                print(f"MISMATCH term={term!r} columns={columns} min_similarity={min_similarity} "
+                                      f"sort_by={sort_by} limit={limit}")
+                                print(f"  scan:   {[r['name'] for r in expected[:5]]}")
+                                print(f"  engine: {[r['name'] for r in got[:5]]}")
+                                return 1
+        close_all()
+    print(f"{checked} rankings checked, all identical to a full scan.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_checks())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Totals Check
+Builds throw-away databases (user_db migrated like the app does) with gear,
+consumables, kits and trips, then edits them through app.data.db: gear mass
+and price, a consumable's weight, a kit's contents, a trip's contents and a
+gear deletion. After the initial load and after every edit, the stored
+Kit_Totals / Trip_Totals (maintained by deltas on every write) must equal
+the totals computed from the fully loaded Kit and Trip objects. Exits with
+status 1 on any mismatch. The configured databases are not touched.
+
+Run from the project root:
+    python -m app.testing.check_totals
+"""
+
+import io
+import random
+import sqlite3
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from app.data import db, user_db
+from app.data.db import base_db, cache, gear_db, gear_table, joined_db, kit_db, program_db, reference_db, trip_db
+from app.data.db import user_db as comment_db
+from app.data.db.connection import close_all
+
+GEAR = 30
+KITS = 4
+TRIPS = 3
+CONSUMABLES = 5
+
+
+def fresh_databases(folder: Path):
+    """Migrated throw-away databases with random gear, kits, trips and consumables; no totals yet."""
+    program_path, user_path = folder / "program.sqlite", folder / "user.sqlite"
+    with redirect_stdout(io.StringIO()):
+        base_db.init_program_db(program_path)
+        user_db.init_user_db(user_path)
+        user_db.migrate_user_db(user_path)
+
+    random.seed(5)
+    conn = sqlite3.connect(program_path)
+    conn.executemany("INSERT INTO Consumable (name, description, weight) VALUES (?, '', ?)",
+                     [(f"Food {i}", random.randint(50, 900)) for i in range(CONSUMABLES)])
+    consumable_ids = [row[0] for row in conn.execute("SELECT id_consumable FROM Consumable")]
+    conn.commit()
+    conn.close()
+
+    conn = sqlite3.connect(user_path)
+    conn.executemany("INSERT INTO Gear (name, mass_pcs, price_cents, amount) VALUES (?, ?, ?, 1)",
+                     [(f"Gear {i}", random.randint(10, 2000), random.choice([None, random.randint(100, 90000)]))
+                      for i in range(GEAR)])
+    conn.executemany("INSERT INTO Kit (id_kit, name, description, mass_correction) VALUES (?, ?, '', ?)",
+                     [(i, f"Kit {i}", random.choice([0, 25])) for i in range(1, KITS + 1)])
+    conn.executemany("INSERT INTO Kit_Gear (kit_id, gear_id, amount) VALUES (?, ?, ?)",
+                     [(kit_id, gear_id, random.randint(1, 3))
+                      for kit_id in range(1, KITS + 1) for gear_id in random.sample(range(1, GEAR + 1), 5)])
+    conn.executemany("INSERT INTO Trip (id_trip, name, description, tag) VALUES (?, ?, '', '[]')",
+                     [(i, f"Trip {i}") for i in range(1, TRIPS + 1)])
+    for trip_id in range(1, TRIPS + 1):
+        conn.executemany("INSERT INTO Trip_Items (trip_id, item_type, item_id, amount) VALUES (?, ?, ?, ?)",
+                         [(trip_id, "kit", kit_id, 1) for kit_id in random.sample(range(1, KITS + 1), 2)]
+                         + [(trip_id, "gear", gear_id, 2) for gear_id in random.sample(range(1, GEAR + 1), 3)])
+        conn.executemany("INSERT INTO Trip_Consumables (trip_id, consumable_id, amount) VALUES (?, ?, ?)",
+                         [(trip_id, consumable_id, random.randint(1, 4))
+                          for consumable_id in random.sample(consumable_ids, 2)])
+    conn.commit()
+    conn.close()
+
+    for module in (gear_db, gear_table, kit_db, trip_db, reference_db, comment_db):
+        module.DB_PATH = user_path
+    program_db.DB_PATH = program_path
+    joined_db.DB_PATH, joined_db.PROGRAM_DB_PATH = user_path, program_path
+    cache.bump("gear", "kit", "trip", "consumable", "brand", "category")
+
+
+def count_mismatches(step: str) -> int:
+    """Compare stored and computed totals of every kit and trip, printing the differences."""
+    mismatches = 0
+
+    kits = db.get_all_kits()
+    stored_kits = db.get_kit_totals([kit.id_kit for kit in kits])
+    for kit in kits:
+        row = stored_kits.get(kit.id_kit)
+        if row is None or (row["item_count"], row["total_mass"]) != (kit.item_count, kit.total_mass):
+            mismatches += 1
+            print(f"{step}: kit {kit.id_kit}: stored {tuple(row) if row else None}, "
+                  f"computed {(kit.item_count, kit.total_mass)}")
+
+    trips = db.get_all_trips()
+    stored_trips = db.get_trip_totals([trip.id_trip for trip in trips])
+    for trip in trips:
+        stored = stored_trips.get(trip.id_trip)
+        computed = {
+            "gear_mass":       trip.gear_mass(),
+            "consumable_mass": trip.consumable_mass(),
+            "total_value":     trip.total_value(),
+        }
+        if stored is None or any(abs(stored[key] - value) > 1e-6 for key, value in computed.items()):
+            mismatches += 1
+            print(f"{step}: trip {trip.id_trip}: stored {stored}, computed {computed}")
+
+    print(f"{step}: {len(kits)} kits, {len(trips)} trips checked, {mismatches} mismatches.")
+    return mismatches
+
+
+def _edit_gear():
+    for gear_id in (1, 2, 3):
+        gear = db.get_gear_by_id(gear_id)
+        gear.mass_pcs = (gear.mass_pcs or 0) + 111
+        gear.price = 12.5
+        db.update_gear(gear)
+
+
+def _edit_consumable():
+    consumable = db.get_consumable_by_id(1)
+    db.update_consumable(1, consumable["name"], consumable["description"], consumable["weight"] + 40)
+
+
+def _edit_kit():
+    kit = db.get_kit_by_id(1)
+    kit.remove_gear(kit.gear_list[0].id_gear)
+    kit.add_gear(db.get_gear_by_id(GEAR), 2)
+    db.update_kit(kit)
+
+
+def _edit_trip():
+    trip = db.get_trip_by_id(1)
+    trip.items.append(db.get_kit_by_id(KITS))
+    trip.item_amounts.append(3)
+    db.update_trip(trip)
+
+
+def _delete_gear():
+    kit = db.get_kit_by_id(2)
+    gear_db.delete_gear(kit.gear_list[0].id_gear)
+
+
+EDITS = {
+    "gear mass and price": _edit_gear,
+    "consumable weight":   _edit_consumable,
+    "kit contents":        _edit_kit,
+    "trip contents":       _edit_trip,
+    "gear deleted":        _delete_gear,
+}
+
+
+def run_check() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        fresh_databases(Path(tmp))
+        mismatches = count_mismatches("initial")
+        for step, edit in EDITS.items():
+            edit()
+            mismatches += count_mismatches(step)
+        close_all()
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_check())
@@ -2,7 +2,6 @@ from pathlib import Path
 from app.config_manager import ConfigManager
 from app.data.initializer import initialize_all
 from app.cli.menu import main_menu
-from app.data.initializer import initialize_all
 
 # Load configuration
 config = ConfigManager()